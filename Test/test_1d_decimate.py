@@ -0,0 +1,49 @@
+import numpy
+import vcs
+from vcs.vcsvtk.pipeline1d import splitRuns, decimateMinMax
+
+# missing values split the line
+valid = numpy.array([1, 1, 0, 1, 1, 1, 0, 0, 1], dtype=numpy.bool_)
+runs = splitRuns(valid, valid)
+assert [r.tolist() for r in runs] == [[0, 1], [3, 4, 5], [8]]
+
+# 1M points on 100 pixel columns: at most 4 points per column
+n = 1000000
+u = numpy.arange(n, dtype=numpy.float64)
+v = numpy.sin(u / 1000.)
+valid = numpy.ones(n, dtype=numpy.bool_)
+valid[500000:500010] = False
+keep = decimateMinMax(u, v, valid, 0, n, 100)
+assert keep.sum() <= 4 * 101
+assert not keep[500000:500010].any()
+# extremes are preserved
+assert v[keep].max() == v[valid].max()
+assert v[keep].min() == v[valid].min()
+# dropping points does not add gaps
+assert len(splitRuns(keep, valid)) == 2
+
+x = vcs.init()
+gm = x.create1d()
+gm.decimate = True
+x.plot(v, gm, bg=1)
+
+# markers alone are not decimated
+x.clear()
+gm.linewidth = 0
+gm.marker = "dot"
+x.plot(v[:10000], gm, bg=1)
+npoints = 0
+renderers = x.backend.renWin.GetRenderers()
+renderers.InitTraversal()
+ren = renderers.GetNextItem()
+while ren is not None:
+    actors = ren.GetActors()
+    actors.InitTraversal()
+    act = actors.GetNextActor()
+    while act is not None:
+        glyph = act.GetMapper().GetInputAlgorithm()
+        if glyph.IsA("vtkGlyph2D"):
+            npoints += glyph.GetInput().GetNumberOfPoints()
+        act = actors.GetNextActor()
+    ren = renderers.GetNextItem()
+assert npoints == 10000, npoints
@@ -0,0 +1,39 @@
+import os
+import tempfile
+import vtk
+from vcs.VTKAnimate import FrameStore
+
+tmpdir = tempfile.mkdtemp()
+
+
+def png_name(frame_num):
+    return os.path.join(tmpdir, "anim_%i.png" % frame_num)
+
+
+def image(value):
+    img = vtk.vtkImageData()
+    img.SetDimensions(256, 256, 1)
+    img.AllocateScalars(vtk.VTK_UNSIGNED_CHAR, 3)
+    img.GetPointData().GetScalars().Fill(value)
+    return img
+
+frame_size = image(0).GetActualMemorySize() * 1024
+# room for two frames in memory
+store = FrameStore(2 * frame_size, png_name)
+for i in range(5):
+    store.put(i, image(i))
+
+assert len(store) == 5
+# least recently stored frames went to disk
+for i in range(3):
+    assert store.get(i) == png_name(i)
+    assert os.path.exists(png_name(i))
+for i in range(3, 5):
+    assert isinstance(store.get(i), vtk.vtkImageData)
+    assert not os.path.exists(png_name(i))
+
+store.flush()
+assert len(store) == 5
+assert all(os.path.exists(png_name(i)) for i in range(5))
+store.clear()
+assert len(store) == 0
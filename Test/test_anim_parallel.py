@@ -0,0 +1,18 @@
+import cdms2
+import os
+import vcs
+x = vcs.init(bg=True)
+f = cdms2.open(vcs.sample_data + "/clt.nc")
+s = f("clt", time=slice(0, 12))
+gm = x.createboxfill()
+levs = vcs.mkevenlevels(20, 80)
+gm.levels = levs
+gm.fillareacolors = vcs.getcolors(levs)
+x.plot(s, gm)
+x.animate.create(thread_it=False, processes=3)
+files = x.animate.animation_files
+assert len(files) == x.animate.number_of_frames() == 12
+for i, fnm in enumerate(files):
+    assert os.path.basename(fnm) == "anim_%i.png" % i
+    assert os.path.exists(fnm)
+x.animate.close()
@@ -0,0 +1,30 @@
+import os
+import vcs
+import vcs.vcs2vtk as vcs2vtk
+
+fnm = os.path.join(vcs.prefix, "share", "vcs", "data_continent_coarse")
+prefix, pointsFile, linesFile = vcs2vtk.continentsCachePath(fnm)
+for f in (pointsFile, linesFile):
+    if os.path.exists(f):
+        os.remove(f)
+
+vcs2vtk.vcsContinents.clear()
+parsed = vcs2vtk.prepContinents(fnm)
+assert os.path.exists(pointsFile) and os.path.exists(linesFile)
+
+vcs2vtk.vcsContinents.clear()
+cached = vcs2vtk.prepContinents(fnm)
+assert cached is not parsed
+assert cached.GetNumberOfPoints() == parsed.GetNumberOfPoints() > 0
+assert cached.GetNumberOfLines() == parsed.GetNumberOfLines() > 0
+for i in (0, parsed.GetNumberOfPoints() - 1):
+    assert cached.GetPoint(i) == parsed.GetPoint(i)
+
+# the cached points wrap the mapped file rather than a copy of it, and
+# changing them leaves the file alone
+mapped = cached.GetPoints().GetData()._numpy_reference
+while not isinstance(mapped, vcs2vtk.numpy.memmap):
+    mapped = mapped.base
+cached.GetPoints().SetPoint(0, 1000., 1000., 0.)
+vcs2vtk.vcsContinents.clear()
+assert vcs2vtk.prepContinents(fnm).GetPoint(0) == parsed.GetPoint(0)
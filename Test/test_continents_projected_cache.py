@@ -0,0 +1,25 @@
+import vcs
+import cdms2
+import support
+from vcs import vcs2vtk
+bg = support.bg
+
+f = cdms2.open(vcs.sample_data + "/clt.nc")
+s = f("clt", time=slice(0, 1), squeeze=1)
+x = vcs.init()
+x.setcontinentstype(1)
+
+vcs2vtk.continentsCache.clear()
+gm = x.createisofill()
+gm.projection = "robinson"
+# multi panel page, all panels share the same continents
+for i in range(4):
+    t = x.createtemplate()
+    t.scale(.5)
+    t.move(.5 * (i % 2), "x")
+    t.move(.5 * (i / 2), "y")
+    x.plot(s, t, gm, bg=bg)
+support.check_plot(x)
+stats = vcs2vtk.continentsCache.stats()
+if stats["entries"] != 1 or stats["hits"] < 3:
+    raise Exception("continents were not reused: %s" % stats)
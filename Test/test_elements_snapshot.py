@@ -0,0 +1,40 @@
+import os
+import tempfile
+import vcs
+
+d = tempfile.mkdtemp()
+pth = os.path.join(d, "snapshot")
+init = os.path.join(d, "initial.attributes")
+with open(init, "w") as f:
+    f.write("")
+key = vcs.snapshot.key([init])
+assert vcs.snapshot.save(pth, key, (vcs.elements, vcs._protected_elements))
+
+elements, protected = vcs.snapshot.load(pth, key)
+assert protected == vcs._protected_elements
+for typ in vcs.elements:
+    assert sorted(elements[typ].keys()) == \
+        sorted(vcs.elements[typ].keys()), typ
+
+t = elements["template"]["default"]
+assert t.name == "default"
+assert t.data.x1 == vcs.elements["template"]["default"].data.x1
+b = elements["boxfill"]["default"]
+assert b.boxfill_type == vcs.elements["boxfill"]["default"].boxfill_type
+assert b.levels == vcs.elements["boxfill"]["default"].levels
+assert elements["colormap"]["default"].index[16] == \
+    vcs.elements["colormap"]["default"].index[16]
+
+# editing initial.attributes invalidates the snapshot
+with open(init, "w") as f:
+    f.write("# changed\n")
+assert vcs.snapshot.load(pth, vcs.snapshot.key([init])) is None
+assert vcs.snapshot.load(os.path.join(d, "missing"), key) is None
+
+# so does adding or removing one of the fonts
+font = os.path.join(d, "font.ttf")
+key = vcs.snapshot.key([init, font])
+assert vcs.snapshot.save(pth, key, (vcs.elements, vcs._protected_elements))
+with open(font, "w") as f:
+    f.write("")
+assert vcs.snapshot.load(pth, vcs.snapshot.key([init, font])) is None
@@ -0,0 +1,26 @@
+import cdms2
+import os
+import vcs
+x = vcs.init(bg=True)
+f = cdms2.open(vcs.sample_data + "/clt.nc")
+clt = f("clt", time=slice(0, 6))
+movie = "test_ffmpeg_stream.mp4"
+stream = x.ffmpeg_stream(movie, rate=5)
+for i in range(clt.shape[0]):
+    x.clear()
+    x.plot(clt[i])
+    stream.write()
+assert stream.frames == 6
+assert stream.close()
+assert os.path.getsize(movie) > 0
+os.remove(movie)
+
+# bitrate is handed to ffmpeg
+stream = x.ffmpeg_stream(movie, rate=5, bitrate=256)
+for i in range(clt.shape[0]):
+    x.clear()
+    x.plot(clt[i])
+    stream.write()
+assert stream.close()
+assert os.path.getsize(movie) > 0
+os.remove(movie)
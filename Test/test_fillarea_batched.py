@@ -0,0 +1,27 @@
+import vcs
+from vcs import vcs2vtk
+x = vcs.init()
+fa = x.createfillarea()
+xs = []
+ys = []
+for i in range(40):
+    for j in range(25):
+        xs.append([i / 40., (i + 1) / 40., (i + 1) / 40., i / 40.])
+        ys.append([j / 25., j / 25., (j + 1) / 25., (j + 1) / 25.])
+n = len(xs)
+fa.x = xs
+fa.y = ys
+fa.style = ["solid", "hatch"] * (n / 2)
+fa.index = [1] * n
+# solid polygons (even) in many colors, hatches (odd) in 242 or 244
+fa.color = [16 + i % 200 if i % 2 == 0 else 242 + 2 * (i / 2 % 2)
+            for i in range(n)]
+x.plot(fa, bg=1)
+
+actors = vcs2vtk.prepFillarea(x.backend.renWin, fa)
+# 2 hatch groups (colors 242 and 244), each a background and a pattern actor
+# plus one actor for all the solid polygons
+assert len(actors) == 5
+solid = actors[-1][0].GetMapper().GetInput()
+assert solid.GetNumberOfCells() == n / 2
+assert solid.GetCellData().GetScalars().GetNumberOfTuples() == n / 2
@@ -0,0 +1,37 @@
+import vcs
+import cdms2
+import support
+from vcs import vcs2vtk
+bg = support.bg
+
+f = cdms2.open(vcs.sample_data + "/clt.nc")
+s = f("clt", time=slice(0, 1), squeeze=1)
+x = vcs.init()
+
+vcs2vtk.gridCache.clear()
+hits = vcs2vtk.gridCache.hits
+x.plot(s, bg=bg)
+support.check_plot(x)
+x.clear()
+# Same grid, different values: the grid geometry should be reused
+x.plot(s * 2., bg=bg)
+support.check_plot(x)
+if vcs2vtk.gridCache.hits != hits + 1:
+    raise Exception("grid was not reused: %s" % vcs2vtk.gridCache.stats())
+x.clear()
+# Changing the projection changes the geometry
+gm = x.createboxfill()
+gm.projection = "robinson"
+x.plot(s, gm, bg=bg)
+support.check_plot(x)
+if vcs2vtk.gridCache.hits != hits + 1:
+    raise Exception("projected grid should not come from the cache")
+x.clear()
+# Replotting on the same grid object does not hash its points again
+vcs2vtk.gridDigests.clear()
+x.plot(s, bg=bg)
+misses = vcs2vtk.gridDigests.misses
+x.clear()
+x.plot(s, bg=bg)
+if vcs2vtk.gridDigests.misses != misses:
+    raise Exception("grid points were hashed again")
@@ -0,0 +1,25 @@
+import subprocess
+import sys
+import time
+
+# importing vcs must not load vtk, the backend, the editors or the ui
+code = """
+import sys
+import vcs
+vcs.mkscale(0, 100)
+vcs.gettemplate("default")
+heavy = ["vtk", "vcs.VTKPlots", "vcs.vcs2vtk", "vcs.configurator",
+         "vcs.editors", "vcs.vtk_ui", "DV3D"]
+loaded = [m for m in heavy if sys.modules.get(m) is not None]
+assert loaded == [], loaded
+"""
+# the first import may build the elements snapshot
+subprocess.check_call([sys.executable, "-c", code])
+
+# seconds, import vcs plus the interpreter startup
+budget = 5.
+start = time.time()
+subprocess.check_call([sys.executable, "-c", code])
+elapsed = time.time() - start
+assert elapsed < budget, "import vcs took %.2fs (budget %.2fs)" % (
+    elapsed, budget)
@@ -0,0 +1,44 @@
+import vcs
+import cdms2
+
+f = cdms2.open(vcs.sample_data + "/clt.nc")
+s = f("clt", time=slice(0, 1), squeeze=1)
+x = vcs.init()
+
+# hatches with a different index per level make one group per level
+iso = x.createisofill()
+iso.levels = range(0, 110, 10)
+iso.fillareastyle = "hatch"
+iso.fillareaindices = range(1, 11)
+dp = x.plot(s, iso, bg=1)
+assert len(dp.backend["vtk_backend_contours"]) == 1
+assert len(dp.backend["vtk_backend_luts"]) == 1
+# each level still gets its own pattern geometry
+geos = dp.backend["vtk_backend_geofilters"]
+assert len(geos) == 2 * 10
+
+# solid levels are drawn straight from the contour filter
+x.clear()
+iso.fillareastyle = "solid"
+dp = x.plot(s, iso, bg=1)
+assert len(dp.backend["vtk_backend_contours"]) == 1
+assert "vtk_backend_geofilters" not in dp.backend
+lut = dp.backend["vtk_backend_luts"][0][0]
+assert lut.GetNumberOfTableValues() >= 10
+
+# solid levels only split in groups where the levels have gaps, the bands
+# of the gaps are transparent and all the groups use a single mapper
+x.clear()
+iso.levels = ([0, 10], [20, 30], [50, 60])
+iso.fillareacolors = [16, 100, 200]
+dp = x.plot(s, iso, bg=1)
+assert "vtk_backend_geofilters" not in dp.backend
+assert len([a for a in dp.backend["vtk_backend_actors"] if len(a) == 2]) == 1
+lut = dp.backend["vtk_backend_luts"][0][0]
+# plus a clipped band below the first level if the data go below it
+below = lut.GetNumberOfTableValues() - 5
+assert below in (0, 1)
+for band in (1, 3):
+    assert lut.GetTableValue(below + band) == (0., 0., 0., 0.)
+for band in (0, 2, 4):
+    assert lut.GetTableValue(below + band)[3] > 0
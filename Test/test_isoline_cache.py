@@ -0,0 +1,29 @@
+import vcs
+import vcs.vcs2vtk
+import cdms2
+
+f = cdms2.open(vcs.sample_data + "/clt.nc")
+s = f("clt", time=slice(0, 1), squeeze=1)
+x = vcs.init()
+cache = vcs.vcs2vtk.isolineCache
+
+iso = x.createisoline()
+iso.levels = range(0, 110, 10)
+x.plot(s, iso, bg=1)
+misses = cache.misses
+
+# restyling splits the same contours into other groups, no new contouring
+x.clear()
+iso.linewidths = [1, 2, 3]
+iso.label = "y"
+dp = x.plot(s, iso, bg=1)
+assert cache.misses == misses
+assert len(dp.backend["vtk_backend_geofilters"]) == 2 * 3
+isolines = dp.backend["vtk_backend_isolines"][0]
+assert isolines.GetNumberOfCells() > 0
+assert isolines.GetPointData().GetArray("group") is not None
+
+# other data is contoured
+x.clear()
+x.plot(s * 2, iso, bg=1)
+assert cache.misses == misses + 1
@@ -0,0 +1,36 @@
+import vcs
+from vcs.error import vcsError
+
+# initial.attributes entries are listed without being built
+tmpls = vcs.elements["template"]
+assert "quick" in tmpls
+assert "quick" in tmpls._pending
+assert "quick" in vcs.listelements("template")
+assert len(tmpls) == len(vcs.listelements("template"))
+
+# first access builds it with its attributes
+t = vcs.gettemplate("quick")
+assert "quick" not in tmpls._pending
+assert isinstance(t, vcs.template.P)
+assert t.name == "quick"
+assert vcs.gettemplate("quick") is t
+
+cmaps = vcs.elements["colormap"]
+pending = [nm for nm in cmaps._pending]
+assert len(pending) > 0
+nm = pending[0]
+c = vcs.getcolormap(nm)
+assert c.name == nm
+assert nm not in cmaps._pending
+
+# names of pending elements are taken
+try:
+    vcs.createtemplate("quick")
+    raise Exception("Duplicate name should have been refused")
+except vcsError:
+    pass
+
+# listing values builds everything
+vals = vcs.elements["boxfill"].values()
+assert len(vals) == len(vcs.elements["boxfill"])
+assert len(vcs.elements["boxfill"]._pending) == 0
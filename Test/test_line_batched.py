@@ -0,0 +1,38 @@
+import vcs
+from vcs import vcs2vtk
+x = vcs.init()
+ln = x.createline()
+xs = []
+ys = []
+for i in range(1000):
+    xs.append([.1, .5, .9])
+    ys.append([i / 1000., (i + .5) / 1000., i / 1000.])
+ln.x = xs
+ln.y = ys
+ln.color = [16 + i % 200 for i in range(1000)]
+ln.width = [1] * 500 + [2] * 500
+ln.type = ["solid", "dash"] * 500
+x.plot(ln, bg=1)
+
+actors = vcs2vtk.prepLine(x.backend.renWin, ln)
+# one actor per (type, width)
+assert len(actors) == 4
+ncells = 0
+for a, geo in actors:
+    pd = a.GetMapper().GetInput()
+    assert pd.GetCellData().GetScalars().GetNumberOfTuples() == \
+        pd.GetNumberOfCells()
+    ncells += pd.GetNumberOfCells()
+assert ncells == 1000
+
+# projected lines get interpolated to follow the projection
+ln.projection = "robinson"
+ln.worldcoordinate = [-180, 180, -90, 90]
+ln.x = [[-170, 0, 170]]
+ln.y = [[0, 45, 0]]
+ln.color = [242]
+ln.width = [1]
+ln.type = ["solid"]
+actors = vcs2vtk.prepLine(x.backend.renWin, ln)
+assert len(actors) == 1
+assert actors[0][0].GetMapper().GetInput().GetNumberOfPoints() == 1 + 2 * 25
@@ -0,0 +1,48 @@
+import vcs
+from vcs import vcs2vtk
+x = vcs.init()
+m = x.createmarker()
+xs = []
+ys = []
+for i in range(500):
+    xs.append([i / 500.])
+    ys.append([(i * 7 % 500) / 500.])
+m.x = xs
+m.y = ys
+m.type = ["dot"] * 250 + ["square"] * 250
+m.size = [5] * 500
+m.color = [16 + i % 200 for i in range(500)]
+x.plot(m, bg=1)
+
+actors = vcs2vtk.prepMarker(x.backend.renWin, m)
+# one entry per marker, but a single actor per marker type
+assert len(actors) == 500
+assert len(set([id(a[3]) for a in actors])) == 2
+pts = actors[0][0].GetInput()
+assert pts.GetNumberOfPoints() == 250
+assert pts.GetPointData().GetScalars().GetNumberOfTuples() == 250
+
+# an entry taken out of its group for editing gets its own actor
+dp = vcs.elements["display"][x.display_names[-1]]
+actors = dp.backend["vtk_backend_marker_actors"]
+shared = actors[3]
+own = x.backend.splitMarker(dp, 3)
+assert dp.backend["vtk_backend_marker_actors"][3] is own
+assert own[3] is not shared[3]
+assert own[0].GetInput().GetNumberOfPoints() == 1
+pts = shared[0].GetInput()
+assert pts.GetNumberOfPoints() == 249
+assert pts.GetPointData().GetScalars().GetNumberOfTuples() == 249
+# the other entries keep the shared one
+assert actors[4] is shared
+entries = vcs2vtk.VN.vtk_to_numpy(pts.GetPointData().GetArray("entry"))
+assert len(entries) == 249 and 3 not in entries
+
+# the points removed are the ones drawn for the entry, even when its
+# coordinates were edited since
+m.x[5] = [.1, .2, .3]
+m.y[5] = [.1, .2, .3]
+own = x.backend.splitMarker(dp, 5)
+assert pts.GetNumberOfPoints() == 248
+entries = vcs2vtk.VN.vtk_to_numpy(pts.GetPointData().GetArray("entry"))
+assert 5 not in entries and 6 in entries
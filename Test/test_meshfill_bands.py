@@ -0,0 +1,27 @@
+import numpy
+import vtk
+import vcs
+import vcs.vcs2vtk
+from vtk.util import numpy_support as VN
+
+# cells are binned in closed bands, later bands win on shared edges
+pd = vtk.vtkPolyData()
+values = numpy.array([-1, 0, .5, 1, 1.5, 2, 2.5, 3, 4, 5, numpy.nan])
+pd.GetCellData().SetScalars(VN.numpy_to_vtk(values, deep=True))
+vcs.vcs2vtk.setBandIndices(pd, [[0, 1], [1, 2], [3, 4]])
+bands = VN.vtk_to_numpy(pd.GetCellData().GetArray("bands"))
+assert bands.tolist() == [-1, 0, 0, 1, 1, 1, -1, 2, 2, -1, -1], bands
+
+# one mapper colored by band for all the levels
+import cdms2
+f = cdms2.open("test_mesh.nc")
+data = f("variable_227")
+mesh = f("variable_226")
+x = vcs.init()
+m = x.createmeshfill()
+m.levels = [-1., -.8, -.6, -.4, -.2, 0, .2, .4, .6, .8, 1.]
+m.fillareacolors = range(16, 26)
+dp = x.plot(data, mesh, m, bg=1)
+luts = dp.backend["vtk_backend_luts"]
+assert len(luts) == 1
+assert luts[0][0].GetNumberOfTableValues() == 10
@@ -0,0 +1,25 @@
+import vcs
+from vcs.error import vcsError
+
+names = set()
+for i in range(2000):
+    names.add(vcs.createline().name)
+assert len(names) == 2000
+
+# a user object using what would be the next generated name is skipped
+n = int(vcs.createline().name.split("_")[-1])
+taken = "__line_%i" % (n + 1)
+vcs.createline(taken)
+assert vcs.createline().name != taken
+
+try:
+    vcs.createline(taken)
+    raise Exception("Duplicate name should have been refused")
+except vcsError:
+    pass
+
+try:
+    vcs.createline(source="__not_a_line__")
+    raise Exception("Missing source should have been refused")
+except vcsError:
+    pass
@@ -0,0 +1,43 @@
+import vcs
+import cdms2
+
+f = cdms2.open(vcs.sample_data + "/clt.nc")
+s = f("clt", time=slice(0, 1), squeeze=1)
+x = vcs.init()
+dp = x.plot(s, bg=1)
+renWin = x.backend.renWin
+actor = dp.backend["vtk_backend_actors"][0][0]
+mapper = actor.GetMapper()
+data = mapper.GetInput()
+mean = dp.backend["vtk_backend_Mean_text_actor"]
+fontSize = mean.GetTextProperty().GetFontSize()
+position = mean.GetPosition()
+xScale = actor.GetUserTransform().GetScale()[0]
+nRenderers = renWin.GetRenderers().GetNumberOfItems()
+
+# resizing keeps the pipelines, only moves and scales what is drawn
+w, h = renWin.GetSize()
+renWin.SetSize(2 * w, 2 * h)
+x.backend.configureEvent(None, None)
+dp = vcs.elements["display"][dp.name]
+assert dp.backend["vtk_backend_actors"][0][0] is actor
+assert actor.GetMapper() is mapper
+assert mapper.GetInput() is data
+assert renWin.GetRenderers().GetNumberOfItems() == nRenderers
+assert mean.GetTextProperty().GetFontSize() > fontSize
+assert mean.GetPosition()[0] > position[0]
+
+# changing the window ratio changes the scale of the data
+renWin.SetSize(4 * w, 2 * h)
+x.backend.configureEvent(None, None)
+assert actor.GetUserTransform().GetScale()[0] > xScale
+assert actor.GetMapper() is mapper
+
+# plots fitted to the window ratio are replotted
+x.clear()
+dp = x.plot(s, bg=1, ratio="autot")
+actor = dp.backend["vtk_backend_actors"][0][0]
+renWin.SetSize(w, h)
+x.backend.configureEvent(None, None)
+dp = vcs.elements["display"][dp.name]
+assert dp.backend["vtk_backend_actors"][0][0] is not actor
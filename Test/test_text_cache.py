@@ -0,0 +1,32 @@
+import vcs
+import cdms2
+
+f = cdms2.open(vcs.sample_data + "/clt.nc")
+s = f("clt", time=slice(0, 1), squeeze=1)
+x = vcs.init()
+x.plot(s, bg=1)
+cache = x.backend.textCache
+misses = cache.properties.stats()["misses"]
+assert misses > 0
+
+# replotting the same labels reuses the prepared text properties
+x.clear()
+x.plot(s, bg=1)
+assert cache.properties.stats()["misses"] == misses
+assert cache.properties.stats()["hits"] > 0
+
+# and the actors of the previous plot
+t = x.createtext()
+t.string = ["reused"]
+t.x = [.5]
+t.y = [.5]
+actor = x.plot(t, bg=1).backend["vtk_backend_text_actors"][0]
+x.clear()
+assert x.plot(t, bg=1).backend["vtk_backend_text_actors"][0] is actor
+
+# measured extents are cached too
+e1 = x.gettextextent(t)
+n = cache.extents.stats()["hits"]
+e2 = x.gettextextent(t)
+assert e1 == e2
+assert cache.extents.stats()["hits"] == n + 1
@@ -0,0 +1,36 @@
+import vcs
+import cdms2
+
+f = cdms2.open(vcs.sample_data + "/clt.nc")
+s = f("clt", time=slice(0, 1), squeeze=1)
+x = vcs.init()
+types = ["line", "marker", "fillarea", "texttable", "textorientation",
+         "textcombined", "display"]
+# a first plot to create the objects that live past the plot
+x.plot(s, bg=1)
+x.clear()
+before = dict((t, len(vcs.elements[t])) for t in types)
+
+# template labels, ticks, boxes and the color bar never get registered
+dp = x.plot(s, bg=1)
+after = dict((t, len(vcs.elements[t])) for t in types)
+before["display"] += 1
+assert before == after, (before, after)
+# the attributes actors are still reported to the display
+assert "vtk_backend_Mean_text_actor" in dp.backend
+assert "vtk_backend_dataname_text_actor" in dp.backend
+
+x.clear()
+y = vcs.createyxvsx()
+y.marker = "dot"
+x.plot(s[0], y, bg=1)
+after = dict((t, len(vcs.elements[t])) for t in types)
+assert before == after, (before, after)
+
+# a transient primitive draws like a registered one
+t = vcs.transient.Text()
+t.string = ["hello"]
+t.x = [.5]
+t.y = [.5]
+drawn = vcs.transient.draw(x, t, bg=1)
+assert drawn["vtk_backend_text_actors"][0].GetInput() == "hello"
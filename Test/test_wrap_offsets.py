@@ -0,0 +1,48 @@
+import vtk
+import vcs
+import vcs.vcs2vtk
+
+offsets = vcs.vcs2vtk.wrapOffsets
+assert offsets(0, 360, 0, 360, 360) == [0]
+assert offsets(0, 360, -180, 180, 360) == [-360, 0]
+assert offsets(0, 360, -720, 1080, 360) == [-720, -360, 0, 360, 720]
+# data far off the window only gets the copies that show
+assert offsets(3600, 3960, 0, 100, 360) == [-3600]
+
+# a 0..360 longitude band wrapped over -180..540
+plane = vtk.vtkPlaneSource()
+plane.SetOrigin(0, -90, 0)
+plane.SetPoint1(360, -90, 0)
+plane.SetPoint2(0, 90, 0)
+plane.SetResolution(36, 18)
+plane.Update()
+wrapped = vcs.vcs2vtk.doWrapData(plane.GetOutput(), [-180, 540, -90, 90])
+b = wrapped.GetBounds()
+assert b[0] <= -180 and b[1] >= 540, b
+assert wrapped.GetNumberOfCells() >= 2 * 36 * 18
+
+# structured grids inside the window are not converted
+grid = vtk.vtkStructuredGrid()
+grid.SetDimensions(2, 2, 1)
+pts = vtk.vtkPoints()
+for x, y in [(10, 10), (20, 10), (10, 20), (20, 20)]:
+    pts.InsertNextPoint(x, y, 0)
+grid.SetPoints(pts)
+assert vcs.vcs2vtk.doWrapData(grid, [0, 360, -90, 90]) is grid
+
+# other grids are still turned into polydata (removeHiddenPoints needs it)
+ugrid = vtk.vtkUnstructuredGrid()
+ugrid.SetPoints(pts)
+ugrid.InsertNextCell(vtk.VTK_QUAD, 4, [0, 1, 3, 2])
+assert vcs.vcs2vtk.doWrapData(ugrid, [0, 360, -90, 90]).IsA("vtkPolyData")
+
+# meshfill with points hidden by the projection
+import cdms2
+f = cdms2.open("test_mesh.nc")
+data = f("variable_227")
+mesh = f("variable_226")
+x = vcs.init()
+m = x.createmeshfill()
+m.projection = "orthographic"
+dp = x.plot(data, mesh, m, bg=1)
+assert dp.backend["vtk_backend_grid"] is not None
@@ -23,8 +23,6 @@ import textorientation
 import textcombined
 import template
 import displayplot
-import vtk
-from VTKPlots import VTKVCSBackend
 from weakref import WeakSet, WeakKeyDictionary
 
 from error import vcsError
@@ -48,7 +46,6 @@ gui_canvas_closed = 0
 canvas_closed = 0
 import vcsaddons  # noqa
 import vcs.manageElements  # noqa
-import configurator  # noqa
 from projection import no_deformation_projections  # noqa
 
 # Python < 3 DeprecationWarning ignored by default
@@ -878,9 +875,14 @@ class Canvas(object):
             self.bgX = 814
             self.bgY = 606
 
+        # vtk and the backend are only loaded with the first canvas
         if backend == "vtk":
+            from VTKPlots import VTKVCSBackend
             self.backend = VTKVCSBackend(self, geometry=geometry, bg=bg)
-        elif isinstance(backend, vtk.vtkRenderWindow):
+        elif "vtk" in sys.modules and isinstance(
+                backend, sys.modules["vtk"].vtkRenderWindow):
+            # a render window means vtk is already imported
+            from VTKPlots import VTKVCSBackend
             self.backend = VTKVCSBackend(self, renWin=backend, bg=bg)
         else:
             warnings.warn(
@@ -916,6 +918,7 @@ class Canvas(object):
             if "3d" in d.g_type.lower():
                 return
         if self.configurator is None:
+            import configurator
             self.configurator = configurator.Configurator(self)
             self.configurator.update()
             self.configurator.show()
@@ -4032,7 +4035,7 @@ class Canvas(object):
                     if e == "display":
                         continue
                     for k in new_elts[e]:
-                        if k in vcs.elements[e].keys():
+                        if k in vcs.elements[e]:
                             del(vcs.elements[e][k])
             if not preserve_display:
                 del(vcs.elements["display"][nm])
@@ -4610,6 +4613,49 @@ class Canvas(object):
 
         return result == 0
 
+    def ffmpeg_stream(self, movie, rate=None, options=None, bitrate=None):
+        """
+        Movie output without intermediate files: frames are piped to ffmpeg
+        as they are added.
+
+        .. note::
+
+            ffmpeg ALWAYS overwrites the output file
+
+        :Example:
+
+            .. doctest:: canvas_ffmpeg_stream
+
+                >>> a=vcs.init(bg=True)
+                >>> import cdms2
+                >>> f = cdms2.open(vcs.sample_data+'/clt.nc')
+                >>> clt = f('clt')
+                >>> stream = a.ffmpeg_stream('mymovie.mp4', rate=5)
+                >>> for i in range(clt.shape[0]):
+                ...     a.clear()
+                ...     d = a.plot(clt[i])
+                ...     stream.write() # adds the canvas content to the movie
+                >>> stream.close()
+                True
+
+        :param movie: Output video file name
+        :type movie: str
+
+        :param rate: Desired output framerate
+        :type rate: str
+
+        :param options: Additional FFMPEG arguments
+        :type options: str
+
+        :param bitrate: Desired video bitrate (kbit/s), ffmpeg's default if None
+        :type bitrate: int
+
+        :returns: A stream, call its write() method for each frame then close()
+        :rtype: vcs.videostream.VideoStream
+        """
+        import videostream
+        return videostream.VideoStream(movie, self, rate, options, bitrate)
+
     def getantialiasing(self):
         return self.backend.getantialiasing()
 
@@ -150,7 +150,7 @@ def checkLine(self, name, value):
             name +
             ' must be an line primitive or the name of an exiting one.')
     if isinstance(value, str):
-        if value not in vcs.listelements('line'):
+        if value not in vcs.elements['line']:
             checkedRaise(
                 self,
                 value,
@@ -925,7 +925,7 @@ def checkTextTable(self, name, value):
     if isinstance(value, unicode):
         value = str(value)
     if isinstance(value, str):
-        if value not in vcs.listelements("texttable"):
+        if value not in vcs.elements["texttable"]:
             checkedRaise(
                 self,
                 value,
@@ -947,7 +947,7 @@ def checkTextOrientation(self, name, value):
     if isinstance(value, unicode):
         value = str(value)
     if isinstance(value, str):
-        if value not in vcs.listelements("textorientation"):
+        if value not in vcs.elements["textorientation"]:
             checkedRaise(
                 self,
                 value,
@@ -982,17 +982,17 @@ def checkTextsList(self, name, value, storeName=False):
         elif queries.istextcombined(v):
             hvalue.append(v)
         elif isinstance(v, str):
-            if v in vcs.listelements("textcombined"):
+            if v in vcs.elements["textcombined"]:
                 if storeName:
                     hvalue.append(vcs.gettextcombined(v).name)
                 else:
                     hvalue.append(vcs.gettextcombined(v))
-            elif v in vcs.listelements("texttable"):
+            elif v in vcs.elements["texttable"]:
                 if storeName:
                     hvalue.append(vcs.gettexttable(v).name)
                 else:
                     hvalue.append(vcs.gettexttable(v))
-            elif v in vcs.listelements("textorientation"):
+            elif v in vcs.elements["textorientation"]:
                 if storeName:
                     hvalue.append(vcs.gettextorientation(v).name)
                 else:
@@ -1105,7 +1105,7 @@ def checkProjection(self, name, value):
         return value.name
     elif isinstance(value, (str, unicode)):
         value = str(value)
-        if value not in vcs.elements["projection"].keys():
+        if value not in vcs.elements["projection"]:
             checkedRaise(
                 self,
                 value,
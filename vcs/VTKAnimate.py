@@ -7,7 +7,9 @@ import hashlib
 import os
 import shutil
 import glob
+import multiprocessing
 import vcs
+from vcsvtk.lrucache import LRUCache, vtk_nbytes
 
 
 def update_input(canvas, dimensions, frame_num, update=True):
@@ -43,19 +45,103 @@ def update_input(canvas, dimensions, frame_num, update=True):
                 update=update)
 
 
+class FrameStore(object):
+
+    """In memory animation frames (vtkImageData) bounded to maxbytes.
+
+    Least recently shown frames are spilled to png_name(frame_num) when the
+    memory budget is exceeded and read back from there when asked for.
+    """
+
+    def __init__(self, maxbytes, png_name):
+        self.png_name = png_name
+        self.spilled = set()
+        self.cache = LRUCache(maxsize=float("inf"), maxbytes=maxbytes,
+                              sizeof=vtk_nbytes, on_evict=self.spill)
+
+    def __len__(self):
+        return len(self.spilled.union(self.cache.keys()))
+
+    def __contains__(self, frame_num):
+        return frame_num in self.cache or frame_num in self.spilled
+
+    def put(self, frame_num, image):
+        self.spilled.discard(frame_num)
+        self.cache.put(frame_num, image)
+
+    def get(self, frame_num):
+        """Returns the frame image, png file name if spilled or None"""
+        image = self.cache.get(frame_num)
+        if image is None and frame_num in self.spilled:
+            return self.png_name(frame_num)
+        return image
+
+    def spill(self, frame_num, image):
+        import vtk
+        writer = vtk.vtkPNGWriter()
+        writer.SetInputData(image)
+        writer.SetFileName(self.png_name(frame_num))
+        writer.Write()
+        self.spilled.add(frame_num)
+
+    def flush(self):
+        """Writes all frames still in memory to disk"""
+        for frame_num, image in self.cache.items():
+            if frame_num not in self.spilled:
+                self.spill(frame_num, image)
+
+    def clear(self):
+        self.cache.clear()
+        self.spilled = set()
+
+
+# State of a frame rendering worker process, set by _init_frame_worker
+_frame_worker = None
+
+
+def _init_frame_worker(controller, display_names, size, antialiasing):
+    # Workers are forked from the creating process, so vcs.elements (and the
+    # displays it holds) are already there, we only need our own bg canvas
+    global _frame_worker
+    canvas = vcs.init(bg=True)
+    canvas.bgX, canvas.bgY = size
+    canvas.setantialiasing(antialiasing)
+    controller.plot_to_canvas(canvas, display_names, bg=1)
+    _frame_worker = (canvas, controller._number_of_dims_used_for_plot)
+
+
+def _render_frame_worker(frame):
+    frame_num, png_name = frame
+    canvas, dimensions = _frame_worker
+    update_input(canvas, dimensions, frame_num, update=False)
+    canvas.png(png_name)
+    return frame_num
+
+
 class VTKAnimationCreate(animate_helper.StoppableThread):
 
     def __init__(self, controller):
         animate_helper.StoppableThread.__init__(self)
         self.controller = controller
         self.create_prefix()
-        self.canvas = vcs.init()
-        self.canvas.bgX, self.canvas.bgY = controller.vcs_self.backend.renWin.GetSize()
+        width, height = controller.vcs_self.backend.renWin.GetSize()
         # Animation resizing is broken right now; this will give us some buffer
         # space to work with.
-        self.canvas.bgX *= 2
-        self.canvas.bgY *= 2
+        size = (2 * width, 2 * height)
+        # Workers have to be started here, on the calling thread and before
+        # our own canvas exists, see draw_frames_parallel
+        self.pool = self.start_frame_workers(size)
+        self.canvas = vcs.init()
+        self.canvas.bgX, self.canvas.bgY = size
         self.controller.animation_created = True
+        # In memory frames, used when create() was given a frame_memory
+        # budget (in megabytes); frames go through png files otherwise
+        frame_memory = self.controller.create_params.frame_memory
+        if frame_memory is not None:
+            self.frames = FrameStore(frame_memory * 1024 * 1024,
+                                     self.get_frame_name)
+        else:
+            self.frames = None
         import atexit
         atexit.register(self.close)
 
@@ -63,8 +149,75 @@ class VTKAnimationCreate(animate_helper.StoppableThread):
         self.controller._unique_prefix = hashlib.sha1(
             time.asctime() + str(random.randint(0, 10000))).hexdigest()
 
+    def start_frame_workers(self, size):
+        """
+        Starts the pool of processes drawing frames for
+        draw_frames_parallel, None when frames are drawn on demand.
+        """
+        processes = self.controller.create_params.processes
+        if processes is None or processes < 2:
+            return None
+        if self.controller.vcs_self.backend.isopened():
+            # Forked workers would share the window's X connection
+            return None
+        self.processes = min(processes, self.controller.number_of_frames())
+        return multiprocessing.Pool(
+            self.processes,
+            _init_frame_worker,
+            (self.controller,
+             self.controller.vcs_self.display_names,
+             size,
+             self.controller.vcs_self.getantialiasing()))
+
     def run(self):
-        pass
+        if self.pool is not None:
+            self.draw_frames_parallel()
+
+    def draw_frames_parallel(self):
+        """
+        Render every frame ahead of playback, partitioning the frame
+        indices across the worker processes, each replaying the display
+        list on its own offscreen canvas. Frames are reported
+        (signals.drawn) and stored in frame order.
+
+        The workers are forked (python 2 multiprocessing cannot start them
+        in fresh interpreters), which is what gives them vcs.elements and
+        the displays to replay. They are forked when the animation is
+        created, before its thread and canvas exist, and never draw in a
+        window of ours. Forking a process holding an onscreen window is
+        not safe though (the children would share its X connection), so
+        canvases with an open window draw their frames on demand instead.
+        """
+        pool, self.pool = self.pool, None
+        nframes = self.controller.number_of_frames()
+        png_names = [self.get_frame_name(i) for i in range(nframes)]
+        frames = [(i, png_name) for i, png_name in enumerate(png_names)
+                  if not os.path.exists(png_name)]
+        # contiguous blocks of frames per task, imap hands them back in
+        # order whichever worker finishes first
+        chunksize = max(1, len(frames) // (self.processes * 4))
+        try:
+            for frame_num in pool.imap(_render_frame_worker, frames,
+                                       chunksize):
+                if self.is_stopped():
+                    pool.terminate()
+                    return
+                self.wait_if_paused()
+                if self.controller.signals is not None:
+                    self.controller.signals.drawn.emit(frame_num)
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+        self.controller.animation_files = png_names
+        if self.frames is not None:
+            # already on disk, read back lazily
+            self.frames.spilled.update(range(nframes))
+        if self.controller.signals is not None:
+            self.controller.signals.created.emit()
 
     def get_frame_name(self, frame_num):
         png_name = os.path.join(
@@ -77,7 +230,37 @@ class VTKAnimationCreate(animate_helper.StoppableThread):
             os.makedirs(os.path.dirname(png_name))
         return png_name
 
+    def number_of_frames_drawn(self):
+        if self.frames is not None:
+            return len(self.frames)
+        return len(self.controller.animation_files)
+
+    def store_frame(self, frame_num, canvas):
+        """Keeps what is currently on canvas as frame_num"""
+        if self.frames is not None:
+            self.frames.put(frame_num, canvas.backend.snapshot())
+        else:
+            png_name = self.get_frame_name(frame_num)
+            canvas.png(png_name)
+            self.controller.animation_files = sorted(
+                glob.glob(
+                    os.path.join(
+                        os.path.dirname(png_name),
+                        "*.png")))
+
     def get_frame(self, frame_num):
+        if self.frames is not None:
+            image = self.frames.get(frame_num)
+            if image is None:
+                update_input(
+                    self.canvas,
+                    self.controller._number_of_dims_used_for_plot,
+                    frame_num,
+                    update=False)
+                image = self.canvas.backend.snapshot()
+                self.frames.put(frame_num, image)
+            return image
+
         png_name = self.get_frame_name(frame_num)
 
         if not os.path.exists(png_name):
@@ -114,7 +297,22 @@ class VTKAnimationCreate(animate_helper.StoppableThread):
             else:
                 print "No Array"
 
+    def clear_frames(self):
+        if self.frames is not None:
+            self.frames.clear()
+        frames_dir = os.path.join(
+            os.path.expanduser("~"),
+            ".uvcdat",
+            self.controller._unique_prefix)
+        if os.path.exists(frames_dir):
+            shutil.rmtree(frames_dir)
+        self.controller.animation_files = []
+
     def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
         self.canvas.close()
 
 
@@ -179,9 +377,7 @@ class VTKAnimate(animate_helper.AnimationController):
             self.vcs_self.backend._lastSize = new_size
             # All of the images are now the wrong size; need to blow them all
             # away.
-            if self.animation_files:
-                shutil.rmtree(os.path.dirname(self.animation_files[0]))
-                self.animation_files = []
+            self.create_thread.clear_frames()
             # We'll use None as a sentinel value to tell us to replot in
             # retrieve_renderers
             self.renderers = None
@@ -295,7 +491,7 @@ class VTKAnimate(animate_helper.AnimationController):
         else:
             self.frame_num = frame_num
 
-        if len(self.animation_files) == self.number_of_frames():
+        if self.create_thread.number_of_frames_drawn() == self.number_of_frames():
             # Attempt to extract the renderers and place them onto the create
             # thread
             self.extract_renderers()
@@ -318,13 +514,7 @@ class VTKAnimate(animate_helper.AnimationController):
             self.vcs_self.backend.renWin.Render()
 
             if main_window_png or self.playback_params.zoom_factor != 1:
-                png_name = self.create_thread.get_frame_name(self.frame_num)
-                self.vcs_self.png(png_name)
-                self.animation_files = sorted(
-                    glob.glob(
-                        os.path.join(
-                            os.path.dirname(png_name),
-                            "*.png")))
+                self.create_thread.store_frame(self.frame_num, self.vcs_self)
 
         if self.signals is not None:
             self.signals.drawn.emit(self.frame_num)
@@ -335,12 +525,58 @@ class VTKAnimate(animate_helper.AnimationController):
 
     def reset(self):
         if self.create_thread:
-            if self.animation_files:
-                shutil.rmtree(os.path.dirname(self.animation_files[0]))
-                self.animation_files = []
+            self.create_thread.clear_frames()
             self.create_thread.create_prefix()
             self.reclaim_renderers()
 
+    def save(self, movie, bitrate=1024, rate=None, options=None,
+             stream=False):
+        """Save animation to a file
+
+        stream: pipe frames to ffmpeg as they are rendered rather than
+        writing them all as png files first
+        """
+        if stream:
+            return self.save_stream(movie, rate, options, bitrate)
+        frames = self.create_thread.frames if self.create_thread else None
+        if self.created() and frames is not None:
+            self.create_canvas()
+            # ffmpeg reads the frames from disk
+            for i in range(self.number_of_frames()):
+                if i not in frames:
+                    self.create_thread.get_frame(i)
+            frames.flush()
+            self.animation_files = [self.create_thread.get_frame_name(i)
+                                    for i in range(self.number_of_frames())]
+        super(VTKAnimate, self).save(movie, bitrate, rate, options)
+
+    def create_canvas(self):
+        """Offscreen canvas frames are drawn on, plotted on first use"""
+        canvas = self.create_thread.canvas
+        if canvas.animate_info == []:
+            canvas.setantialiasing(self.vcs_self.getantialiasing())
+            self.plot_to_canvas(canvas, self.vcs_self.display_names, bg=1)
+        return canvas
+
+    def save_stream(self, movie, rate=None, options=None, bitrate=None):
+        if not self.created():
+            return
+        if rate is None:
+            rate = self.playback_params.fps()
+        from videostream import VideoStream
+        canvas = self.create_canvas()
+        # Render every frame on the offscreen canvas so they all have the
+        # same size, handing each to ffmpeg as soon as it is drawn
+        stream = VideoStream(movie, canvas, rate, options, bitrate)
+        for i in range(self.number_of_frames()):
+            update_input(
+                canvas,
+                self._number_of_dims_used_for_plot,
+                i,
+                update=False)
+            stream.write()
+        return stream.close()
+
     def frame(self, frame):
         self.draw_frame(
             frame_num=frame,
@@ -12,6 +12,8 @@ import cdtime
 import inspect
 import VTKAnimate
 import vcsvtk
+from vcsvtk.textcache import TextCache
+from projection import no_deformation_projections
 
 
 class VCSInteractorStyle(vtk.vtkInteractorStyleUser):
@@ -40,10 +42,24 @@ class VTKVCSBackend(object):
         self.plotRenderers = set()
         # Maps priorities to renderers
         self.text_renderers = {}
+        # Prepared text properties, extents and reusable text actors
+        self.textCache = TextCache()
         self.logoRenderer = None
         self.logoRepresentation = None
         self.renderer = None
         self._renderers = {}
+        # What relayout() refits to a new window size: the renderers placed
+        # by fitToViewport (with their actors), the marker glyphs undoing
+        # the actor scale, the text actors and the fillarea patterns
+        self._layouts = {}
+        self._glyphs = []
+        self._texts = []
+        self._patterns = []
+        # Set when something drawn depends on the window size in a way
+        # relayout() does not refit, resizing then replots everything
+        self.sizeDependent = False
+        self._resizeTimer = None
+        self._resizeObserver = None
         self._plot_keywords = [
             'cdmsfile',
             'cell_coordinates',
@@ -276,7 +292,134 @@ class VTKVCSBackend(object):
             # not catch configure Events but only modifiedEvents....
             return
 
-        self._lastSize = sz
+        interactor = self.renWin.GetInteractor()
+        if ev is not None and interactor is not None and interactor.GetInitialized():
+            # Dragging the window sends a burst of events, fit the plots
+            # once per burst
+            if self._resizeObserver is None or self._resizeObserver[0] is not interactor:
+                self._resizeObserver = (interactor, interactor.AddObserver(
+                    "TimerEvent", self.resizeTimerEvent))
+            if self._resizeTimer is None:
+                self._resizeTimer = interactor.CreateOneShotTimer(100)
+            return
+        self.resize()
+
+    def resizeTimerEvent(self, obj, event):
+        if self._resizeTimer is None or obj.GetTimerEventId() != self._resizeTimer:
+            return
+        self._resizeTimer = None
+        if self.renWin is None:
+            return
+        self.resize()
+        self.renWin.Render()
+
+    def resize(self):
+        """Fits the plots to the current size of the window, moving and
+        scaling what is drawn when possible, replotting otherwise."""
+        self._lastSize = self.renWin.GetSize()
+        if self.canRelayout():
+            self.relayout()
+        else:
+            self.replot()
+
+    def canRelayout(self):
+        """Whether relayout() is enough to fit the plots to a new window
+        size"""
+        if self.sizeDependent:
+            return False
+        if self.canvas.animate.created() and self.canvas.animate.frame_num != 0:
+            return False
+        if self.canvas.configurator is not None and\
+                self.canvas.configurator.animation_timer is not None:
+            return False
+        for dnm in self.canvas.display_names:
+            d = vcs.elements["display"][dnm]
+            # Same ratio as Canvas.plot
+            if d.ratio is not None:
+                doratio = str(d.ratio).strip().lower()
+            else:
+                doratio = str(self.canvas.ratio).strip().lower()
+            if doratio[-1] == 't' and doratio[0] == '0':
+                if float(doratio[:-1]) == 0.:
+                    doratio = '0'
+            if doratio in ["off", "none"]:
+                continue
+            if doratio != "0":
+                # the template is fitted to the window ratio
+                return False
+            tp = d.g_type
+            if tp == "text":
+                tp = "textcombined"
+            elif tp == "default":
+                tp = "boxfill"
+            elif tp in ("xvsy", "xyvsy", "yxvsx", "scatter"):
+                tp = "1d"
+            gm = vcs.elements[tp].get(d.g_name)
+            if gm is None:
+                return False
+            if hasattr(gm, "projection") and self.canvas.getprojection(
+                    gm.projection).type in no_deformation_projections:
+                # plotted with a ratio of 1 anyway
+                return False
+        return True
+
+    def relayout(self):
+        """Fits what is drawn to the current size of the window without
+        rebuilding it: the datasets, filters, mappers and actors are kept,
+        only the cameras and actor scales (fitToViewport), the text positions
+        and font sizes (prepTextProperty) and the pattern resolutions are
+        recomputed."""
+        sz = self.renWin.GetSize()
+        if sz[0] == 0 or sz[1] == 0:
+            return
+        for Renderer, layout in self._layouts.iteritems():
+            flipX, flipY = layout["flip"]
+            xScale, yScale = self.fitCamera(
+                Renderer, layout["viewport"], layout["xrange"],
+                layout["yrange"], flipX, flipY, layout["geo"], sz)
+            # The clipping planes already went through the previous scale
+            oldX, oldY = layout["scale"]
+            T = vtk.vtkTransform()
+            T.Scale(xScale / oldX, yScale / oldY, 1.)
+            for Actor in layout["actors"]:
+                scale = vtk.vtkTransform()
+                scale.Scale(xScale, yScale, 1.)
+                Actor.SetUserTransform(scale)
+                self.transformClipPlanes(Actor.GetMapper(), T)
+            layout["scale"] = (xScale, yScale)
+        for g, gs, pd, act in self._glyphs:
+            vcs2vtk.scaleMarkerGlyph(g, gs, pd, act)
+
+        # Later plots share the renderers of the same viewport
+        renderers = {}
+        for key, value in self._renderers.iteritems():
+            if len(key) == 4:
+                Renderer = value[0]
+                key = (key[0], key[1], sz, key[3])
+                value = (Renderer,) + self._layouts[Renderer]["scale"]
+            renderers[key] = value
+        self._renderers = renderers
+        for dnm in self.canvas.display_names:
+            backend = vcs.elements["display"][dnm].backend
+            if backend and backend.get("surface_renderer") in self._layouts:
+                backend["surface_scale"] = self._layouts[
+                    backend["surface_renderer"]]["scale"]
+
+        for ren, actors, x, y, to, tt, cmap, geoBounds, geo in self._texts:
+            key = vcs2vtk.textPropertyKey(sz, to, tt, cmap)
+
+            def prep(p):
+                vcs2vtk.prepTextProperty(p, sz, to, tt, cmap)
+
+            p = self.textCache.property(key, prep)
+            for t in actors:
+                t.GetTextProperty().ShallowCopy(p)
+            vcs2vtk.placeTextActors(ren, actors, x, y, tt, geoBounds, geo)
+
+        vcs2vtk.resizePatterns(self._patterns, sz)
+
+    def replot(self):
+        """Clears the canvas and plots its displays again"""
         plots_args = []
         key_args = []
 
@@ -327,6 +470,7 @@ class VTKVCSBackend(object):
         renderers.InitTraversal()
         ren = renderers.GetNextItem()
         self.text_renderers = {}
+        self.textCache.release()
         hasValidRenderer = True if ren is not None else False
 
         for gm in self.plotApps:
@@ -351,6 +495,11 @@ class VTKVCSBackend(object):
         self.logoRenderer = None
         self.createLogo()
         self._renderers = {}
+        self._layouts = {}
+        self._glyphs = []
+        self._texts = []
+        self._patterns = []
+        self.sizeDependent = False
 
     def createDefaultInteractor(self, ren=None):
         defaultInteractor = self.renWin.GetInteractor()
@@ -427,7 +576,9 @@ class VTKVCSBackend(object):
                 for i, args in enumerate(plots_args):
                     self.canvas.plot(*args, **key_args[i])
             else:
-                self.configureEvent(None, None)
+                # something changed, resizing is not enough
+                self._lastSize = self.renWin.GetSize()
+                self.replot()
 
     def canvasinfo(self):
         if self.renWin is None:
@@ -577,7 +728,11 @@ class VTKVCSBackend(object):
             self.renWin.SetSize(self.canvas.bgX, self.canvas.bgY)
         self.cell_coordinates = kargs.get('cell_coordinates', None)
         self.canvas.initLogoDrawing()
-        if gtype == "text":
+        if not isinstance(gname, basestring):
+            # vcs.transient primitive, not in vcs.elements
+            gm = gname
+            tt = to = gm
+        elif gtype == "text":
             tt, to = gname.split(":::")
             tt = vcs.elements["texttable"][tt]
             to = vcs.elements["textorientation"][to]
@@ -623,7 +778,7 @@ class VTKVCSBackend(object):
                     self.renWin.AddRenderer(ren)
                     self.setLayer(ren, 1)
 
-                returned["vtk_backend_text_actors"] = vcs2vtk.genTextActor(
+                returned["vtk_backend_text_actors"] = self.genTextActor(
                     ren,
                     to=to,
                     tt=tt,
@@ -652,7 +807,12 @@ class VTKVCSBackend(object):
                                             cmap=self.canvas.colormap)
                 returned["vtk_backend_marker_actors"] = actors
                 create_renderer = True
+                done = set()
                 for g, gs, pd, act, geo in actors:
+                    if id(act) in done:
+                        # shared by entries of the same type and size
+                        continue
+                    done.add(id(act))
                     ren = self.fitToViewport(
                         act,
                         gm.viewport,
@@ -664,11 +824,13 @@ class VTKVCSBackend(object):
                     create_renderer = False
                     if pd is None and act.GetUserTransform():
                         vcs2vtk.scaleMarkerGlyph(g, gs, pd, act)
+                        self._glyphs.append((g, gs, pd, act))
 
         elif gtype == "fillarea":
             if gm.priority != 0:
                 actors = vcs2vtk.prepFillarea(self.renWin, gm,
-                                              cmap=self.canvas.colormap)
+                                              cmap=self.canvas.colormap,
+                                              patterns=self._patterns)
                 returned["vtk_backend_fillarea_actors"] = actors
                 create_renderer = True
                 for act, geo in actors:
@@ -754,28 +916,13 @@ class VTKVCSBackend(object):
         continents_path = self.canvas._continentspath()
         if continents_path is None:
             return (None, 1, 1)
-        contData = vcs2vtk.prepContinents(continents_path)
-        contData = vcs2vtk.doWrapData(contData, wc, fastClip=False)
+        contData, geo = vcs2vtk.prepProjectedContinents(
+            continents_path, wc, projection)
         contMapper = vtk.vtkPolyDataMapper()
         contMapper.SetInputData(contData)
         contActor = vtk.vtkActor()
         contActor.SetMapper(contMapper)
 
-        if projection.type != "linear":
-            contData = contActor.GetMapper().GetInput()
-            cpts = contData.GetPoints()
-            # we use plotting coordinates for doing the projection so
-            # that parameters such that central meridian are set correctly.
-            geo, gcpts = vcs2vtk.project(cpts, projection, wc)
-            contData.SetPoints(gcpts)
-
-            contMapper = vtk.vtkPolyDataMapper()
-            contMapper.SetInputData(contData)
-            contActor = vtk.vtkActor()
-            contActor.SetMapper(contMapper)
-        else:
-            geo = None
-
         contLine = self.canvas.getcontinentsline()
         line_prop = contActor.GetProperty()
 
@@ -811,14 +958,14 @@ class VTKVCSBackend(object):
                                   create_renderer=True)
 
     def renderTemplate(self, tmpl, data, gm, taxis, zaxis, X=None, Y=None, **kargs):
-        # ok first basic template stuff, let's store the displays
+        # ok first basic template stuff, let's keep what was drawn
         # because we need to return actors for min/max/mean
-        displays = tmpl.plot(self.canvas, data, gm, bg=self.bg, X=X, Y=Y, **kargs)
+        drawn = tmpl.plot(self.canvas, data, gm, bg=self.bg, X=X, Y=Y, **kargs)
         returned = {}
-        for d in displays:
-            if d is None:
+        for d in drawn:
+            if "vtk_backend_template_attribute" not in d:
                 continue
-            texts = d.backend.get("vtk_backend_text_actors", [])
+            texts = d.get("vtk_backend_text_actors", [])
             for t in texts:
                 # ok we had a text actor, let's see if it's min/max/mean
                 txt = t.GetInput()
@@ -828,9 +975,7 @@ class VTKVCSBackend(object):
                 else:
                     returned[
                         "vtk_backend_%s_text_actor" %
-                        d.backend["vtk_backend_template_attribute"]] = t
-            self.canvas.display_names.remove(d.name)
-            del(vcs.elements["display"][d.name])
+                        d["vtk_backend_template_attribute"]] = t
         # Sometimes user passes "date" as an attribute to replace date
         if hasattr(data, "user_date"):
             taxis = cdms2.createAxis(
@@ -848,9 +993,9 @@ class VTKVCSBackend(object):
                         taxis.getCalendar()))
                 # ok we have a time axis let's display the time
                 crdate = vcs2vtk.applyAttributesFromVCStmpl(tmpl, "crdate")
-                crdate.string = tstr.split()[0].replace("-", "/")
+                crdate.string = [tstr.split()[0].replace("-", "/")]
                 crtime = vcs2vtk.applyAttributesFromVCStmpl(tmpl, "crtime")
-                crtime.string = tstr.split()[1]
+                crtime.string = [tstr.split()[1]]
                 if not (None, None, None) in self._renderers.keys():
                     ren = self.createRenderer()
                     self.renWin.AddRenderer(ren)
@@ -858,36 +1003,24 @@ class VTKVCSBackend(object):
                     self._renderers[(None, None, None)] = (ren, 1, 1)
                 else:
                     ren, xratio, yratio = self._renderers[(None, None, None)]
-                tt, to = crdate.name.split(":::")
-                tt = vcs.elements["texttable"][tt]
-                to = vcs.elements["textorientation"][to]
                 if crdate.priority > 0:
-                    actors = vcs2vtk.genTextActor(ren, to=to, tt=tt)
+                    actors = self.genTextActor(ren, to=crdate, tt=crdate)
                     returned["vtk_backend_crdate_text_actor"] = actors[0]
-                del(vcs.elements["texttable"][tt.name])
-                del(vcs.elements["textorientation"][to.name])
-                del(vcs.elements["textcombined"][crdate.name])
-                tt, to = crtime.name.split(":::")
-                tt = vcs.elements["texttable"][tt]
-                to = vcs.elements["textorientation"][to]
                 if crtime.priority > 0:
-                    actors = vcs2vtk.genTextActor(ren, to=to, tt=tt)
+                    actors = self.genTextActor(ren, to=crtime, tt=crtime)
                     returned["vtk_backend_crtime_text_actor"] = actors[0]
-                del(vcs.elements["texttable"][tt.name])
-                del(vcs.elements["textorientation"][to.name])
-                del(vcs.elements["textcombined"][crtime.name])
             except:
                 pass
         if zaxis is not None:
             try:
                 # ok we have a zaxis to draw
                 zname = vcs2vtk.applyAttributesFromVCStmpl(tmpl, "zname")
-                zname.string = zaxis.id
+                zname.string = [zaxis.id]
                 zvalue = vcs2vtk.applyAttributesFromVCStmpl(tmpl, "zvalue")
                 if zaxis.isTime():
-                    zvalue.string = str(zaxis.asComponentTime()[0])
+                    zvalue.string = [str(zaxis.asComponentTime()[0])]
                 else:
-                    zvalue.string = "%g" % zaxis[0]
+                    zvalue.string = ["%g" % zaxis[0]]
                 if not (None, None, None) in self._renderers.keys():
                     ren = self.createRenderer()
                     self.renWin.AddRenderer(ren)
@@ -895,38 +1028,57 @@ class VTKVCSBackend(object):
                     self._renderers[(None, None, None)] = (ren, 1, 1)
                 else:
                     ren, xratio, yratio = self._renderers[(None, None, None)]
-                tt, to = zname.name.split(":::")
-                tt = vcs.elements["texttable"][tt]
-                to = vcs.elements["textorientation"][to]
                 if zname.priority > 0:
-                    vcs2vtk.genTextActor(ren, to=to, tt=tt)
-                del(vcs.elements["texttable"][tt.name])
-                del(vcs.elements["textorientation"][to.name])
-                del(vcs.elements["textcombined"][zname.name])
+                    self.genTextActor(ren, to=zname, tt=zname)
                 if hasattr(zaxis, "units"):
                     zunits = vcs2vtk.applyAttributesFromVCStmpl(tmpl, "zunits")
-                    zunits.string = zaxis.units
+                    zunits.string = [zaxis.units]
                     if zunits.priority > 0:
-                        tt, to = zunits.name.split(":::")
-                        tt = vcs.elements["texttable"][tt]
-                        to = vcs.elements["textorientation"][to]
-                        vcs2vtk.genTextActor(ren, to=to, tt=tt)
-                        del(vcs.elements["texttable"][tt.name])
-                        del(vcs.elements["textorientation"][to.name])
-                        del(vcs.elements["textcombined"][zunits.name])
-                tt, to = zvalue.name.split(":::")
-                tt = vcs.elements["texttable"][tt]
-                to = vcs.elements["textorientation"][to]
+                        self.genTextActor(ren, to=zunits, tt=zunits)
                 if zvalue.priority > 0:
-                    actors = vcs2vtk.genTextActor(ren, to=to, tt=tt)
+                    actors = self.genTextActor(ren, to=zvalue, tt=zvalue)
                     returned["vtk_backend_zvalue_text_actor"] = actors[0]
-                del(vcs.elements["texttable"][tt.name])
-                del(vcs.elements["textorientation"][to.name])
-                del(vcs.elements["textcombined"][zvalue.name])
             except:
                 pass
         return returned
 
+    def splitMarker(self, display, index):
+        """Gives entry index of a marker display its own glyph filter and
+        actor, entries of the same type and size are drawn together (see
+        vcs2vtk.prepMarker). Editors use it to change one entry only.
+        Returns the (g, gs, pd, actor, geo) of the entry."""
+        actors = display.backend["vtk_backend_marker_actors"]
+        group = actors[index]
+        if len([a for a in actors if a is group]) == 1:
+            return group
+        marker = vcs.elements["marker"][display.g_name]
+        own = vcs2vtk.splitMarker(self.renWin, marker, actors, index,
+                                  cmap=self.canvas.colormap)
+        g, gs, pd, act, geo = own
+        # same key as plot(), joins the renderer of the other entries
+        self.fitToViewport(act,
+                           marker.viewport,
+                           wc=marker.worldcoordinate,
+                           geoBounds=None,
+                           geo=None,
+                           priority=marker.priority)
+        if pd is None and act.GetUserTransform():
+            vcs2vtk.scaleMarkerGlyph(g, gs, pd, act)
+            self._glyphs.append((g, gs, pd, act))
+        actors[index] = own
+        return own
+
+    def genTextActor(self, ren, to, tt, **kargs):
+        """vcs2vtk.genTextActor using the text cache, the actors are kept
+        fitted to the window by relayout()"""
+        actors = vcs2vtk.genTextActor(ren, to=to, tt=tt, cache=self.textCache,
+                                      **kargs)
+        if actors:
+            self._texts.append((ren, actors, list(tt.x), list(tt.y), to, tt,
+                                kargs.get("cmap"), kargs.get("geoBounds"),
+                                kargs.get("geo")))
+        return actors
+
     def renderColorBar(self, tmpl, levels, colors, legend, cmap,
                        style=['solid'], index=[1], opacity=[]):
         if tmpl.legend.priority > 0:
@@ -989,13 +1141,18 @@ class VTKVCSBackend(object):
             self, filename, zoom=1, xOffset=0, yOffset=0,
             units="percent", fitToHeight=True, *args, **kargs):
         self.hideGUI()
-        readerFactory = vtk.vtkImageReader2Factory()
-        reader = readerFactory.CreateImageReader2(filename)
-        reader.SetFileName(filename)
-        reader.Update()
-        imageData = reader.GetOutput()
         a = vtk.vtkImageActor()
-        a.GetMapper().SetInputConnection(reader.GetOutputPort())
+        if isinstance(filename, vtk.vtkImageData):
+            # already decoded image (e.g. an in memory animation frame)
+            imageData = filename
+            a.GetMapper().SetInputData(imageData)
+        else:
+            readerFactory = vtk.vtkImageReader2Factory()
+            reader = readerFactory.CreateImageReader2(filename)
+            reader.SetFileName(filename)
+            reader.Update()
+            imageData = reader.GetOutput()
+            a.GetMapper().SetInputConnection(reader.GetOutputPort())
         origin = imageData.GetOrigin()
         spc = imageData.GetSpacing()
         ext = imageData.GetExtent()
@@ -1188,21 +1345,12 @@ class VTKVCSBackend(object):
             else:
                 user_dims = None
 
-        imgfiltr = vtk.vtkWindowToImageFilter()
-        imgfiltr.SetInput(self.renWin)
         ignore_alpha = args.get('ignore_alpha', False)
-        if ignore_alpha or draw_white_background:
-            imgfiltr.SetInputBufferTypeToRGB()
-        else:
-            imgfiltr.SetInputBufferTypeToRGBA()
-
-        self.hideGUI()
-        imgfiltr.Update()
-        self.showGUI(render=False)
-        self.renWin.Render()
+        image = self.snapshot(
+            rgba=not (ignore_alpha or draw_white_background))
 
         writer = vtk.vtkPNGWriter()
-        writer.SetInputConnection(imgfiltr.GetOutputPort())
+        writer.SetInputData(image)
         writer.SetFileName(file)
         # add text chunks to the writer
         m = args.get('metadata', {})
@@ -1214,6 +1362,21 @@ class VTKVCSBackend(object):
             self.renWin.SetSize(w, h)
             self.configureEvent(None, None)
 
+    def snapshot(self, rgba=False):
+        """Grabs the render window content (GUI hidden) as a vtkImageData"""
+        imgfiltr = vtk.vtkWindowToImageFilter()
+        imgfiltr.SetInput(self.renWin)
+        if rgba:
+            imgfiltr.SetInputBufferTypeToRGBA()
+        else:
+            imgfiltr.SetInputBufferTypeToRGB()
+
+        self.hideGUI()
+        imgfiltr.Update()
+        self.showGUI(render=False)
+        self.renWin.Render()
+        return imgfiltr.GetOutput()
+
     def cgm(self, file):
         if self.renWin is None:
             raise Exception("Nothing to dump aborting")
@@ -1262,10 +1425,12 @@ class VTKVCSBackend(object):
 
         from vtk_ui.text import text_dimensions
 
-        text_property = vtk.vtkTextProperty()
         info = self.canvasinfo()
         win_size = info["width"], info["height"]
-        vcs2vtk.prepTextProperty(text_property, win_size, to=textorientation, tt=texttable)
+        key = vcs2vtk.textPropertyKey(win_size, to=textorientation, tt=texttable)
+
+        def prep(p):
+            vcs2vtk.prepTextProperty(p, win_size, to=textorientation, tt=texttable)
 
         dpi = self.renWin.GetDPI()
 
@@ -1280,7 +1445,7 @@ class VTKVCSBackend(object):
         extents = []
 
         for s, x, y in labels:
-            width, height = text_dimensions(s, text_property, dpi)
+            width, height = self.textCache.extent(s, key, dpi, prep, text_dimensions)
             extents.append([x, x + float(width) / win_size[0], y, y + float(height) / win_size[1]])
 
         return extents
@@ -1375,45 +1540,69 @@ class VTKVCSBackend(object):
                 Xrg = geoBounds[0:2]
                 Yrg = geoBounds[2:4]
 
-            wRatio = float(sc[0]) / float(sc[1])
-            dRatio = (Xrg[1] - Xrg[0]) / (Yrg[1] - Yrg[0])
-            vRatio = float(vp[1] - vp[0]) / float(vp[3] - vp[2])
-
-            if wRatio > 1.:  # landscape orientated window
-                yScale = 1.
-                xScale = vRatio * wRatio / dRatio
-            else:
-                xScale = 1.
-                yScale = dRatio / (vRatio * wRatio)
+            xScale, yScale = self.fitCamera(Renderer, vp, Xrg, Yrg,
+                                            flipX, flipY, geo is not None, sc)
             self.setLayer(Renderer, priority)
             self._renderers[
                 (vp, wc_used, sc, priority)] = Renderer, xScale, yScale
-
-            xc = xScale * float(Xrg[1] + Xrg[0]) / 2.
-            yc = yScale * float(Yrg[1] + Yrg[0]) / 2.
-            yd = yScale * float(Yrg[1] - Yrg[0]) / 2.
-            cam = Renderer.GetActiveCamera()
-            cam.ParallelProjectionOn()
-            # We increase the parallel projection parallelepiped with 1/1000 so that
-            # it does not overlap with the outline of the dataset. This resulted in
-            # system dependent display of the outline.
-            cam.SetParallelScale(yd * 1.001)
-            cd = cam.GetDistance()
-            cam.SetPosition(xc, yc, cd)
-            cam.SetFocalPoint(xc, yc, 0.)
-            if geo is None:
-                if flipY:
-                    cam.Elevation(180.)
-                    cam.Roll(180.)
-                    pass
-                if flipX:
-                    cam.Azimuth(180.)
+            # what relayout() needs to fit it again
+            self._layouts[Renderer] = {"viewport": vp,
+                                       "xrange": Xrg,
+                                       "yrange": Yrg,
+                                       "flip": (flipX, flipY),
+                                       "geo": geo is not None,
+                                       "scale": (xScale, yScale),
+                                       "actors": []}
         T = vtk.vtkTransform()
         T.Scale(xScale, yScale, 1.)
 
         Actor.SetUserTransform(T)
+        self.transformClipPlanes(Actor.GetMapper(), T)
+
+        self._layouts[Renderer]["actors"].append(Actor)
+        Renderer.AddActor(Actor)
+        return (Renderer, xScale, yScale)
 
-        mapper = Actor.GetMapper()
+    def fitCamera(self, Renderer, vp, Xrg, Yrg, flipX, flipY, geo, sc):
+        """Points a new camera of Renderer at Xrg, Yrg (increasing ranges).
+        Returns the (xScale, yScale) stretching them over the viewport vp of
+        a window of size sc."""
+        wRatio = float(sc[0]) / float(sc[1])
+        dRatio = (Xrg[1] - Xrg[0]) / (Yrg[1] - Yrg[0])
+        vRatio = float(vp[1] - vp[0]) / float(vp[3] - vp[2])
+
+        if wRatio > 1.:  # landscape orientated window
+            yScale = 1.
+            xScale = vRatio * wRatio / dRatio
+        else:
+            xScale = 1.
+            yScale = dRatio / (vRatio * wRatio)
+
+        xc = xScale * float(Xrg[1] + Xrg[0]) / 2.
+        yc = yScale * float(Yrg[1] + Yrg[0]) / 2.
+        yd = yScale * float(Yrg[1] - Yrg[0]) / 2.
+        # The flips below rotate the camera, start from a fresh one
+        cam = vtk.vtkCamera()
+        Renderer.SetActiveCamera(cam)
+        cam.ParallelProjectionOn()
+        # We increase the parallel projection parallelepiped with 1/1000 so that
+        # it does not overlap with the outline of the dataset. This resulted in
+        # system dependent display of the outline.
+        cam.SetParallelScale(yd * 1.001)
+        cd = cam.GetDistance()
+        cam.SetPosition(xc, yc, cd)
+        cam.SetFocalPoint(xc, yc, 0.)
+        if not geo:
+            if flipY:
+                cam.Elevation(180.)
+                cam.Roll(180.)
+                pass
+            if flipX:
+                cam.Azimuth(180.)
+        return xScale, yScale
+
+    def transformClipPlanes(self, mapper, T):
+        """Applies the transform T to the hardware clip planes of mapper"""
         planeCollection = mapper.GetClippingPlanes()
 
         # We have to transform the hardware clip planes as well
@@ -1451,89 +1640,48 @@ class VTKVCSBackend(object):
                 plane.SetNormal(outNormal[0], outNormal[1], outNormal[2])
                 plane = planeCollection.GetNextItem()
 
-        Renderer.AddActor(Actor)
-        return (Renderer, xScale, yScale)
-
     def update_input(self, vtkobjects, array1, array2=None, update=True):
+        """Swaps a new slab of data into an existing plot (animation frames).
+
+        The data arrays of the vtk grid are overwritten in place and the
+        existing filters re-executed; mappers, lookup tables and actors are
+        kept. The missing values mapper is only rebuilt if the mask changed.
+        """
         if "vtk_backend_grid" in vtkobjects:
             # Ok ths is where we update the input data
             vg = vtkobjects["vtk_backend_grid"]
-            vcs2vtk.setArray(vg, array1.filled(0).flat, "scalar",
-                             isCellData=vg.GetCellData().GetScalars(),
-                             isScalars=True)
+            if "vtk_backend_glyphfilters" in vtkobjects:
+                # Vector plot
+                u = numpy.ma.getdata(numpy.ma.ravel(array1))
+                v = numpy.ma.getdata(numpy.ma.ravel(array2))
+                w = numpy.column_stack((u, v, numpy.zeros(u.shape)))
+                vcs2vtk.setArray(vg, w, "vector",
+                                 isCellData=vg.GetCellData().GetVectors() is not None,
+                                 isScalars=False)
+            else:
+                vcs2vtk.setArray(vg, numpy.ma.filled(array1, 0).ravel(), "scalar",
+                                 isCellData=vg.GetCellData().GetScalars(),
+                                 isScalars=True)
+            vg.Modified()
 
+            if "vtk_backend_missing_mapper" in vtkobjects:
+                self._updateMissingMapper(vtkobjects, array1, vg)
+
+            # Filters fed with SetInputData do not see their upstream
+            # changes, re-execute them in pipeline order.
             if "vtk_backend_filter" in vtkobjects:
                 vtkobjects["vtk_backend_filter"].Update()
-            if "vtk_backend_missing_mapper" in vtkobjects:
-                missingMapper, color, cellData = vtkobjects[
-                    "vtk_backend_missing_mapper"]
-                missingMapper2 = vcs2vtk.putMaskOnVTKGrid(
-                    array1,
-                    vg,
-                    color,
-                    cellData,
-                    deep=False)
-            else:
-                missingMapper = None
-            if "vtk_backend_contours" in vtkobjects:
-                for c in vtkobjects["vtk_backend_contours"]:
-                    c.Update()
-                ports = vtkobjects["vtk_backend_contours"]
-            elif "vtk_backend_geofilters" in vtkobjects:
-                ports = vtkobjects["vtk_backend_geofilters"]
-            else:
-                # Vector plot
-                # TODO: this does not work with wrapping
-                ports = vtkobjects["vtk_backend_glyphfilters"]
-                w = vcs2vtk.generateVectorArray(array1, array2, vg)
-                vg.GetPointData().AddArray(w)
-                ports[0].SetInputData(vg)
-
-            if "vtk_backend_actors" in vtkobjects:
-                i = 0
-                for a in vtkobjects["vtk_backend_actors"]:
-                    act = a[0]
-                    if a[1] is missingMapper:
-                        i -= 1
-                        mapper = missingMapper2
-                    else:
-                        # Labeled contours are a different kind
-                        if "vtk_backend_luts" in vtkobjects:
-                            lut, rg = vtkobjects["vtk_backend_luts"][i]
-                            mapper = vtk.vtkPolyDataMapper()
-                        elif "vtk_backend_labeled_luts" in vtkobjects:
-                            lut, rg = vtkobjects["vtk_backend_labeled_luts"][i]
-                            mapper = vtk.vtkLabeledContourMapper()
-                        if lut is None:
-                            mapper.SetInputConnection(ports[i].GetOutputPort())
-                        else:
-                            if mapper.IsA("vtkPolyDataMapper"):
-                                mapper.SetInputConnection(
-                                    ports[i].GetOutputPort())
-                                mapper.SetLookupTable(lut)
-                                mapper.SetScalarModeToUsePointData()
-                            else:
-                                stripper = vtk.vtkStripper()
-                                stripper.SetInputConnection(
-                                    ports[i].GetOutputPort())
-                                mapper.SetInputConnection(
-                                    stripper.GetOutputPort())
-                                stripper.Update()
-                                tprops = vtkobjects[
-                                    "vtk_backend_contours_labels_text_properties"][i]
-                                mapper.GetPolyDataMapper().SetLookupTable(lut)
-                                mapper.GetPolyDataMapper(
-                                ).SetScalarModeToUsePointData()
-                                mapper.GetPolyDataMapper().SetScalarRange(
-                                    rg[0],
-                                    rg[1])
-                                mapper.SetLabelVisibility(1)
-                                mapper.SetTextProperties(tprops)
-                            if rg[2]:
-                                mapper.SetScalarModeToUseCellData()
-                            mapper.SetScalarRange(rg[0], rg[1])
-                    act.SetMapper(mapper)
-                    i += 1
+            if "vtk_backend_bands" in vtkobjects:
+                # meshfill colors cells by the index of their band
+                vcs2vtk.setBandIndices(
+                    vtkobjects["vtk_backend_filter"].GetOutput(),
+                    vtkobjects["vtk_backend_bands"])
+            if "vtk_backend_isolines" in vtkobjects:
+                vcs2vtk.setIsolines(*vtkobjects["vtk_backend_isolines"])
+            for key in ["vtk_backend_contours", "vtk_backend_geofilters",
+                        "vtk_backend_glyphfilters"]:
+                for f in vtkobjects.get(key, []):
+                    f.Update()
 
         taxis = array1.getTime()
         if taxis is not None:
@@ -1545,16 +1693,23 @@ class VTKVCSBackend(object):
         else:
             tstr = None
         # Min/Max/Mean
+        stats = None
+        for att in ["Min", "Max", "Mean"]:
+            if "vtk_backend_%s_text_actor" % att in vtkobjects:
+                stats = self._frameStatistics(vtkobjects, array1)
+                break
         for att in ["Min", "Max", "Mean", "crtime", "crdate", "zvalue"]:
             if "vtk_backend_%s_text_actor" % att in vtkobjects:
                 t = vtkobjects["vtk_backend_%s_text_actor" % att]
                 if att == "Min":
-                    t.SetInput("Min %g" % array1.min())
+                    t.SetInput("Min %g" % (stats[0] if stats else array1.min()))
                 elif att == "Max":
-                    t.SetInput("Max %g" % array1.max())
+                    t.SetInput("Max %g" % (stats[1] if stats else array1.max()))
                 elif att == "Mean":
                     if not inspect.ismethod(getattr(array1, 'mean')):
                         meanstring = "Mean: %s" % getattr(array1, "mean")
+                    elif stats is not None and stats[2] is not None:
+                        meanstring = 'Mean %.4g' % stats[2]
                     else:
                         try:
                             meanstring = 'Mean %.4g' % \
@@ -1581,6 +1736,69 @@ class VTKVCSBackend(object):
         if update:
             self.renWin.Render()
 
+    def _updateMissingMapper(self, vtkobjects, array, vg):
+        """Rebuilds the missing values mapper if the mask of array changed."""
+        missingMapper, color, cellData = vtkobjects["vtk_backend_missing_mapper"]
+        mask = numpy.ma.getmaskarray(array)
+        oldMask = vtkobjects.get("vtk_backend_missing_mask", None)
+        if oldMask is not None and numpy.array_equal(mask, oldMask):
+            # Same missing values, ghost arrays and mapper are still valid
+            return
+        vtkobjects["vtk_backend_missing_mask"] = mask
+        if cellData:
+            # point ghosts also hide the points proj4 could not project
+            vg.GetCellData().RemoveArray(vtk.vtkDataSetAttributes.GhostArrayName())
+        missingMapper2 = vcs2vtk.putMaskOnVTKGrid(array, vg, color, cellData,
+                                                  deep=False)
+        for a in vtkobjects.get("vtk_backend_actors", []):
+            if a[1] is missingMapper:
+                a[1] = missingMapper2
+                if missingMapper2 is None:
+                    a[0].VisibilityOff()
+                else:
+                    a[0].SetMapper(missingMapper2)
+                    a[0].VisibilityOn()
+        vtkobjects["vtk_backend_missing_mapper"] = (missingMapper2, color, cellData)
+
+    def _frameStatistics(self, vtkobjects, array):
+        """Min, max and mean of array from a single extraction of its valid values.
+
+        The mean is weighted like cdutil.averager does by default (area
+        weights for latitude, bounds widths for the other axes); weights
+        are computed once and reused for the following frames.
+        Returns None if there are no valid values.
+        """
+        data = numpy.ma.asarray(array)
+        valid = ~numpy.ma.getmaskarray(data)
+        values = numpy.ma.getdata(data)[valid]
+        if values.size == 0:
+            return None
+        try:
+            weights = self._meanWeights(vtkobjects, array)[valid]
+            mean = float(numpy.dot(values, weights) / weights.sum())
+        except Exception:
+            mean = None
+        return values.min(), values.max(), mean
+
+    def _meanWeights(self, vtkobjects, array):
+        axes = array.getAxisList()
+        key = tuple((ax.id, len(ax)) for ax in axes)
+        cached = vtkobjects.get("vtk_backend_mean_weights", None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        weights = numpy.ones(array.shape)
+        for i, ax in enumerate(axes):
+            bounds = ax.getBounds()
+            if bounds is None:
+                continue
+            if ax.isLatitude():
+                bounds = numpy.sin(numpy.radians(bounds))
+            shape = [1] * len(axes)
+            shape[i] = len(ax)
+            weights = weights * numpy.abs(bounds[:, 1] - bounds[:, 0]).reshape(shape)
+        vtkobjects["vtk_backend_mean_weights"] = (key, weights)
+        return weights
+
     def png_dimensions(self, path):
         reader = vtk.vtkPNGReader()
         reader.SetFileName(path)
@@ -64,6 +64,8 @@ import os  # noqa
 from manageElements import *  # noqa
 import collections  # noqa
 import testing  # noqa
+import snapshot  # noqa
+import lazy  # noqa
 
 _colorMap = "viridis"
 
@@ -83,64 +85,18 @@ install_vcs._files()
 #
 #
 
-elements = collections.OrderedDict()
-elements["list"] = {}
-elements["projection"] = {}
-elements["texttable"] = {}
-elements["textorientation"] = {}
-elements["textcombined"] = {}
-elements["line"] = {}
-elements["marker"] = {}
-elements["fillarea"] = {}
-elements["font"] = {}
-elements["fontNumber"] = {}
-elements["boxfill"] = {}
-elements["isofill"] = {}
-elements["isoline"] = {}
-elements["meshfill"] = {}
-elements["3d_scalar"] = {}
-elements["3d_dual_scalar"] = {}
-elements["3d_vector"] = {}
-elements["template"] = {}
-elements["taylordiagram"] = {}
-elements["1d"] = {}
-elements["vector"] = {}
-elements["yxvsx"] = {}
-elements["xyvsy"] = {}
-elements["xvsy"] = {}
-elements["scatter"] = {}
-elements["colormap"] = {}
-elements["display"] = {}
-
-_protected_elements = {}
-for k in elements.keys():
-    _protected_elements[k] = set()
-
-dic = {}
-for i in range(-5, 5):
-    for j in range(-180, 181, 30):
-        if j < 0:
-            dic[i * 360 + j] = "%iW" % (-j)
-        elif j > 0:
-            dic[i * 360 + j] = "%iE" % j
-        else:
-            dic[i * 360] = "0"
-elements["list"]["Lon30"] = dic
-
-dic = {}
-for j in range(-80, 81, 20):
-    if j < 0:
-        dic[j] = "%iS" % (-j)
-    elif j > 0:
-        dic[j] = "%iN" % j
-    else:
-        dic[0] = "Eq"
-dic[-90] = "90S"
-dic[90] = "90N"
-elements["list"]["Lat20"] = dic
-
-i = 1
-for nm, fnt in [
+on = {'state': 1}
+off = {'state': 0}
+
+_dotdir, _dotdirenv = vcs.getdotdirectory()
+user_init = os.path.join(
+    os.path.expanduser("~"),
+    _dotdir,
+    'initial.attributes')
+system_init = os.path.join(vcs.prefix, 'share', 'vcs', 'initial.attributes')
+
+# Fonts registered in the default elements, when their file exists
+_fonts = [(nm, os.path.join(vcs.prefix, "share", "vcs", fnt)) for nm, fnt in [
     ("default", "AvantGarde-Book_Bold.ttf"),
     ("Clarendon", "Clarendon.ttf"),
     ("Courier", "Courier.ttf"),
@@ -157,96 +113,163 @@ for nm, fnt in [
     ("Maths3", "jsMath-wasy10.ttf"),
     ("Maths4", "blsy.ttf"),
     ("AvantGarde", "AvantGarde-Book_Bold.ttf"),
-]:
-    pth = os.path.join(
-        vcs.prefix,
-        "share",
-        "vcs",
-        fnt)
-    if os.path.exists(pth):
-        vcs.elements["font"][nm] = pth
-        vcs.elements["fontNumber"][i] = nm
-        i += 1
-
-p = projection.Proj("default")
-p = projection.Proj("linear")
-line.Tl("default")
-line.Tl("solid")
-line.Tl("deftaylordot")
-line.type = ["dot"]
-texttable.Tt("default")
-textorientation.To("default")
-to = textorientation.To("defcenter")
-to.halign = "center"
-to = textorientation.To("defup")
-to.angle = -90
-to.valign = "half"
-to.halign = "center"
-to = textorientation.To("defcentup")
-to.angle = -90
-to.valign = "half"
-to.halign = "center"
-to = textorientation.To("defright")
-to.halign = "right"
-boxfill.Gfb("default")
-isofill.Gfi("default")
-isoline.Gi("default")
-unified1D.G1d("default")
-yx = unified1D.G1d("default_yxvsx_")
-vcs.elements["yxvsx"]["default"] = yx
-xy = unified1D.G1d("default_xyvsy_")
-xy.flip = True
-vcs.elements["xyvsy"]["default"] = xy
-sc = unified1D.G1d("default_scatter_")
-sc._linewidth = 0
-vcs.elements["scatter"]["default"] = sc
-xvy = unified1D.G1d("default_xvsy_")
-vcs.elements["xvsy"]["default"] = xvy
-vector.Gv("default")
-marker.Tm("default")
-meshfill.Gfm("default")
-colormap.Cp("default")
-displayplot.Dp("default")
-dv3d.Gf3Dvector("default")
-dv3d.Gf3Dscalar("default")
-dv3d.Gf3Dscalar("Hovmoller3D")
-dv3d.Gf3DDualScalar("default")
-
-on = {'state': 1}
-off = {'state': 0}
+]]
+
+
+def _build_elements():
+    """Registers the built-in elements then sources the system and the user
+    initial.attributes into vcs.elements"""
+    global elements, _protected_elements
+    elements = collections.OrderedDict()
+    elements["list"] = {}
+    elements["projection"] = {}
+    elements["texttable"] = {}
+    elements["textorientation"] = {}
+    elements["textcombined"] = {}
+    elements["line"] = {}
+    elements["marker"] = {}
+    elements["fillarea"] = {}
+    elements["font"] = {}
+    elements["fontNumber"] = {}
+    elements["boxfill"] = lazy.Elements("boxfill")
+    elements["isofill"] = lazy.Elements("isofill")
+    elements["isoline"] = lazy.Elements("isoline")
+    elements["meshfill"] = lazy.Elements("meshfill")
+    elements["3d_scalar"] = lazy.Elements("3d_scalar")
+    elements["3d_dual_scalar"] = lazy.Elements("3d_dual_scalar")
+    elements["3d_vector"] = lazy.Elements("3d_vector")
+    elements["template"] = lazy.Elements("template")
+    elements["taylordiagram"] = lazy.Elements("taylordiagram")
+    elements["1d"] = lazy.Elements("1d")
+    elements["vector"] = lazy.Elements("vector")
+    elements["yxvsx"] = {}
+    elements["xyvsy"] = {}
+    elements["xvsy"] = {}
+    elements["scatter"] = {}
+    elements["colormap"] = lazy.Elements("colormap")
+    elements["display"] = {}
+
+    _protected_elements = {}
+    for k in elements.keys():
+        _protected_elements[k] = set()
+
+    dic = {}
+    for i in range(-5, 5):
+        for j in range(-180, 181, 30):
+            if j < 0:
+                dic[i * 360 + j] = "%iW" % (-j)
+            elif j > 0:
+                dic[i * 360 + j] = "%iE" % j
+            else:
+                dic[i * 360] = "0"
+    elements["list"]["Lon30"] = dic
+
+    dic = {}
+    for j in range(-80, 81, 20):
+        if j < 0:
+            dic[j] = "%iS" % (-j)
+        elif j > 0:
+            dic[j] = "%iN" % j
+        else:
+            dic[0] = "Eq"
+    dic[-90] = "90S"
+    dic[90] = "90N"
+    elements["list"]["Lat20"] = dic
+
+    i = 1
+    for nm, pth in _fonts:
+        if os.path.exists(pth):
+            vcs.elements["font"][nm] = pth
+            vcs.elements["fontNumber"][i] = nm
+            i += 1
+
+    p = projection.Proj("default")
+    p = projection.Proj("linear")
+    line.Tl("default")
+    line.Tl("solid")
+    line.Tl("deftaylordot")
+    line.type = ["dot"]
+    texttable.Tt("default")
+    textorientation.To("default")
+    to = textorientation.To("defcenter")
+    to.halign = "center"
+    to = textorientation.To("defup")
+    to.angle = -90
+    to.valign = "half"
+    to.halign = "center"
+    to = textorientation.To("defcentup")
+    to.angle = -90
+    to.valign = "half"
+    to.halign = "center"
+    to = textorientation.To("defright")
+    to.halign = "right"
+    boxfill.Gfb("default")
+    isofill.Gfi("default")
+    isoline.Gi("default")
+    unified1D.G1d("default")
+    yx = unified1D.G1d("default_yxvsx_")
+    vcs.elements["yxvsx"]["default"] = yx
+    xy = unified1D.G1d("default_xyvsy_")
+    xy.flip = True
+    vcs.elements["xyvsy"]["default"] = xy
+    sc = unified1D.G1d("default_scatter_")
+    sc._linewidth = 0
+    vcs.elements["scatter"]["default"] = sc
+    xvy = unified1D.G1d("default_xvsy_")
+    vcs.elements["xvsy"]["default"] = xvy
+    vector.Gv("default")
+    marker.Tm("default")
+    meshfill.Gfm("default")
+    colormap.Cp("default")
+    displayplot.Dp("default")
+    # the 3D graphics methods load DV3D (and vtk), build them on first use
+    elements["3d_vector"].defer("default", None)
+    elements["3d_scalar"].defer("default", None)
+    elements["3d_scalar"].defer("Hovmoller3D", None)
+    elements["3d_dual_scalar"].defer("default", None)
+
+    for nm in ["mercator", "orthographic", "lambert", "polar", "polyconic", "robinson",
+               "mollweide", ]:
+        p = projection.Proj(nm)
+        if nm == "polar":
+            p.type = -3
+        else:
+            p.type = nm
 
-for nm in ["mercator", "orthographic", "lambert", "polar", "polyconic", "robinson",
-           "mollweide", ]:
-    p = projection.Proj(nm)
-    if nm == "polar":
-        p.type = -3
-    else:
-        p.type = nm
+    fillarea.Tf("default")
+    template.P("default")
 
-fillarea.Tf("default")
-template.P("default")
+    t = taylor.Gtd("default")
 
-t = taylor.Gtd("default")
+    try:
+        vcs.scriptrun(system_init)
+    except:
+        pass
 
+    for typ in elements.keys():
+        elts = elements[typ]
+        for k in elts.keys():  # let's save which elements should be saved and untouched
+            _protected_elements[typ].add(k)
 
-pth = [vcs.prefix, 'share', 'vcs', 'initial.attributes']
-try:
-    vcs.scriptrun(os.path.join(*pth))
-except:
-    pass
+    if os.path.exists(user_init):
+        vcs.scriptrun(user_init)
 
-for typ in elements.keys():
-    elts = elements[typ]
-    for k in elts.keys():  # let's save which elements should be saved and untouched
-        _protected_elements[typ].add(k)
 
-_dotdir, _dotdirenv = vcs.getdotdirectory()
-user_init = os.path.join(
+# Restoring the registry saved by a previous import is much faster than
+# building it, see vcs.snapshot
+_snapshot = os.path.join(
     os.path.expanduser("~"),
     _dotdir,
-    'initial.attributes')
-if os.path.exists(user_init):
-    vcs.scriptrun(user_init)
+    'initial.attributes.snapshot')
+_snapshot_key = snapshot.key([system_init, user_init] +
+                             [pth for nm, pth in _fonts])
+_restored = snapshot.load(_snapshot, _snapshot_key)
+if _restored is not None:
+    elements, _protected_elements = _restored
+else:
+    _build_elements()
+    snapshot.save(_snapshot, _snapshot_key, (elements, _protected_elements))
+del(_restored)
 
 canvaslist = []
 
@@ -637,10 +637,13 @@ class StoppableThread(threading.Thread, object):
 
 class AnimationCreateParams(object):
 
-    def __init__(self, a_min=None, a_max=None, axis=0):
+    def __init__(self, a_min=None, a_max=None, axis=0, processes=None,
+                 frame_memory=None):
         self.a_min = a_min
         self.a_max = a_max
         self.axis = axis
+        self.processes = processes
+        self.frame_memory = frame_memory
 
 
 class AnimationCreate(StoppableThread):
@@ -794,7 +797,18 @@ class AnimationController(animate_obj_old):
     def created(self):
         return self.animation_created
 
-    def create(self, thread_it=True, min=None, max=None):
+    def create(self, thread_it=True, min=None, max=None, processes=None,
+               frame_memory=None):
+        """Create the animation frames
+
+        processes: number of worker processes rendering frames offscreen
+        ahead of playback; None (default) renders them on demand. Use
+        multiprocessing.cpu_count() to use all cores. Only used for
+        canvases without an open window (bg), the workers are forked.
+        frame_memory: keep frames in memory (up to this many megabytes,
+        least recently shown frames are written to disk past it) rather
+        than going through png files.
+        """
         self.generate_number_of_frames()
         if thread_it == 0:
             thread_it = False
@@ -806,6 +820,8 @@ class AnimationController(animate_obj_old):
                     "Animation min/max autoset has been deprecated, use graphic method to set them")
             self.create_params.a_min = None
             self.create_params.a_max = None
+            self.create_params.processes = processes
+            self.create_params.frame_memory = frame_memory
             self.create_thread = self.AnimationCreate(self)
             self.create_thread.start()
         if not thread_it:
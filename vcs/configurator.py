@@ -264,7 +264,14 @@ class Configurator(object):
                             clicked_actor = group
                             break
 
-                self.activate(display, clicked_actor, key)
+                index = None
+                if display.g_type == "marker":
+                    # batched entries share their actor, find the clicked one
+                    w, h = self.render_window.GetSize()
+                    index = editors.marker.inside_marker(
+                        vcs.getmarker(display.g_name),
+                        point[0] / float(w), point[1] / float(h), w, h)
+                self.activate(display, clicked_actor, key, index=index)
 
         self.clicking = None
 
@@ -434,7 +441,7 @@ class Configurator(object):
         if self.target:
             self.target.place()
 
-    def activate(self, display, actor, key):
+    def activate(self, display, actor, key, index=None):
         if self.target is not None and self.shift() is False:
             self.deactivate(self.target)
 
@@ -442,7 +449,8 @@ class Configurator(object):
         if display.g_type == "marker":
             l = display.backend[key]
             # Actor is actually a group of VTK objects
-            index = l.index(actor)
+            if index is None or l[index] is not actor:
+                index = l.index(actor)
             editor = editors.marker.MarkerEditor(
                 self.interactor,
                 vcs.getmarker(
@@ -8,7 +8,6 @@ import VCS_validation_functions
 import multiprocessing
 import vcs
 import time
-from DV3D.ConfigurationFunctions import ConfigManager
 
 
 class Gfdv3d(object):
@@ -119,7 +118,7 @@ class Gfdv3d(object):
     def __init__(self, Gfdv3d_name, Gfdv3d_name_src='default'):
         if not isinstance(Gfdv3d_name, str):
             raise ValueError("DV3D name must be a string")
-        if Gfdv3d_name in vcs.elements[self.g_name].keys():
+        if Gfdv3d_name in vcs.elements[self.g_name]:
             raise ValueError(
                 "DV3D graphic method '%s' already exists" %
                 Gfdv3d_name)
@@ -148,6 +147,7 @@ class Gfdv3d(object):
             else:
                 parent_cfg = None
 
+        from DV3D.ConfigurationFunctions import ConfigManager
         self.cfgManager = ConfigManager(cm=parent_cfg)
 
         if Gfdv3d_name == "Hovmoller3D":
@@ -198,6 +198,7 @@ class Gfdv3d(object):
 
     @staticmethod
     def getParameterList():
+        from DV3D.ConfigurationFunctions import ConfigManager
         from DV3D.DV3DPlot import PlotButtonNames
         cfgManager = ConfigManager()
         parameterList = cfgManager.getParameterList(extras=PlotButtonNames)
@@ -23,7 +23,9 @@ class MarkerEditor(
         self.index = index
         self.configurator = configurator
 
-        actors = display.backend["vtk_backend_marker_actors"][index]
+        # entries of the same type and size share their glyph filter and
+        # actor, this one gets its own so that edits only touch it
+        actors = configurator.canvas.backend.splitMarker(display, index)
 
         self.glyph, self.glyph_source, self.polydata, self.actor, self.geo = actors
 
@@ -384,7 +384,7 @@ class Tf(object):
         if (Tf_name is None):
             raise ValueError('Must provide a fillarea name.')
         else:
-            if Tf_name in vcs.elements["fillarea"].keys():
+            if Tf_name in vcs.elements["fillarea"]:
                 raise ValueError(
                     "The fillarea '%s' already exists, use getfillarea instead" %
                     Tf_name)
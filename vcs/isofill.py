@@ -605,7 +605,7 @@ class Gfi(object):
                 #
         if not isinstance(Gfi_name, str):
             raise ValueError("Isofill name must be a string")
-        if Gfi_name in vcs.elements["isofill"].keys():
+        if Gfi_name in vcs.elements["isofill"]:
             raise ValueError(
                 "isofill graphic method '%s' already exists" %
                 Gfi_name)
@@ -643,7 +643,7 @@ class Gfi(object):
         else:
             if isinstance(Gfi_name_src, Gfi):
                 Gfi_name_src = Gfi_name_src.name
-            if Gfi_name_src not in vcs.elements["isofill"].keys():
+            if Gfi_name_src not in vcs.elements["isofill"]:
                 raise ValueError(
                     "Isofill method '%s' does not exists" %
                     Gfi_name_src)
@@ -917,7 +917,7 @@ class Gi(object):
                 #                                                         #
         if not isinstance(Gi_name, str):
             raise ValueError("Isoline name must be a string")
-        if Gi_name in vcs.elements["isoline"].keys():
+        if Gi_name in vcs.elements["isoline"]:
             raise ValueError(
                 "isoline graphic method '%s' already exists" %
                 Gi_name)
@@ -959,7 +959,7 @@ class Gi(object):
         else:
             if isinstance(Gi_name_src, Gi):
                 Gi_name_src = Gi_name_src.name
-            if Gi_name_src not in vcs.elements["isoline"].keys():
+            if Gi_name_src not in vcs.elements["isoline"]:
                 raise ValueError(
                     "Isoline method '%s' does not exists" %
                     Gi_name_src)
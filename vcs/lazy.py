@@ -0,0 +1,139 @@
+"""
+Lazy vcs.elements registries for the templates, colormaps and graphics
+methods sourced from initial.attributes.
+
+The entries of initial.attributes are kept as their json values and only
+turned into objects (creation plus validated attribute set) the first time
+they are looked up, e.g. by vcs.gettemplate or vcs.getboxfill. Names,
+membership and length account for the pending entries, so listing or
+checking names never builds anything.
+
+The built-in 3D graphics methods, which load DV3D and vtk, are deferred
+the same way.
+"""
+import vcs
+
+
+class Elements(dict):
+
+    """vcs.elements[typ] with entries built on first access"""
+
+    def __init__(self, typ):
+        dict.__init__(self)
+        self.type = typ
+        # name -> list of json values, applied in order
+        self._pending = {}
+
+    def defer(self, name, value):
+        """Sets name from the json value on first access, right away if
+        name is already built. A None value creates name from scratch."""
+        if dict.__contains__(self, name):
+            _build(self.type, name, [value])
+        else:
+            self._pending.setdefault(name, []).append(value)
+
+    def _materialize(self, name):
+        values = self._pending.pop(name, None)
+        if values is not None:
+            _build(self.type, name, values)
+
+    def _materialize_all(self):
+        for name in self._pending.keys():
+            self._materialize(name)
+
+    def __getitem__(self, name):
+        if name in self._pending:
+            self._materialize(name)
+        return dict.__getitem__(self, name)
+
+    def __setitem__(self, name, value):
+        self._pending.pop(name, None)
+        dict.__setitem__(self, name, value)
+
+    def __delitem__(self, name):
+        if self._pending.pop(name, None) is None:
+            dict.__delitem__(self, name)
+
+    def __contains__(self, name):
+        return name in self._pending or dict.__contains__(self, name)
+
+    has_key = __contains__
+
+    def __len__(self):
+        return dict.__len__(self) + len(self._pending)
+
+    def __iter__(self):
+        for name in dict.__iter__(self):
+            yield name
+        for name in self._pending.keys():
+            yield name
+
+    iterkeys = __iter__
+
+    def keys(self):
+        return dict.keys(self) + self._pending.keys()
+
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+        return default
+
+    def pop(self, name, *default):
+        if name in self:
+            value = self[name]
+            dict.__delitem__(self, name)
+            return value
+        return dict.pop(self, name, *default)
+
+    def values(self):
+        self._materialize_all()
+        return dict.values(self)
+
+    def items(self):
+        self._materialize_all()
+        return dict.items(self)
+
+    def itervalues(self):
+        self._materialize_all()
+        return dict.itervalues(self)
+
+    def iteritems(self):
+        self._materialize_all()
+        return dict.iteritems(self)
+
+    def __getstate__(self):
+        return self._pending
+
+    def __setstate__(self, state):
+        self._pending = state
+
+    def __reduce__(self):
+        # pickles the pending values as they are, without building them
+        return (Elements, (self.type,), self.__getstate__(), None,
+                dict.iteritems(self))
+
+
+# classes of the elements created from scratch
+_classes = {"3d_scalar": "Gf3Dscalar",
+            "3d_dual_scalar": "Gf3DDualScalar",
+            "3d_vector": "Gf3Dvector",
+            }
+
+
+def _build(typ, name, values):
+    # initial.attributes is loaded without validation, same here
+    validation = vcs._doValidation
+    vcs._doValidation = False
+    try:
+        for value in values:
+            try:
+                if value is None:
+                    getattr(vcs.dv3d, _classes[typ])(name)
+                elif typ == "template":
+                    vcs.utils.loadTemplate(name, value)
+                else:
+                    vcs.utils._loadVCSItem(typ, name, value)
+            except Exception as err:
+                print "failed", typ, name, err
+    finally:
+        vcs._doValidation = validation
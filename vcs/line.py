@@ -343,7 +343,7 @@ class Tl(object):
                 # appropriate Python Object.                              #
                 ###########################################################
                 #                                                         #
-        if Tl_name in vcs.elements["line"].keys():
+        if Tl_name in vcs.elements["line"]:
             raise ValueError("lineobject '%' already exists" % Tl_name)
         self._name = Tl_name
         if isinstance(Tl_name_src, Tl):
@@ -361,7 +361,7 @@ class Tl(object):
             self._y = None
             self._colormap = None
         else:
-            if Tl_name_src not in vcs.elements["line"].keys():
+            if Tl_name_src not in vcs.elements["line"]:
                 raise ValueError(
                     "The line source '%s' does not exists" %
                     Tl_name_src)
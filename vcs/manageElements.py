@@ -20,21 +20,38 @@ import textorientation
 import textcombined
 import vector
 import xmldocs
-import random
+import itertools
 from error import vcsError
 import warnings
 import dv3d
 
 
+# Generated names are numbered, the number only ever grows
+_name_counter = itertools.count()
+
+
+def _name_exists(name, typ):
+    """Same as name in vcs.listelements(typ), without listing every element"""
+    if typ in ("xvsy", "yxvsx", "scatter", "xyvsy"):
+        gm = vcs.elements["1d"].get(name)
+        if gm is None:
+            return False
+        aliased = ("xvsy", "yxvsx")
+        return gm.g_type == typ or (gm.g_type in aliased and typ in aliased)
+    if typ not in vcs.elements:
+        raise Exception(
+            "Error: '%s' is not a valid vcs element\n"
+            "Valid vcs elements are: %s" %
+            (typ, vcs.elements.keys()))
+    return name in vcs.elements[typ]
+
+
 def check_name_source(name, source, typ):
     """make sure it is a unique name for this type or generates a name for user"""
-    elts = vcs.listelements(typ)
     if name is None:
-        rnd = random.randint(0, 1000000000000000)
-        name = '__%s_%i' % (typ, rnd)
-        while name in elts:
-            rnd = random.randint(0, 1000000000000000)
-            name = '__%s_%i' % (typ, rnd)
+        name = '__%s_%i' % (typ, next(_name_counter))
+        while _name_exists(name, typ):
+            name = '__%s_%i' % (typ, next(_name_counter))
     if isinstance(name, unicode):
         name = str(name)
     if not isinstance(name, str):
@@ -53,9 +70,9 @@ def check_name_source(name, source, typ):
     elif ok:
         source = source.name
 
-    if name in elts:
+    if _name_exists(name, typ):
         raise vcsError("Error %s object named %s already exists" % (typ, name))
-    if source not in elts and typ != "display":
+    if typ != "display" and not _name_exists(source, typ):
         raise vcsError(
             "Error source %s object (%s) does not exist!" %
             (typ, source))
@@ -96,7 +113,7 @@ def gettemplate(Pt_name_src='default'):
     if not isinstance(Pt_name_src, str):
         raise vcsError('The argument must be a string.')
 
-    if Pt_name_src not in vcs.elements["template"].keys():
+    if Pt_name_src not in vcs.elements["template"]:
         raise ValueError("template '%s' does not exists" % Pt_name_src)
     return vcs.elements["template"][Pt_name_src]
 gettemplate.__doc__ = gettemplate.__doc__ % xmldocs.get_docs['template']
@@ -190,7 +207,7 @@ def getboxfill(Gfb_name_src='default'):
     if not isinstance(Gfb_name_src, str):
         raise vcsError('The argument must be a string.')
 
-    if Gfb_name_src not in vcs.elements["boxfill"].keys():
+    if Gfb_name_src not in vcs.elements["boxfill"]:
         raise "The boxfill method: '%s' does not seem to exist"
     return vcs.elements["boxfill"][Gfb_name_src]
 getboxfill.__doc__ = getboxfill.__doc__ % (
@@ -213,12 +230,12 @@ def createtaylordiagram(name=None, source='default'):
     """
 
     name, source = check_name_source(name, source, 'taylordiagram')
-    if name in vcs.elements["taylordiagram"].keys():
+    if name in vcs.elements["taylordiagram"]:
         raise vcsError(
             'Error creating taylordiagram graphic method: ' +
             name +
             ' already exist')
-    if source not in vcs.elements["taylordiagram"].keys():
+    if source not in vcs.elements["taylordiagram"]:
         raise vcsError(
             'Error creating taylordiagram graphic method ' +
             source +
@@ -243,7 +260,7 @@ def gettaylordiagram(Gtd_name_src='default'):
     if not isinstance(Gtd_name_src, str):
         raise vcsError('The argument must be a string.')
 
-    if Gtd_name_src not in vcs.elements["taylordiagram"].keys():
+    if Gtd_name_src not in vcs.elements["taylordiagram"]:
         raise vcsError(
             "The taylordiagram graphic method %s does not exists" %
             Gtd_name_src)
@@ -1107,7 +1124,7 @@ def getfillarea(name='default', style=None,
     # Check to make sure the argument passed in is a STRING
     if not isinstance(name, str):
         raise vcsError('The argument must be a string.')
-    if name not in vcs.elements["fillarea"].keys():
+    if name not in vcs.elements["fillarea"]:
         raise vcsError("Fillarea '%s' does not exist" % (name))
 
     fa = vcs.elements["fillarea"][name]
@@ -1697,7 +1714,7 @@ def removeG(obj, gtype="boxfill"):
     exec("res = vcs.is%s(obj)" % gtype)
     if isinstance(obj, str):
         name = obj
-        if obj not in vcs.elements[gtype].keys():
+        if obj not in vcs.elements[gtype]:
             raise RuntimeError("Cannot remove inexisting %s %s" % (gtype, obj))
     else:
         name = obj.name
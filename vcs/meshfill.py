@@ -123,7 +123,7 @@ def process_src(nm, code):
                     levs.append([float(sp[1][7:]), float(sp[2][7:])])
                     fa = sp[-1][3:]
                     fa = fa[:fa.find(")")]
-                    if fa not in vcs.elements["fillarea"].keys():
+                    if fa not in vcs.elements["fillarea"]:
                         badfa = True
                         fai.append(fa)
                     else:
@@ -629,7 +629,7 @@ class Gfm(object):
 
         if not isinstance(Gfm_name, str):
             raise ValueError("meshfill name must be a string")
-        if Gfm_name in vcs.elements["meshfill"].keys():
+        if Gfm_name in vcs.elements["meshfill"]:
             raise ValueError(
                 "meshfill graphic method '%s' already exists" %
                 Gfm_name)
@@ -669,7 +669,7 @@ class Gfm(object):
         else:
             if isinstance(Gfm_name_src, Gfm):
                 Gfm_name_src = Gfm_name_src.name
-            if Gfm_name_src not in vcs.elements["meshfill"].keys():
+            if Gfm_name_src not in vcs.elements["meshfill"]:
                 raise ValueError(
                     "meshfill method '%s' does not exisits" %
                     Gfm_name_src)
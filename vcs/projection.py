@@ -399,7 +399,7 @@ class Proj(object):
         if (Proj_name is None):
             raise ValueError('Must provide a projection name.')
         else:
-            if Proj_name in vcs.elements["projection"].keys():
+            if Proj_name in vcs.elements["projection"]:
                 raise ValueError(
                     "The projection '%s' already exists, use getprojection instead" %
                     Proj_name)
@@ -0,0 +1,112 @@
+"""
+Snapshot of the element registry (vcs.elements) as built at import time
+from the built-in defaults and the initial.attributes files.
+
+Building it runs every create call and validated setattr of the system and
+user initial.attributes, restoring the pickled result is a single load. The
+snapshot is keyed on the python version, the vcs sources, the
+initial.attributes files and the default font files (path, size and
+modification time, or absence), any change rebuilds it.
+"""
+import copy_reg
+import cPickle
+import os
+import pickle
+import sys
+import tempfile
+import types
+
+# Bump when the snapshot layout changes
+FORMAT = 1
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (path, None)
+    return (path, st.st_size, st.st_mtime)
+
+
+def key(files):
+    """Identifies what a snapshot was built from"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    sources = [_stamp(os.path.join(here, f))
+               for f in sorted(os.listdir(here)) if f.endswith(".py")]
+    return (FORMAT, sys.version, tuple(sources),
+            tuple(_stamp(f) for f in files))
+
+
+def _storage_slots(cls):
+    """Slots of cls actually holding values, slots shadowed by a property
+    (e.g. 'name' next to '_name') hold nothing"""
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, basestring):
+            slots = [slots]
+        for nm in slots:
+            if isinstance(klass.__dict__.get(nm), types.MemberDescriptorType):
+                names.append(nm)
+    return names
+
+
+class _Pickler(pickle.Pickler):
+
+    """Pickles vcs objects from their stored values (the _xxx slots), so
+    that loading sets them back without running the validating property
+    setters."""
+
+    def __init__(self, *args, **kargs):
+        pickle.Pickler.__init__(self, *args, **kargs)
+        self._slots = {}
+
+    def save(self, obj):
+        cls = type(obj)
+        if (isinstance(cls, type) and cls.__module__.startswith("vcs") and
+                id(obj) not in self.memo and
+                not hasattr(obj, "__getstate__")):
+            slots = self._slots.get(cls)
+            if slots is None:
+                slots = self._slots[cls] = _storage_slots(cls)
+            values = {}
+            for nm in slots:
+                try:
+                    values[nm] = getattr(obj, nm)
+                except AttributeError:
+                    # never set
+                    pass
+            state = (getattr(obj, "__dict__", None) or None, values)
+            self.save_reduce(copy_reg.__newobj__, (cls,), state, obj=obj)
+            return
+        pickle.Pickler.save(self, obj)
+
+
+def load(path, k):
+    """The object saved at path with key k, None if there is none"""
+    try:
+        with open(path, "rb") as f:
+            if cPickle.load(f) != k:
+                return None
+            return cPickle.load(f)
+    except Exception:
+        return None
+
+
+def save(path, k, obj):
+    """Saves obj with key k at path, returns False if it can not be done"""
+    try:
+        dirname = os.path.dirname(path)
+        fd, tmp = tempfile.mkstemp(dir=dirname, prefix=".snapshot")
+    except (OSError, IOError):
+        return False
+    try:
+        with os.fdopen(fd, "wb") as f:
+            cPickle.dump(k, f, 2)
+            _Pickler(f, 2).dump(obj)
+        # concurrent imports each write their own file, last one wins
+        os.rename(tmp, path)
+    except Exception:
+        os.remove(tmp)
+        return False
+    return True
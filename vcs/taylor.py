@@ -636,7 +636,7 @@ class Gtd(object):
             self._cmtics1 = '*'
             self.displays = []
         else:
-            if source not in vcs.elements["taylordiagram"].keys():
+            if source not in vcs.elements["taylordiagram"]:
                 raise Exception(
                     "the source taylordiagram %s doe not exist" %
                     source)
@@ -1964,7 +1964,7 @@ class Gtd(object):
         self.drawFrame(canvas, data, wc)
         self.draw(canvas, data)
         # Ok now draws the little comment/source, etc
-        self.displays += self.template.plot(canvas, data, self, bg=bg)
+        self.template.plot(canvas, data, self, bg=bg)
         if resetoutter:
             self.outtervalue = None
         if savedstdmax is not None:
@@ -1978,7 +1978,7 @@ class Gtd(object):
         if newname == "default":
             raise Exception(
                 "You cannot overwrite the default taylordiagram graphic method")
-        if newname in vcs.elements["taylordiagram"].keys():
+        if newname in vcs.elements["taylordiagram"]:
             raise Exception(
                 "Sorry %s taylordiagram graphic method already exists" %
                 newname)
@@ -36,6 +36,7 @@ from Plegend import *  # noqa
 from Pdata import *  # noqa
 import inspect
 import cdutil
+import transient
 from projection import round_projections
 from projection import elliptical_projections
 from xmldocs import scriptdocs
@@ -247,7 +248,7 @@ class P(object):
             raise "Invalid source template: %s" % Pic_name_src
         if isinstance(Pic_name_src, P):
             Pic_name_src = Pic_name_src.name
-        if Pic_name in vcs.elements["template"].keys():
+        if Pic_name in vcs.elements["template"]:
             raise ValueError("Template %s already exists" % Pic_name)
 
         self._name = Pic_name
@@ -439,7 +440,7 @@ class P(object):
         else:
             if isinstance(Pic_name_src, P):
                 Pic_name_src = P.name
-            if Pic_name_src not in vcs.elements["template"].keys():
+            if Pic_name_src not in vcs.elements["template"]:
                 raise ValueError(
                     "The source template '%s' does not seem to exists" %
                     Pic_name_src)
@@ -1057,22 +1058,20 @@ class P(object):
         obj = getattr(self, axis + 'tic' + number)
         # the labels
         objlabl = getattr(self, axis + 'label' + number)
-        # the following to make sure we have a unique name,
-        # i put them together assuming it would be faster
-        ticks = x.createline(source=obj.line)
+        ticks = transient.Line(obj.line)
         ticks.projection = gm.projection
         ticks.priority = obj.priority
-        tt = x.createtext(
+        tt = transient.Text(
             Tt_source=objlabl.texttable,
             To_source=objlabl.textorientation)
         tt.projection = gm.projection
         tt.priority = objlabl.priority
         if vcs.elements["projection"][gm.projection].type != "linear":
-            ticks.viewport = vp
-            ticks.worldcoordinate = wc
-            tt.worldcoordinate = wc
+            ticks.viewport = list(vp)
+            ticks.worldcoordinate = list(wc)
+            tt.worldcoordinate = list(wc)
             if axis == "y":
-                tt.viewport = vp
+                tt.viewport = list(vp)
                 # TODO: Transform axes names through geographic projections
                 # In that case the if goes and only the statement stays
                 if ("ratio_autot_viewport" not in kargs):
@@ -1096,7 +1095,7 @@ class P(object):
                     tt.viewport = vp
                     pass
                 else:
-                    tt.viewport = vp
+                    tt.viewport = list(vp)
                     # TODO: Transform axes names through geographic projections
                     # In that case the if goes and only the statement stays
                     if ("ratio_autot_viewport" not in kargs):
@@ -1205,20 +1204,16 @@ class P(object):
                                            (self._data._x2 - self._data._x1)])
 
         if txs != []:
-            tt.string = tstring
+            tt.string = [str(lbl) for lbl in tstring]
             tt.x = txs
             tt.y = tys
-            displays.append(x.text(tt, bg=bg, ratio="none", **kargs))
+            displays.append(transient.draw(x, tt, bg=bg, ratio="none",
+                                           **kargs))
         if xs != []:
-            ticks._x = xs
-            ticks._y = ys
-            displays.append(x.line(ticks, bg=bg, **kargs))
-        del(vcs.elements["line"][ticks.name])
-        sp = tt.name.split(":::")
-        del(vcs.elements["texttable"][sp[0]])
-        del(vcs.elements["textorientation"][sp[1]])
-        del(vcs.elements["textcombined"][tt.name])
-        return displays
+            ticks.x = xs
+            ticks.y = ys
+            displays.append(transient.draw(x, ticks, bg=bg, **kargs))
+        return [d for d in displays if d is not None]
 
     def blank(self, attribute=None):
         """
@@ -1527,6 +1522,10 @@ class P(object):
 
         :param slab: slab to get attributes from
         :type slab: cdms2.tvariable.TransientVariable, numpy.ndarray
+
+        :returns: The backend dictionaries of the attributes drawn, the
+                  "vtk_backend_template_attribute" key names the attribute
+        :rtype: list
         """
         displays = []
         # figures out the min and max and set them as atributes...
@@ -1549,18 +1548,13 @@ class P(object):
                     sub = self.dataname
                 else:
                     sub = getattr(self, s)
-                tt = x.createtext(
-                    None,
-                    sub.texttable,
-                    None,
-                    sub.textorientation)
+                tt = transient.Text(sub.texttable, sub.textorientation)
 
                 # Now for the min/max/mean add the name in front
-                kargs["donotstoredisplay"] = False
                 if s == 'min':
-                    tt.string = 'Min %g' % (smn)
+                    tt.string = ['Min %g' % (smn)]
                 elif s == 'max':
-                    tt.string = 'Max %g' % smx
+                    tt.string = ['Max %g' % smx]
                 elif s == 'mean':
                     if not inspect.ismethod(getattr(slab, 'mean')):
                         meanstring = 'Mean ' + str(getattr(slab, s))
@@ -1575,28 +1569,21 @@ class P(object):
                                 meanstring = 'Mean %.4g' % slab.mean()
                             except:
                                 meanstring = 'Mean %.4g' % numpy.mean(slab.filled())
-                    tt.string = meanstring
+                    tt.string = [meanstring]
                 else:
-                    tt.string = str(getattr(slab, s))
-                    kargs["donotstoredisplay"] = False
+                    tt.string = [str(getattr(slab, s))]
                 tt.x = [sub.x]
                 tt.y = [sub.y]
                 tt.priority = sub.priority
                 # this is text such as variable name, min/max
                 # that does not have to follow ratio=atot
-                dp = x.text(tt, bg=bg, **kargs)
-                if dp is not None:
+                drawn = transient.draw(x, tt, bg=bg, **kargs)
+                if drawn is not None:
                     if s != "id":
-                        dp.backend["vtk_backend_template_attribute"] = s
+                        drawn["vtk_backend_template_attribute"] = s
                     else:
-                        dp.backend[
-                            "vtk_backend_template_attribute"] = "dataname"
-                    displays.append(dp)
-                sp = tt.name.split(":::")
-                if kargs.get("donotstoredisplay", True):
-                    del(vcs.elements["texttable"][sp[0]])
-                    del(vcs.elements["textorientation"][sp[1]])
-                    del(vcs.elements["textcombined"][tt.name])
+                        drawn["vtk_backend_template_attribute"] = "dataname"
+                    displays.append(drawn)
         return displays
 
     def plot(self, x, slab, gm, bg=False, min=None,
@@ -1605,7 +1592,7 @@ class P(object):
         This plots the template stuff on the Canvas.
         It needs a slab and a graphic method.
 
-        :returns: A list containing all the displays used
+        :returns: A list containing the backend dictionaries of what was drawn
         :rtype: list
         """
 
@@ -1634,11 +1621,7 @@ class P(object):
                     continue
                 nm = nms[i] + "name"
                 sub = getattr(self, nm)
-                tt = x.createtext(
-                    None,
-                    sub.texttable,
-                    None,
-                    sub.textorientation)
+                tt = transient.Text(sub.texttable, sub.textorientation)
                 if i == 0 and gm.g_name == "G1d":
                     if gm.flip or hasattr(slab, "_yname"):
                         tt.string = [slab.id]
@@ -1651,16 +1634,13 @@ class P(object):
                         tt.string = [ax.id]
                 else:
                     tt.string = [ax.id]
+                tt.string = [str(tt.string[0])]
                 tt.x = [sub.x, ]
                 tt.y = [sub.y, ]
                 tt.priority = sub._priority
                 # This is the name of the axis. It should be transformed
                 # through geographic projection but it is not at the moment
-                displays.append(x.text(tt, bg=bg, **kargs))
-                sp = tt.name.split(":::")
-                del(vcs.elements["texttable"][sp[0]])
-                del(vcs.elements["textorientation"][sp[1]])
-                del(vcs.elements["textcombined"][tt.name])
+                displays.append(transient.draw(x, tt, bg=bg, **kargs))
 
         if X is None:
             X = slab.getAxis(-1)
@@ -1731,40 +1711,40 @@ class P(object):
             for num in ["1", "2"]:
                 e = getattr(self, tp + num)
                 if e.priority != 0:
-                    l = x.createline(source=e.line)
+                    l = transient.Line(e.line)
                     if hasattr(gm, "projection"):
                         l.projection = gm.projection
                     if vcs.elements["projection"][
                             l.projection].type != "linear":
                         l.worldcoordinate = wc2[:4]
-                        l.viewport = kargs.get("ratio_autot_viewport",
-                                               [e._x1, e._x2, e._y1, e._y2])
+                        l.viewport = list(kargs.get("ratio_autot_viewport",
+                                                    [e._x1, e._x2, e._y1, e._y2]))
                         dx = (e._x2 - e._x1) / \
                             (self.data.x2 - self.data.x1) * (wc2[1] - wc2[0])
                         dy = (e._y2 - e._y1) / \
                             (self.data.y2 - self.data.y1) * (wc2[3] - wc2[2])
                         if tp == "line":
-                            l._x = [wc2[0], wc2[0] + dx]
-                            l._y = [wc2[2], wc2[2] + dy]
+                            l.x = [wc2[0], wc2[0] + dx]
+                            l.y = [wc2[2], wc2[2] + dy]
                         elif tp == "box" and \
                                 vcs.elements["projection"][l.projection].type in\
                                 round_projections:
-                            l._x = [[wc2[0], wc2[1]], [wc2[0], wc2[1]]]
-                            l._y = [wc2[3], wc2[3]], [wc2[2], wc2[2]]
+                            l.x = [[wc2[0], wc2[1]], [wc2[0], wc2[1]]]
+                            l.y = [[wc2[3], wc2[3]], [wc2[2], wc2[2]]]
                         else:
-                            l._x = [
+                            l.x = [
                                 wc2[0],
                                 wc2[0] + dx,
                                 wc2[0] + dx,
                                 wc2[0],
                                 wc2[0]]
-                            l._y = [wc2[2], wc2[2], wc2[3], wc2[3], wc2[2]]
+                            l.y = [wc2[2], wc2[2], wc2[3], wc2[3], wc2[2]]
                     else:
-                        l._x = [e._x1, e._x2, e._x2, e._x1, e._x1]
-                        l._y = [e._y1, e._y1, e._y2, e._y2, e._y1]
-                    l._priority = e._priority
-                    displays.append(x.plot(l, bg=bg, ratio="none", **kargs))
-                    del(vcs.elements["line"][l.name])
+                        l.x = [e._x1, e._x2, e._x2, e._x1, e._x1]
+                        l.y = [e._y1, e._y1, e._y2, e._y2, e._y1]
+                    l.priority = e._priority
+                    displays.append(transient.draw(x, l, bg=bg, ratio="none",
+                                                   **kargs))
 
         # x.mode=m
         # I think i have to use dict here because it's a valid value
@@ -1772,7 +1752,7 @@ class P(object):
         # but Dean doesn't allow to set it back to some of these values (None)!
         x._viewport = vp
         x._worldcoordinate = wc
-        return displays
+        return [d for d in displays if d is not None]
 
     def drawColorBar(self, colors, levels, legend=None, ext_1='n',
                      ext_2='n', x=None, bg=False, priority=None,
@@ -1787,7 +1767,7 @@ class P(object):
         ext_1 and ext_2: to draw the arrows
         x : the canvas where to plot it
         bg: background mode ?
-        returns a list of displays used
+        returns the backend dictionaries of what was drawn
         """
 
         kargs["donotstoredisplay"] = True
@@ -1913,27 +1893,26 @@ class P(object):
                           startThick + thick,
                           startThick + thick])
 
-        fa = x.createfillarea()
-        fa.color = colors
-        fa.style = style
-        fa.index = index
-        fa.priority = self.legend.priority
+        fa = transient.Fillarea()
+        fa.color = list(colors)
+        if isinstance(style, str):
+            style = [style]
+        fa.style = list(style)
+        fa.index = list(index)
         # Boxfill default comes in here with [] we need to fix this
         if opacity == []:
             opacity = [None, ] * len(colors)
-        fa.opacity = opacity
+        fa.opacity = list(opacity)
         fa.priority = priority
         if cmap is not None:
             fa.colormap = cmap
-        # assigning directly since we gen it we know it's good
         if isHorizontal:
-            fa._x = L
-            fa._y = T
+            fa.x = L
+            fa.y = T
         else:
-            fa._x = T
-            fa._y = L
-        displays.append(x.plot(fa, bg=bg, **kargs))
-        del(vcs.elements["fillarea"][fa.name])
+            fa.x = T
+            fa.y = L
+        displays.append(transient.draw(x, fa, bg=bg, **kargs))
         # Now draws the box around the legend
         # First of all make sure we draw the arrows
         Tl = []  # Thickness labels location
@@ -2022,40 +2001,35 @@ class P(object):
                             St.append(legend[l])
                             break
         # ok now creates the line object and text object
-        ln = x.createline(source=self.legend.line)
-        txt = x.createtext(
+        ln = transient.Line(self.legend.line)
+        txt = transient.Text(
             To_source=self.legend.textorientation,
             Tt_source=self.legend.texttable)
-        ln._priority = priority + 1
+        ln.priority = priority + 1
         txt.priority = priority + 1
-        txt.string = St
+        txt.string = [str(st) for st in St]
         if isinstance(legend, list):
             if isHorizontal:
                 txt.halign = "center"
             else:
                 txt.valign = "half"
         if isHorizontal:
-            ln._x = Ll
-            ln._y = Tl
+            ln.x = Ll
+            ln.y = Tl
             txt.x = Lt
             txt.y = Tt
         else:
-            ln._x = Tl
-            ln._y = Ll
+            ln.x = Tl
+            ln.y = Ll
             txt.x = Tt
             txt.y = Lt
 
         # Now reset the viewport and worldcoordiantes
-        displays.append(x.plot(ln, bg=bg, **kargs))
-        displays.append(x.plot(txt, bg=bg, **kargs))
-        del(vcs.elements["line"][ln.name])
-        sp = txt.name.split(":::")
-        del(vcs.elements["texttable"][sp[0]])
-        del(vcs.elements["textorientation"][sp[1]])
-        del(vcs.elements["textcombined"][txt.name])
+        displays.append(transient.draw(x, ln, bg=bg, **kargs))
+        displays.append(transient.draw(x, txt, bg=bg, **kargs))
         x._viewport = vp
         x._worldcoordinate = wc
-        return displays
+        return [d for d in displays if d is not None]
 
     def ratio_linear_projection(self, lon1, lon2, lat1, lat2,
                                 Rwished=None, Rout=None,
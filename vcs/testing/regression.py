@@ -4,7 +4,6 @@ the known good baseline given in the third. Alternate known good images
 (with _number.png in the filename) are also compared against.
 """
 
-import vtk
 import os
 import os.path
 import re
@@ -51,6 +50,7 @@ def run_wo_terminate(vcsinst, fname, baseline=None,
 
 
 def image_compare(testImage, baselineImage):
+    import vtk
     imageDiff = vtk.vtkImageDifference()
     imageDiff.SetInputData(testImage)
     imageDiff.SetImageData(baselineImage)
@@ -59,6 +59,7 @@ def image_compare(testImage, baselineImage):
 
 
 def dump_image_to_file(fname, img):
+    import vtk
     wr = vtk.vtkPNGWriter()
     wr.SetFileName(fname)
     wr.SetInputData(img)
@@ -66,6 +67,7 @@ def dump_image_to_file(fname, img):
 
 
 def image_from_file(fname):
+    import vtk
     try:
         rd = vtk.vtkPNGReader()
         rd.SetFileName(fname)
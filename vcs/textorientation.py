@@ -250,7 +250,7 @@ class To(object):
         # back the appropriate Python Object.                       #
         #############################################################
         #                                                           #
-        if To_name in vcs.elements["textorientation"].keys():
+        if To_name in vcs.elements["textorientation"]:
             raise ValueError(
                 "textorientation object '%' already exists" %
                 To_name)
@@ -265,7 +265,7 @@ class To(object):
             self._halign = "left"
             self._valign = "half"
         else:
-            if To_name_src not in vcs.elements["textorientation"].keys():
+            if To_name_src not in vcs.elements["textorientation"]:
                 raise ValueError(
                     "source textorientation '%s' does not exists" %
                     To_name_src)
@@ -424,7 +424,7 @@ class Tt(object):
                 #                                                           #
         if (Tt_name is None):
             raise ValueError('Must provide a text table name.')
-        if Tt_name in vcs.elements["texttable"].keys():
+        if Tt_name in vcs.elements["texttable"]:
             raise ValueError("texttable '%s' already exists" % Tt_name)
         self._name = Tt_name
         self.s_name = 'Tt'
@@ -447,7 +447,7 @@ class Tt(object):
         else:
             if isinstance(Tt_name_src, Tt):
                 Tt_name_src = Tt_name_src.name
-            if Tt_name_src not in vcs.elements["texttable"].keys():
+            if Tt_name_src not in vcs.elements["texttable"]:
                 raise ValueError(
                     "Source texttable: '%s' does not exists" %
                     Tt_name_src)
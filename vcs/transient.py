@@ -0,0 +1,137 @@
+"""
+Transient primitives: plain value copies of line, marker, fillarea and text
+objects used to draw annotations (template labels, tick marks, boxes,
+color bar, 1D legend).
+
+They are never registered in vcs.elements and their attributes are not
+validated, the code building them is expected to assign values in the form
+the backend reads them (lists for x, y, color, ...). draw() hands them
+straight to the canvas backend, bypassing the name allocation, registration
+and display bookkeeping of Canvas.plot.
+"""
+import copy
+import vcs
+from projection import no_deformation_projections
+
+
+class Primitive(object):
+
+    """Base of the transient primitives.
+
+    g_type is the vcs.elements type of the objects the attributes are
+    copied from, _attributes the attributes copied.
+    """
+    g_type = None
+    _attributes = ()
+
+    def __init__(self, source="default"):
+        if isinstance(source, basestring):
+            source = vcs.elements[self.g_type][source]
+        self.name = None
+        for att in self._attributes:
+            value = getattr(source, att)
+            if isinstance(value, list):
+                # the backend pads x, y, color, ... in place
+                value = copy.deepcopy(value)
+            setattr(self, att, value)
+
+    def register(self):
+        """Registered (vcs.elements) copy of this primitive"""
+        obj = getattr(vcs, "create%s" % self.g_type)()
+        for att in self._attributes:
+            setattr(obj, att, getattr(self, att))
+        return obj
+
+
+class Line(Primitive):
+    g_type = "line"
+    _attributes = ("type", "width", "color", "priority", "viewport",
+                   "worldcoordinate", "x", "y", "projection", "colormap")
+
+
+class Marker(Primitive):
+    g_type = "marker"
+    _attributes = ("type", "size", "color", "priority", "viewport",
+                   "worldcoordinate", "x", "y", "projection", "colormap")
+
+
+class Fillarea(Primitive):
+    g_type = "fillarea"
+    _attributes = ("style", "index", "color", "opacity", "priority",
+                   "viewport", "worldcoordinate", "x", "y", "projection",
+                   "colormap")
+
+
+class Text(Primitive):
+
+    """Text made of a texttable and a textorientation, both sets of
+    attributes live on the one object which the backend uses as both."""
+    g_type = "text"
+    _texttable = ("color", "backgroundcolor", "backgroundopacity",
+                  "fillincolor", "priority", "font", "string", "spacing",
+                  "expansion", "viewport", "worldcoordinate", "x", "y",
+                  "projection", "colormap")
+    _textorientation = ("height", "angle", "path", "halign", "valign")
+    _attributes = _texttable + _textorientation
+
+    def __init__(self, Tt_source="default", To_source="default"):
+        if isinstance(Tt_source, basestring):
+            Tt_source = vcs.elements["texttable"][Tt_source]
+        if isinstance(To_source, basestring):
+            To_source = vcs.elements["textorientation"][To_source]
+        self.name = None
+        for atts, source in ((self._texttable, Tt_source),
+                             (self._textorientation, To_source)):
+            for att in atts:
+                value = getattr(source, att)
+                if isinstance(value, list):
+                    value = copy.deepcopy(value)
+                setattr(self, att, value)
+
+    def register(self):
+        obj = vcs.createtext()
+        for att in self._attributes:
+            setattr(obj, att, getattr(self, att))
+        return obj
+
+
+def _unregister(g_type, obj):
+    if g_type == "text":
+        sp = obj.name.split(":::")
+        del(vcs.elements["texttable"][sp[0]])
+        del(vcs.elements["textorientation"][sp[1]])
+        del(vcs.elements["textcombined"][obj.name])
+    else:
+        del(vcs.elements[g_type][obj.name])
+
+
+def draw(canvas, prim, bg=False, **kargs):
+    """
+    Draws a transient primitive on canvas
+
+    :returns: The backend dictionary of the plot (actors, ...), None if
+              nothing was drawn
+    :rtype: dict
+    """
+    if prim.priority == 0:
+        return None
+    doratio = str(kargs.get("ratio", canvas.ratio)).strip().lower()
+    if doratio[-1] == 't' and doratio[0] == '0':
+        if float(doratio[:-1]) == 0.:
+            doratio = '0'
+    proj = vcs.elements["projection"][prim.projection].type
+    if doratio not in ["off", "none"] and (
+            doratio != "0" or proj in no_deformation_projections):
+        # Canvas.plot fits the viewport to the ratio, let it do it
+        obj = prim.register()
+        kargs["donotstoredisplay"] = False
+        kargs["render"] = False
+        dp = canvas.plot(obj, bg=bg, **kargs)
+        _unregister(prim.g_type, obj)
+        if dp is None:
+            return None
+        canvas.display_names.remove(dp.name)
+        del(vcs.elements["display"][dp.name])
+        return dp.backend
+    return canvas.backend.plot(None, None, "default", prim.g_type, prim, bg,
+                               **kargs)
@@ -354,6 +354,7 @@ class G1d(object):
         'datawc_calendar',
         'flip',
         'smooth',
+        'decimate',
         '_name',
         '_xaxisconvert',
         '_yaxisconvert',
@@ -380,6 +381,7 @@ class G1d(object):
         '_datawc_calendar',
         '_flip',
         '_smooth',
+        '_decimate',
     ]
 
     def _getname(self):
@@ -680,6 +682,19 @@ class G1d(object):
         None,
         "beta parameter for kaiser smoothing")
 
+    def _getdecimate(self):
+        return self._decimate
+
+    def _setdecimate(self, value):
+        value = VCS_validation_functions.checkTrueFalse(
+            self, 'decimate', value)
+        self._decimate = value
+    decimate = property(
+        _getdecimate,
+        _setdecimate,
+        None,
+        "only draw min/max of the points falling in each pixel column")
+
     def _gtype(self):
         if self.flip:
             return "xyvsy"
@@ -705,6 +720,7 @@ class G1d(object):
         if name == 'default':
             self._smooth = None
             self._flip = False
+            self._decimate = False
             self._projection = "linear"
             self._xticlabels1 = "*"
             self._xticlabels2 = "*"
@@ -740,7 +756,8 @@ class G1d(object):
             for att in ['projection', 'colormap', 'xticlabels1', 'xticlabels2', 'xmtics1', 'xmtics2',
                         'yticlabels1', 'yticlabels2', 'ymtics1', 'ymtics2', 'datawc_y1', 'datawc_y2', 'datawc_x1',
                         'datawc_x2', 'xaxisconvert', 'yaxisconvert', 'linetype', 'linecolor', 'linewidth', 'marker',
-                        'markercolor', 'markersize', 'datawc_timeunits', 'datawc_calendar', 'smooth', 'flip']:
+                        'markercolor', 'markersize', 'datawc_timeunits', 'datawc_calendar', 'smooth', 'flip',
+                        'decimate']:
                 setattr(self, att, getattr(src, att))
         # Ok now we need to stick in the elements
         vcs.elements["1d"][name] = self
@@ -813,6 +830,7 @@ class G1d(object):
         print "markercolor = ", self.markercolor
         print "markersize = ", self.markersize
         print "flip = ", self.flip
+        print "decimate = ", self.decimate
     list.__doc__ = xmldocs.listdoc
 
     ###########################################################################
@@ -930,6 +948,7 @@ class G1d(object):
             fp.write("%s.markercolor = %s\n" % (unique_name, self.markercolor))
             fp.write("%s.markersize = %s\n\n" % (unique_name, self.markersize))
             fp.write("%s.flip = '%s'\n\n" % (unique_name, repr(self.flip)))
+            fp.write("%s.decimate = %s\n\n" % (unique_name, repr(self.decimate)))
             fp.write(
                 "%s.colormap = '%s'\n\n" %
                 (unique_name, repr(
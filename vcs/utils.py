@@ -22,7 +22,6 @@ import os
 import tempfile
 import cdms2
 import genutil
-import vtk
 import struct
 
 
@@ -216,7 +215,7 @@ def process_range_from_old_scr(code, g):
             levs.append([float(sp[1][7:]), float(sp[2][7:])])
             fa = sp[-1][3:]
             fa = fa[:fa.find(")")]
-            if fa not in vcs.elements["fillarea"].keys():
+            if fa not in vcs.elements["fillarea"]:
                 badfa = True
                 fai.append(fa)
             else:
@@ -810,7 +809,8 @@ def scriptrun(script):
     elif script.split(".")[-1] == "py":
         exec(compile(open(script).read(), script, 'exec'))
     else:
-        if os.path.split(script)[-1] == "initial.attributes":
+        initial = os.path.split(script)[-1] == "initial.attributes"
+        if initial:
             vcs._doValidation = False
         loader = {"P": 'template',
                   "Gfb": 'boxfill',
@@ -844,8 +844,15 @@ def scriptrun(script):
                 if k not in keys:
                     keys.append(k)
             for typ in keys:
+                lazy = initial and isinstance(
+                    vcs.elements.get(loader[typ]), vcs.lazy.Elements)
                 for nm, v in jsn[typ].iteritems():
-                    if typ == "P":
+                    if lazy and typ == "P":
+                        # templates overload protected ones too
+                        vcs.elements["template"].defer(str(nm), v)
+                    elif lazy:
+                        deferVCSItem(loader[typ], str(nm), v)
+                    elif typ == "P":
                         try:
                             loadTemplate(str(nm), v)
                         except Exception as err:
@@ -857,7 +864,7 @@ def scriptrun(script):
                             print "failed", typ, nm, err
         # ok could not read json file maybe it is an old initial.attributes
         except Exception as err:
-            if os.path.split(script)[-1] == "initial.attributes":
+            if initial:
                 _scriptrun(script)
             else:
                 warnings.warn("unable to source file: %s %s" % (script, err))
@@ -894,6 +901,14 @@ def loadVCSItem(typ, nm, json_dict={}):
         vcs.elements["list"][nm] = d
         return
 
+    gm = _loadVCSItem(typ, nm, json_dict)
+    if nm in vcs_deprecated_colormap_names:
+        _loadVCSItem(typ, vcs_deprecated_colormap_names[nm], json_dict)
+    return gm
+
+
+def _loadVCSItem(typ, nm, json_dict):
+    tp = typ
     if nm in vcs.elements[tp]:
         # skip defaults and temp ones
         if nm not in ["default_scatter_", "default_xvsy_",
@@ -921,15 +936,21 @@ def loadVCSItem(typ, nm, json_dict={}):
         if not(a == "Marker" and tp == "taylordiagram"):
             setattr(gm, a, v)
 
-            if nm in vcs_deprecated_colormap_names:
-                cmd = "gm = vcs.create%s('%s')" % (
-                    typ, vcs_deprecated_colormap_names[nm])
-                exec(cmd)
-                setattr(gm, a, v)
-
     return gm
 
 
+def deferVCSItem(typ, nm, json_dict):
+    """Registers nm to be loaded from json_dict on its first access, see
+    vcs.lazy"""
+    if typ in vcs._protected_elements.keys(
+    ) and nm in vcs._protected_elements[typ]:
+        # protected element do not overload
+        return
+    vcs.elements[typ].defer(nm, json_dict)
+    if nm in vcs_deprecated_colormap_names:
+        vcs.elements[typ].defer(vcs_deprecated_colormap_names[nm], json_dict)
+
+
 def return_display_names():
     return [""], [""]
 
@@ -2179,6 +2200,7 @@ def rgba_color(color, colormap):
 
 
 def png_read_metadata(path):
+    import vtk
     reader = vtk.vtkPNGReader()
     reader.SetFileName(path)
     reader.Update()
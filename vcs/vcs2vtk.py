@@ -4,18 +4,31 @@ import vtk
 import numpy
 import json
 import os
-import math
 import meshfill
+import transient
 from vtk.util import numpy_support as VN
 import cdms2
 import warnings
 from projection import round_projections, no_over_proj4_parameter_projections
 from vcsvtk import fillareautils
+from vcsvtk.lrucache import LRUCache, vtk_nbytes
 import sys
 import numbers
+import hashlib
+import itertools
+import collections
 
-f = open(os.path.join(vcs.prefix, "share", "vcs", "wmo_symbols.json"))
-wmo = json.load(f)
+_wmo = None
+
+
+def wmoSymbols():
+    """The WMO marker definitions, read on first use"""
+    global _wmo
+    if _wmo is None:
+        with open(os.path.join(vcs.prefix, "share", "vcs",
+                               "wmo_symbols.json")) as f:
+            _wmo = json.load(f)
+    return _wmo
 
 projNames = [
     "linear",
@@ -59,11 +72,12 @@ for i in range(len(projNames)):
 def applyAttributesFromVCStmpl(tmpl, tmplattribute, txtobj=None):
     tatt = getattr(tmpl, tmplattribute)
     if txtobj is None:
-        txtobj = vcs.createtext(
+        txtobj = transient.Text(
             To_source=tatt.textorientation,
             Tt_source=tatt.texttable)
-    for att in ["x", "y", "priority"]:
-        setattr(txtobj, att, getattr(tatt, att))
+    txtobj.x = [tatt.x]
+    txtobj.y = [tatt.y]
+    txtobj.priority = tatt.priority
     return txtobj
 
 
@@ -83,8 +97,8 @@ def setArray(grid, array, arrayName, isCellData, isScalars):
     pedigreeId = attributes.GetPedigreeIds()
     if (pedigreeId):
         vtkarray = attributes.GetArray(arrayName)
-        for i in range(0, vtkarray.GetNumberOfTuples()):
-            vtkarray.SetValue(i, array[pedigreeId.GetValue(i)])
+        VN.vtk_to_numpy(vtkarray)[:] = numpy.asarray(array)[VN.vtk_to_numpy(pedigreeId)]
+        vtkarray.Modified()
     else:
         vtkarray = numpy_to_vtk_wrapper(array, deep=False)
         vtkarray.SetName(arrayName)
@@ -93,12 +107,38 @@ def setArray(grid, array, arrayName, isCellData, isScalars):
         attributes.SetActiveScalars(arrayName)
 
 
+# Adds to the cell data of 'dataset' a "bands" array holding, for each cell,
+# the index in 'bands' (list of [low, high]) of the band its scalar falls in,
+# -1 if in none. Bands are closed, on an edge shared by two bands the later
+# one wins, as it used to be drawn over the other.
+def setBandIndices(dataset, bands):
+    attributes = dataset.GetCellData()
+    values = VN.vtk_to_numpy(attributes.GetScalars())
+    edges = numpy.unique(numpy.ravel(bands))
+    # band of [edges[k], edges[k + 1]] at k + 1, nothing below or above
+    lookup = -numpy.ones(len(edges) + 1, dtype=numpy.int32)
+    for i, (low, high) in enumerate(bands):
+        lookup[numpy.searchsorted(edges, low) + 1:
+               numpy.searchsorted(edges, high) + 1] = i
+    k = numpy.digitize(values, edges)
+    indices = lookup[k]
+    # values on the high end of a band with no band above
+    top = numpy.flatnonzero((indices < 0) & (k > 0))
+    top = top[values[top] == edges[k[top] - 1]]
+    indices[top] = lookup[k[top] - 1]
+    vtkarray = numpy_to_vtk_wrapper(indices, deep=True,
+                                    array_type=vtk.VTK_INT)
+    vtkarray.SetName("bands")
+    attributes.AddArray(vtkarray)
+    dataset.Modified()
+
+
 def putMaskOnVTKGrid(data, grid, actorColor=None, cellData=True, deep=True):
     msk = data.mask
     mapper = None
     if msk is not numpy.ma.nomask and not numpy.allclose(msk, False):
         if actorColor is not None:
-            flatIMask = msk.astype(numpy.double).flat
+            flatIMask = numpy.ravel(msk).astype(numpy.double)
             grid2 = grid.NewInstance()
             if grid.IsA("vtkStructuredGrid"):
                 vtkmask = numpy_to_vtk_wrapper(flatIMask, deep=deep, array_type=vtk.VTK_DOUBLE)
@@ -112,11 +152,9 @@ def putMaskOnVTKGrid(data, grid, actorColor=None, cellData=True, deep=True):
                     attributes = grid.GetPointData()
                 if (attributes.GetPedigreeIds()):
                     attributes2.SetPedigreeIds(attributes.GetPedigreeIds())
-                    pedigreeId = attributes2.GetPedigreeIds()
-                    vtkmask = vtk.vtkDoubleArray()
-                    vtkmask.SetNumberOfTuples(attributes2.GetPedigreeIds().GetNumberOfTuples())
-                    for i in range(0, vtkmask.GetNumberOfTuples()):
-                        vtkmask.SetValue(i, flatIMask[pedigreeId.GetValue(i)])
+                    pedigreeId = VN.vtk_to_numpy(attributes2.GetPedigreeIds())
+                    vtkmask = numpy_to_vtk_wrapper(flatIMask[pedigreeId], deep=False,
+                                                   array_type=vtk.VTK_DOUBLE)
                 else:
                     # the unstructured grid is not wrapped
                     vtkmask = numpy_to_vtk_wrapper(flatIMask, deep=deep, array_type=vtk.VTK_DOUBLE)
@@ -149,13 +187,9 @@ def putMaskOnVTKGrid(data, grid, actorColor=None, cellData=True, deep=True):
         # The ghost array now stores information about hidden (blanked)
         # points/cells. Setting an array entry to the bitwise value
         # `vtkDataSetAttributes.HIDDEN(CELL|POINT)` will blank the cell/point.
-        flatMask = msk.flat
-        ghost = numpy.zeros(len(flatMask), dtype=numpy.uint8)
         invalidMaskValue = vtk.vtkDataSetAttributes.HIDDENCELL if cellData else \
             vtk.vtkDataSetAttributes.HIDDENPOINT
-        for i, isInvalid in enumerate(flatMask):
-            if isInvalid:
-                ghost[i] = invalidMaskValue
+        ghost = numpy.ravel(msk).astype(numpy.uint8) * numpy.uint8(invalidMaskValue)
         attributes = grid.GetCellData() if cellData else grid.GetPointData()
         pedigreeIds = attributes.GetPedigreeIds()
         if (pedigreeIds):
@@ -221,65 +255,55 @@ def setInfToValid(geoPoints, ghost):
     We also hide infinity points in the ghost array.
     We return true if any points are infinity
     '''
-    anyInfinity = False
-    validPoint = [0, 0, 0]
-    for i in range(geoPoints.GetNumberOfPoints()):
-        point = geoPoints.GetPoint(i)
-        if (not math.isinf(point[0]) and not math.isinf(point[1])):
-            validPoint[0] = point[0]
-            validPoint[1] = point[1]
-            break
-    for i in range(geoPoints.GetNumberOfPoints()):
-        point = geoPoints.GetPoint(i)
-        if (math.isinf(point[0]) or math.isinf(point[1])):
-            anyInfinity = True
-            newPoint = list(point)
-            if (math.isinf(point[0])):
-                newPoint[0] = validPoint[0]
-            if (math.isinf(point[1])):
-                newPoint[1] = validPoint[1]
-            geoPoints.SetPoint(i, newPoint)
-            ghost.SetValue(i, vtk.vtkDataSetAttributes.HIDDENPOINT)
-    return anyInfinity
+    # numpy views on the vtk arrays, changes go straight to vtk
+    points = VN.vtk_to_numpy(geoPoints.GetData())
+    xInf = numpy.isinf(points[:, 0])
+    yInf = numpy.isinf(points[:, 1])
+    infinity = xInf | yInf
+    if not infinity.any():
+        return False
+    valid = numpy.flatnonzero(~infinity)
+    if len(valid) > 0:
+        validPoint = points[valid[0], :2].copy()
+    else:
+        validPoint = [0, 0]
+    points[xInf, 0] = validPoint[0]
+    points[yInf, 1] = validPoint[1]
+    geoPoints.Modified()
+    VN.vtk_to_numpy(ghost)[infinity] = vtk.vtkDataSetAttributes.HIDDENPOINT
+    ghost.Modified()
+    return True
 
 
 def removeHiddenPoints(grid):
     ghost = grid.GetPointGhostArray()
     if (not ghost):
         return
-    pts = grid.GetPoints()
-    minScalar = sys.float_info.max
-    minVector = [0, 0, 0]
-    minVectorNorm = sys.float_info.max
+    hidden = (VN.vtk_to_numpy(ghost) & vtk.vtkDataSetAttributes.HIDDENPOINT) != 0
+    visible = ~hidden
     scalars = grid.GetPointData().GetScalars()
     vectors = grid.GetPointData().GetVectors()
-    if (scalars or vectors):
-        vector = [0, 0, 0]
-        for i in range(pts.GetNumberOfPoints()):
-            if (not (ghost.GetValue(i) & vtk.vtkDataSetAttributes.HIDDENPOINT)):
-                if (scalars):
-                    scalar = scalars.GetValue(i)
-                    if (scalar < minScalar):
-                        minScalar = scalar
-                if (vectors):
-                    vectors.GetTypedTuple(i, vector)
-                    vectorNorm = numpy.linalg.norm(vector)
-                    if (vectorNorm < minVectorNorm):
-                        minVector = vector
-                        minVectorNorm = vectorNorm
-    for i in range(pts.GetNumberOfPoints()):
-        if (ghost.GetValue(i) & vtk.vtkDataSetAttributes.HIDDENPOINT):
-            cells = vtk.vtkIdList()
-            # point hidden, remove all cells used by this point
-            grid.GetPointCells(i, cells)
-            for j in range(cells.GetNumberOfIds()):
-                grid.DeleteCell(cells.GetId(j))
-            # hidden points are not removed. This causes problems
-            # because it changes the scalar range.
-            if(scalars):
-                scalars.SetValue(i, minScalar)
-            if(vectors):
-                vectors.SetTypedTuple(i, minVector)
+    # hidden points are not removed. This causes problems
+    # because it changes the scalar range.
+    if (scalars):
+        values = VN.vtk_to_numpy(scalars)
+        values[hidden] = values[visible].min() if visible.any() else sys.float_info.max
+        scalars.Modified()
+    if (vectors):
+        values = VN.vtk_to_numpy(vectors)
+        if visible.any():
+            norms = numpy.sqrt((values ** 2).sum(axis=1))
+            norms[hidden] = numpy.inf
+            values[hidden] = values[numpy.argmin(norms)]
+        else:
+            values[hidden] = 0
+        vectors.Modified()
+    for i in numpy.flatnonzero(hidden):
+        cells = vtk.vtkIdList()
+        # point hidden, remove all cells used by this point
+        grid.GetPointCells(int(i), cells)
+        for j in range(cells.GetNumberOfIds()):
+            grid.DeleteCell(cells.GetId(j))
     # ensure that GLOBALIDS are copied
     attributes = grid.GetCellData()
     attributes.SetActiveAttribute(-1, attributes.GLOBALIDS)
@@ -291,6 +315,128 @@ def removeHiddenPoints(grid):
     attributes.SetActiveAttribute(globalIdsIndex, attributes.GLOBALIDS)
 
 
+# Wrapped and projected grids, keyed on their geometry, so that
+# plotting many variables on the same grid only swaps the data arrays.
+# Set gridCache.maxsize to 0 to turn caching off.
+gridCache = LRUCache(maxsize=16, maxbytes=512 * 1024 * 1024,
+                     sizeof=lambda entry: vtk_nbytes(entry["vtk_backend_grid"]))
+
+
+# Digests of grid points per cdms grid, axes or mesh they were built from,
+# so that replotting on the same grid object does not hash its points again.
+# The sources are kept alive by the entries, their ids can not be reused.
+gridDigests = LRUCache(maxsize=16, sizeof=None)
+
+
+def gridCacheKey(vg, m3, g, cellData, genVectors, wc, projection, wrap,
+                 source=None):
+    '''
+    Returns a key identifying the geometry genGrid builds: the points
+    (m3), the grid structure, the projection, the world coordinates
+    and the wrapping.
+    source, the objects (cdms grid, axes or mesh) m3 was built from, is
+    used to find the digest of m3 without hashing it again, they are
+    assumed not to be modified in place.
+    '''
+    if vg.IsA("vtkStructuredGrid"):
+        structure = tuple(vg.GetDimensions())
+    else:
+        structure = vg.GetNumberOfCells()
+    shape = numpy.shape(m3)
+    digest = None
+    if source is not None:
+        sourceKey = tuple(id(o) for o in source) + (shape,)
+        known = gridDigests.get(sourceKey)
+        if known is not None and all(
+                a is b for a, b in zip(known[0], source)):
+            digest = known[1]
+    if digest is None:
+        points = numpy.ascontiguousarray(numpy.ma.getdata(m3))
+        digest = hashlib.sha1(points).hexdigest()
+        if source is not None:
+            gridDigests.put(sourceKey, (tuple(source), digest))
+    return (vg.GetClassName(), structure, shape, digest,
+            g.__class__.__name__, bool(cellData), bool(genVectors),
+            repr(list(wc)),
+            projection.type, repr(projection.parameters),
+            tuple(wrap) if wrap is not None else None)
+
+
+def copyCachedGrid(grid):
+    '''
+    Returns a grid sharing the geometry of a cached grid.
+    Polydata and unstructured grids get their cells deleted when
+    points are hidden, so they need their own copy.
+    '''
+    vg = grid.NewInstance()
+    if grid.GetExtentType() == vtk.VTK_PIECES_EXTENT:
+        vg.DeepCopy(grid)
+    else:
+        vg.ShallowCopy(grid)
+    return vg
+
+
+def setGridAttribute(vg, data1, data2, cellData, genVectors):
+    '''
+    Sets data1 (or the data1, data2 vectors) as the active scalars (vectors)
+    of a grid built by genGrid, going through the pedigree ids if the grid
+    was wrapped.
+    '''
+    attributes = vg.GetCellData() if cellData else vg.GetPointData()
+    if genVectors:
+        u = numpy.ma.getdata(numpy.ma.ravel(data1))
+        v = numpy.ma.getdata(numpy.ma.ravel(data2))
+        values = numpy.column_stack((u, v, numpy.zeros(u.shape)))
+    else:
+        values = numpy.ma.filled(data1, 0.).ravel()
+    pedigreeIds = attributes.GetPedigreeIds()
+    if pedigreeIds:
+        values = values[VN.vtk_to_numpy(pedigreeIds)]
+    ghost = vg.GetPointGhostArray() if not cellData else None
+    if ghost and vg.GetExtentType() == vtk.VTK_PIECES_EXTENT:
+        # same as removeHiddenPoints: hidden points get the minimum
+        # so that they do not change the range
+        hidden = (VN.vtk_to_numpy(ghost) &
+                  vtk.vtkDataSetAttributes.HIDDENPOINT) != 0
+        if hidden.any() and not hidden.all():
+            if genVectors:
+                norms = numpy.sqrt((values ** 2).sum(axis=1))
+                norms[hidden] = numpy.inf
+                values[hidden] = values[numpy.argmin(norms)]
+            else:
+                values[hidden] = values[~hidden].min()
+    attribute = numpy_to_vtk_wrapper(numpy.ascontiguousarray(values),
+                                     deep=False)
+    if genVectors:
+        attribute.SetName("vector")
+        attributes.SetVectors(attribute)
+    else:
+        attribute.SetName("scalar")
+        attributes.SetScalars(attribute)
+
+
+def genPolygonCells(m3, numberOfCells, nVertices):
+    '''
+    Builds the vtkCellArray of polygons for an unstructured mesh.
+    m3 holds nVertices consecutive points for each cell, vertices
+    with a missing (nan) x coordinate are dropped from their cell.
+    '''
+    valid = ~numpy.isnan(m3[:, 0]).reshape((numberOfCells, nVertices))
+    # legacy cell array layout: npts, id0, id1, ... for each cell
+    cells = numpy.empty((numberOfCells, nVertices + 1),
+                        dtype=VN.ID_TYPE_CODE)
+    cells[:, 0] = valid.sum(axis=1)
+    cells[:, 1:] = numpy.arange(numberOfCells * nVertices,
+                                dtype=VN.ID_TYPE_CODE).reshape(
+        (numberOfCells, nVertices))
+    keep = numpy.ones(cells.shape, dtype=numpy.bool_)
+    keep[:, 1:] = valid
+    vtkcells = vtk.vtkCellArray()
+    vtkcells.SetCells(numberOfCells,
+                      VN.numpy_to_vtkIdTypeArray(cells[keep], deep=True))
+    return vtkcells
+
+
 def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
             dualGrid=False):
     continents = False
@@ -300,6 +446,8 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
     cellData = True
     xm, xM, ym, yM = None, None, None, None
     projection = vcs.elements["projection"][gm.projection]
+    # what the points are built from, see gridCacheKey
+    source = None
 
     try:  # First try to see if we can get a mesh out of this
         g = data1.getGrid()
@@ -308,6 +456,7 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
             continents = True
             wrap = [0., 360.]
             if grid is None:
+                source = (g,)
                 m = g.getMesh()
                 xm = m[:, 1].min()
                 xM = m[:, 1].max()
@@ -316,6 +465,7 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
                 numberOfCells = m.shape[0]
                 # For vtk we need to reorder things
                 m2 = numpy.ascontiguousarray(numpy.transpose(m, (0, 2, 1)))
+                nVertices = m2.shape[-2]
                 m2.resize((m2.shape[0] * m2.shape[1], m2.shape[2]))
                 m2 = m2[..., ::-1]
                 # here we add dummy levels, might want to reconsider converting
@@ -330,6 +480,7 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
             if gm.wrap[1] == 360.:
                 continents = True
             if grid is None:
+                source = (data2,)
                 xm = data2[:, 1].min()
                 xM = data2[:, 1].max()
                 ym = data2[:, 0].min()
@@ -350,15 +501,8 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
     if m3 is not None:
         # Create unstructured grid points
         vg = vtk.vtkUnstructuredGrid()
-        for i in range(numberOfCells):
-            pt_ids = []
-            for j in range(nVertices):
-                indx = i * nVertices + j
-                if not numpy.isnan(m3[indx][0]):  # missing value means skip vertex
-                    pt_ids.append(indx)
-            vg.InsertNextCell(vtk.VTK_POLYGON,
-                              len(pt_ids),
-                              pt_ids)
+        vg.SetCells(vtk.VTK_POLYGON,
+                    genPolygonCells(m3, numberOfCells, nVertices))
     else:
         # Ok a simple structured grid is enough
         if grid is None:
@@ -369,6 +513,7 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
             continents = True
             wrap = [0., 360.]
             if grid is None:
+                source = (g,)
                 lat = g.getLatitude()
                 lon = g.getLongitude()
             if isinstance(g, cdms2.hgrid.AbstractCurveGrid):
@@ -381,6 +526,7 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
             elif grid is None:
                 lon = data1.getAxis(-1)
                 lat = data1.getAxis(-2)
+                source = (lon, lat)
                 # Ok let's try to get the bounds
                 lon2 = getBoundsList(lon, hasCellData, dualGrid)
                 lat2 = getBoundsList(lat, hasCellData, dualGrid)
@@ -405,6 +551,7 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
             data1 = cdms2.asVariable(data1)
             lon = data1.getAxis(-1)
             lat = data1.getAxis(-2)
+            source = (lon, lat)
             # Ok let's try to get the bounds
             lon2 = getBoundsList(lon, hasCellData, dualGrid)
             lat2 = getBoundsList(lat, hasCellData, dualGrid)
@@ -448,6 +595,31 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
                     ym = lat.min()
                     yM = lat.max()
 
+    cacheKey = None
+    if grid is None:
+        # We use the zooming feature for linear and polar projections
+        # We use plotting coordinates for doing the projection
+        # such that parameters such that central meridian are set correctly
+        if (gm.g_name == 'Gfm'):
+            # axes are not lon/lat for meshfill
+            wc = [gm.datawc_x1, gm.datawc_x2, gm.datawc_y1, gm.datawc_y2]
+        else:
+            wc = vcs.utils.getworldcoordinates(gm,
+                                               data1.getAxis(-1),
+                                               data1.getAxis(-2))
+        cacheKey = gridCacheKey(vg, m3, g, cellData, genVectors,
+                                wc, projection, wrap, source)
+        cached = gridCache.get(cacheKey)
+        if cached is not None:
+            # same geometry as a previous plot, only swap the data in
+            vg = copyCachedGrid(cached["vtk_backend_grid"])
+            setGridAttribute(vg, data1, data2, cellData, genVectors)
+            out = dict(cached)
+            out["vtk_backend_grid"] = vg
+            out["data"] = data1
+            out["data2"] = data2
+            return out
+
     # attribute data
     gridForAttribute = grid if grid else vg
     if genVectors:
@@ -475,28 +647,16 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
         xRange = ptsBounds[1] - ptsBounds[0]
         xm, xM, ym, yM, tmp, tmp2 = pts.GetBounds()
 
-        # We use the zooming feature for linear and polar projections
-        # We use plotting coordinates for doing the projection
-        # such that parameters such that central meridian are set correctly
-        if (gm.g_name == 'Gfm'):
-            # axes are not lon/lat for meshfill
-            wc = [gm.datawc_x1, gm.datawc_x2, gm.datawc_y1, gm.datawc_y2]
-        else:
-            wc = vcs.utils.getworldcoordinates(gm,
-                                               data1.getAxis(-1),
-                                               data1.getAxis(-2))
-
         vg.SetPoints(pts)
         # index into the scalar array. Used for upgrading
         # the scalar after wrapping. Note this will work
         # correctly only for cell data. For point data
         # the indexes for points on the border will be incorrect after
         # wrapping
-        pedigreeId = vtk.vtkIntArray()
+        pedigreeId = numpy_to_vtk_wrapper(
+            numpy.arange(attribute.GetNumberOfTuples(), dtype=numpy.int32),
+            deep=False)
         pedigreeId.SetName("PedigreeIds")
-        pedigreeId.SetNumberOfTuples(attribute.GetNumberOfTuples())
-        for i in range(0, attribute.GetNumberOfTuples()):
-            pedigreeId.SetValue(i, i)
         if cellData:
             vg.GetCellData().SetPedigreeIds(pedigreeId)
         else:
@@ -519,20 +679,15 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
         ghost = vg.AllocatePointGhostArray()
         if (setInfToValid(geopts, ghost)):
             # if there are hidden points, we recompute the bounds
-            xm = ym = sys.float_info.max
-            xM = yM = - sys.float_info.max
-            for i in range(pts.GetNumberOfPoints()):
-                if (ghost.GetValue(i) & vtk.vtkDataSetAttributes.HIDDENPOINT == 0):
-                    # point not hidden
-                    p = pts.GetPoint(i)
-                    if (p[0] < xm):
-                        xm = p[0]
-                    if (p[0] > xM):
-                        xM = p[0]
-                    if (p[1] < ym):
-                        ym = p[1]
-                    if (p[1] > yM):
-                        yM = p[1]
+            visible = (VN.vtk_to_numpy(ghost) &
+                       vtk.vtkDataSetAttributes.HIDDENPOINT) == 0
+            if visible.any():
+                visiblePoints = VN.vtk_to_numpy(pts.GetData())[visible]
+                xm, ym = visiblePoints[:, :2].min(axis=0)
+                xM, yM = visiblePoints[:, :2].max(axis=0)
+            else:
+                xm = ym = sys.float_info.max
+                xM = yM = - sys.float_info.max
             # hidden point don't work for polys or unstructured grids.
             # We remove the cells in this case.
             if (vg.GetExtentType() == vtk.VTK_PIECES_EXTENT):
@@ -559,6 +714,17 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
            "data": data1,
            "data2": data2
            }
+    if cacheKey is not None:
+        cached = dict(out)
+        del cached["data"]
+        del cached["data2"]
+        cached["vtk_backend_grid"] = vg.NewInstance()
+        cached["vtk_backend_grid"].DeepCopy(vg)
+        for attributes in [cached["vtk_backend_grid"].GetCellData(),
+                           cached["vtk_backend_grid"].GetPointData()]:
+            attributes.RemoveArray("scalar")
+            attributes.RemoveArray("vector")
+        gridCache.put(cacheKey, cached)
     return out
 
 # Continents first
@@ -566,24 +732,19 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
 vcsContinents = {}
 
 
-def prepContinents(fnm):
-    """ This converts vcs continents files to vtkpolydata
-    Author: Charles Doutriaux
+def parseContinents(fnm):
+    """ Reads a vcs continents file
     Input: vcs continent file name
+    Output: (lon, lat) pairs numpy array and number of points of each line
     """
-    if fnm in vcsContinents:
-        return vcsContinents[fnm]
-    poly = vtk.vtkPolyData()
-    cells = vtk.vtkCellArray()
-    pts = vtk.vtkPoints()
+    values = []
+    counts = []
     f = open(fnm)
     ln = f.readline()
     while ln.strip().split() != ["-99", "-99"]:
         # Many lines, need to know number of points
         N = int(ln.split()[0])
-        # Now create and store these points
         n = 0
-        npts = pts.GetNumberOfPoints()
         while n < N:
             ln = f.readline()
             sp = ln.split()
@@ -591,28 +752,119 @@ def prepContinents(fnm):
             didIt = False
             if sn % 2 == 0:
                 try:
-                    spts = []
-                    for i in range(sn / 2):
-                        l, L = float(sp[i * 2]), float(sp[i * 2 + 1])
-                        spts.append([l, L])
-                    for p in spts:
-                        pts.InsertNextPoint(p[1], p[0], 0.)
+                    values.extend([float(v) for v in sp])
                     n += sn
                     didIt = True
-                except:
+                except ValueError:
                     didIt = False
             if didIt is False:
-                while len(ln) > 2:
-                    l, L = float(ln[:8]), float(ln[8:16])
-                    pts.InsertNextPoint(L, l, 0.)
-                    ln = ln[16:]
-                    n += 2
-        ln = vtk.vtkPolyLine()
-        ln.GetPointIds().SetNumberOfIds(N / 2)
-        for i in range(N / 2):
-            ln.GetPointIds().SetId(i, i + npts)
-        cells.InsertNextCell(ln)
+                # fixed width, 8 characters per value
+                npairs = (len(ln) + 13) // 16 if len(ln) > 2 else 0
+                values.extend(ln[k:k + 8] for k in range(0, 16 * npairs, 8))
+                n += 2 * npairs
+        counts.append((N / 2, len(values)))
         ln = f.readline()
+    f.close()
+    latlon = numpy.array(values, dtype=numpy.float64).reshape((-1, 2))
+    counts = numpy.array(counts, dtype=VN.ID_TYPE_CODE).reshape((-1, 2))
+    # a line may be followed by extra points, lines start where the values
+    # of the previous line ended
+    starts = numpy.concatenate(([0], counts[:-1, 1] // 2))
+    return latlon[:, ::-1], starts.astype(VN.ID_TYPE_CODE), counts[:, 0]
+
+
+def genOffsetCells(starts, counts):
+    """ Legacy vtkCellArray layout for cells (polylines, polygons) of
+    counts[i] consecutive points starting at point starts[i]"""
+    heads = numpy.cumsum(counts + 1) - (counts + 1)
+    conn = numpy.empty((counts + 1).sum(), dtype=VN.ID_TYPE_CODE)
+    conn[heads] = counts
+    ids = numpy.ones(len(conn), dtype=numpy.bool_)
+    ids[heads] = False
+    first = numpy.cumsum(counts) - counts
+    conn[ids] = (numpy.repeat(starts - first, counts) +
+                 numpy.arange(counts.sum(), dtype=VN.ID_TYPE_CODE))
+    return conn
+
+
+def continentsCachePath(fnm):
+    """ Names of the binary cache (points, lines) of a continents file,
+    in the user's dot directory and keyed on the file path and mtime"""
+    dotdir, dotdirenv = vcs.getdotdirectory()
+    cachedir = os.path.join(os.path.expanduser("~"),
+                            os.environ.get(dotdirenv, dotdir),
+                            "continents_cache")
+    fnm = os.path.abspath(fnm)
+    prefix = "%s_%s" % (os.path.basename(fnm),
+                        hashlib.sha1(fnm).hexdigest()[:12])
+    key = "%s_%i" % (prefix, os.path.getmtime(fnm))
+    return (os.path.join(cachedir, prefix),
+            os.path.join(cachedir, key + "_points.npy"),
+            os.path.join(cachedir, key + "_lines.npy"))
+
+
+def loadContinentsCache(fnm):
+    try:
+        prefix, pointsFile, linesFile = continentsCachePath(fnm)
+        # copy on write mappings, VTK arrays wrap the mapped pages directly
+        # (the arrays keep a reference to them) and nothing we modify later
+        # ever reaches the file
+        points = numpy.load(pointsFile, mmap_mode="c")
+        lines = numpy.load(linesFile, mmap_mode="c")
+    except (IOError, OSError, ValueError):
+        return None
+    if lines.dtype != numpy.dtype(VN.ID_TYPE_CODE):
+        # written by a vtk with another id size
+        return None
+    poly = vtk.vtkPolyData()
+    pts = vtk.vtkPoints()
+    pts.SetData(VN.numpy_to_vtk(points, deep=False))
+    poly.SetPoints(pts)
+    cells = vtk.vtkCellArray()
+    cells.SetCells(int(lines[0]),
+                   VN.numpy_to_vtkIdTypeArray(lines[1:], deep=False))
+    poly.SetLines(cells)
+    return poly
+
+
+def saveContinentsCache(fnm, poly):
+    try:
+        prefix, pointsFile, linesFile = continentsCachePath(fnm)
+        if not os.path.exists(os.path.dirname(prefix)):
+            os.makedirs(os.path.dirname(prefix))
+        # Removes caches of older versions of this file
+        for old in os.listdir(os.path.dirname(prefix)):
+            if old.startswith(os.path.basename(prefix) + "_"):
+                os.remove(os.path.join(os.path.dirname(prefix), old))
+        lines = VN.vtk_to_numpy(poly.GetLines().GetData())
+        numpy.save(pointsFile, VN.vtk_to_numpy(poly.GetPoints().GetData()))
+        numpy.save(linesFile, numpy.concatenate(
+            ([poly.GetNumberOfLines()], lines)).astype(VN.ID_TYPE_CODE))
+    except (IOError, OSError):
+        # Read only home, we will parse the file next time
+        pass
+
+
+def prepContinents(fnm):
+    """ This converts vcs continents files to vtkpolydata
+    Author: Charles Doutriaux
+    Input: vcs continent file name
+    """
+    if fnm in vcsContinents:
+        return vcsContinents[fnm]
+    poly = loadContinentsCache(fnm)
+    if poly is not None:
+        vcsContinents[fnm] = poly
+        return poly
+
+    lonlat, starts, counts = parseContinents(fnm)
+    poly = vtk.vtkPolyData()
+    pts = vtk.vtkPoints()
+    pts.SetData(VN.numpy_to_vtk(
+        numpy.column_stack((lonlat, numpy.zeros(len(lonlat)))), deep=True))
+    cells = vtk.vtkCellArray()
+    cells.SetCells(len(counts), VN.numpy_to_vtkIdTypeArray(
+        genOffsetCells(starts, counts), deep=True))
     poly.SetPoints(pts)
     poly.SetLines(cells)
 
@@ -631,10 +883,41 @@ def prepContinents(fnm):
     clipper.Update()
     poly = clipper.GetOutput()
 
+    saveContinentsCache(fnm, poly)
     vcsContinents[fnm] = poly
     return poly
 
 
+# Wrapped and projected continents, shared by all plots and canvases
+# using the same continents, projection and world coordinates
+continentsCache = LRUCache(maxsize=32, maxbytes=128 * 1024 * 1024,
+                           sizeof=lambda entry: vtk_nbytes(entry[0]))
+
+
+def prepProjectedContinents(fnm, wc, projection, wrap=[0., 360.]):
+    """ Continents of file fnm wrapped to the world coordinates wc and
+    projected with projection (a vcs projection object)
+    Output: (polydata, geo transform or None when linear)
+    The polydata is shared, do not modify it.
+    """
+    key = (fnm, repr(list(wc)), projection.type,
+           repr(projection.parameters), tuple(wrap))
+    cached = continentsCache.get(key)
+    if cached is not None:
+        return cached
+    contData = prepContinents(fnm)
+    contData = doWrapData(contData, wc, wrap, fastClip=False)
+    if projection.type != "linear":
+        # we use plotting coordinates for doing the projection so
+        # that parameters such that central meridian are set correctly.
+        geo, gcpts = project(contData.GetPoints(), projection, wc)
+        contData.SetPoints(gcpts)
+    else:
+        geo = None
+    continentsCache.put(key, (contData, geo))
+    return contData, geo
+
+
 def apply_proj_parameters(pd, projection, x1, x2, y1, y2):
     pname = projDict.get(projection._type, projection.type)
     projName = pname
@@ -917,6 +1200,18 @@ def dump2VTK(obj, fnm=None):
     dsw.Write()
 
 
+def wrapOffsets(mn, mx, wmn, wmx, modulo):
+    '''
+    Offsets (multiples of modulo) of the copies of [mn, mx] needed to
+    cover [wmn, wmx], copies missing the window are left out.
+    '''
+    modulo = abs(modulo)
+    below = max(0, int(numpy.ceil((mn - wmn) / modulo)))
+    above = max(0, int(numpy.ceil((wmx - mx) / modulo)))
+    return [i * modulo for i in range(-below, above + 1)
+            if mn + i * modulo <= wmx and mx + i * modulo >= wmn]
+
+
 def doWrapData(data, wc, wrap=[0., 360], fastClip=True):
     '''
     Wrapping around and 'wrap' modulo' and clipping.
@@ -925,16 +1220,7 @@ def doWrapData(data, wc, wrap=[0., 360], fastClip=True):
     if wrap is None:
         return data
 
-    # convert to poly data
-    surface = vtk.vtkDataSetSurfaceFilter()
-    surface.SetInputData(data)
-    surface.Update()
-    data = surface.GetOutput()
-
     bounds = data.GetBounds()
-    # insure that GLOBALIDS are not removed by the append filter
-    attributes = data.GetCellData()
-    attributes.SetActiveAttribute(-1, attributes.GLOBALIDS)
     xmn = min(wc[0], wc[1])
     xmx = max(wc[0], wc[1])
     if (numpy.allclose(xmn, 1.e20) or numpy.allclose(xmx, 1.e20)):
@@ -952,88 +1238,65 @@ def doWrapData(data, wc, wrap=[0., 360], fastClip=True):
         else:
             ymx = bounds[3]
 
-    appendFilter = vtk.vtkAppendPolyData()
-    appendFilter.AddInputData(data)
-    appendFilter.Update()
-    # X axis wrappping
-    Amn, Amx = bounds[0], bounds[1]
+    # The copies along x, then along y, of the data
+    offsets = [(0., 0.)]
     if wrap[1] != 0.:
-        i = 0
-        while Amn > xmn:
-            i += 1
-            Amn -= wrap[1]
-            Tpf = vtk.vtkTransformPolyDataFilter()
-            Tpf.SetInputData(data)
-            T = vtk.vtkTransform()
-            T.Translate(-i * wrap[1], 0, 0)
-            Tpf.SetTransform(T)
-            Tpf.Update()
-            appendFilter.AddInputData(Tpf.GetOutput())
-            appendFilter.Update()
-        i = 0
-        while Amx < xmx:
-            i += 1
-            Amx += wrap[1]
-            Tpf = vtk.vtkTransformPolyDataFilter()
-            Tpf.SetInputData(data)
-            T = vtk.vtkTransform()
-            T.Translate(i * wrap[1], 0, 0)
-            Tpf.SetTransform(T)
-            Tpf.Update()
-            appendFilter.AddInputData(Tpf.GetOutput())
-            appendFilter.Update()
-
-    # Y axis wrapping
-    Amn, Amx = bounds[2], bounds[3]
+        offsets += [(o, 0.) for o in wrapOffsets(bounds[0], bounds[1],
+                                                 xmn, xmx, wrap[1]) if o != 0]
     if wrap[0] != 0.:
-        i = 0
-        while Amn > ymn:
-            i += 1
-            Amn -= wrap[0]
-            Tpf = vtk.vtkTransformPolyDataFilter()
-            Tpf.SetInputData(data)
-            T = vtk.vtkTransform()
-            T.Translate(0, i * wrap[0], 0)
-            Tpf.SetTransform(T)
-            Tpf.Update()
-            appendFilter.AddInputData(Tpf.GetOutput())
-            appendFilter.Update()
-        i = 0
-        while Amx < ymx:
-            i += 1
-            Amx += wrap[0]
-            Tpf = vtk.vtkTransformPolyDataFilter()
-            Tpf.SetInputData(data)
-            T = vtk.vtkTransform()
-            T.Translate(0, -i * wrap[0], 0)
-            Tpf.SetTransform(T)
-            Tpf.Update()
-            appendFilter.AddInputData(Tpf.GetOutput())
-            appendFilter.Update()
-
-    # Clip the data to the final window:
-    clipBox = vtk.vtkBox()
-    clipBox.SetXMin(xmn, ymn, -1.0)
-    clipBox.SetXMax(xmx, ymx, 1.0)
-    if fastClip:
-        clipper = vtk.vtkExtractPolyDataGeometry()
-        clipper.ExtractInsideOn()
-        clipper.SetImplicitFunction(clipBox)
-        clipper.ExtractBoundaryCellsOn()
-        clipper.PassPointsOff()
-    else:
-        clipper = vtk.vtkClipPolyData()
-        clipper.InsideOutOn()
-        clipper.SetClipFunction(clipBox)
-    clipper.SetInputConnection(appendFilter.GetOutputPort())
-    clipper.Update()
+        offsets += [(0., o) for o in wrapOffsets(bounds[2], bounds[3],
+                                                 ymn, ymx, wrap[0]) if o != 0]
+
+    if (len(offsets) == 1 and data.IsA("vtkStructuredGrid") and
+            bounds[0] >= xmn and bounds[1] <= xmx and
+            bounds[2] >= ymn and bounds[3] <= ymx):
+        # Nothing to wrap or clip, keep the grid as it is
+        return data
+
+    # convert to poly data
+    surface = vtk.vtkDataSetSurfaceFilter()
+    surface.SetInputData(data)
+    surface.Update()
+    data = surface.GetOutput()
+    # insure that GLOBALIDS are not removed by the append filter
+    attributes = data.GetCellData()
+    attributes.SetActiveAttribute(-1, attributes.GLOBALIDS)
+
+    # Each copy is clipped to the window moved back by its offset before
+    # being moved, so only what shows is copied, and appended once.
+    appendFilter = vtk.vtkAppendPolyData()
+    for dx, dy in offsets:
+        clipBox = vtk.vtkBox()
+        clipBox.SetXMin(xmn - dx, ymn - dy, -1.0)
+        clipBox.SetXMax(xmx - dx, ymx - dy, 1.0)
+        if fastClip:
+            clipper = vtk.vtkExtractPolyDataGeometry()
+            clipper.ExtractInsideOn()
+            clipper.SetImplicitFunction(clipBox)
+            clipper.ExtractBoundaryCellsOn()
+            clipper.PassPointsOff()
+        else:
+            clipper = vtk.vtkClipPolyData()
+            clipper.InsideOutOn()
+            clipper.SetClipFunction(clipBox)
+        clipper.SetInputData(data)
+        if dx == 0. and dy == 0.:
+            appendFilter.AddInputConnection(clipper.GetOutputPort())
+            continue
+        Tpf = vtk.vtkTransformPolyDataFilter()
+        Tpf.SetInputConnection(clipper.GetOutputPort())
+        T = vtk.vtkTransform()
+        T.Translate(dx, dy, 0)
+        Tpf.SetTransform(T)
+        appendFilter.AddInputConnection(Tpf.GetOutputPort())
+    appendFilter.Update()
     # set globalids attribute
-    attributes = clipper.GetOutput().GetCellData()
+    attributes = appendFilter.GetOutput().GetCellData()
     globalIdsIndex = vtk.mutable(-1)
     attributes.GetArray("GlobalIds", globalIdsIndex)
     attributes.SetActiveAttribute(globalIdsIndex, attributes.GLOBALIDS)
 
-    return clipper.GetOutput()
+    return appendFilter.GetOutput()
 
 
 # Wrap grid in interval minX, minX + 360
@@ -1143,13 +1406,8 @@ def setClipPlanes(mapper, xmin, xmax, ymin, ymax):
 #     return clp.GetOutput()
 
 
-def prepTextProperty(p, winSize, to="default", tt="default", cmap=None,
-                     overrideColorIndex=None):
-    if isinstance(to, str):
-        to = vcs.elements["textorientation"][to]
-    if isinstance(tt, str):
-        tt = vcs.elements["texttable"][tt]
-
+def textColors(tt, cmap=None, overrideColorIndex=None):
+    """Foreground and background rgba colors of a texttable"""
     if tt.colormap is not None:
         cmap = tt.colormap
     elif cmap is None:
@@ -1161,13 +1419,39 @@ def prepTextProperty(p, winSize, to="default", tt="default", cmap=None,
         c = cmap.index[colorIndex]
     else:
         c = colorIndex
-    p.SetColor([C / 100. for C in c[:3]])
-    p.SetOpacity(c[-1])
     bcolorIndex = tt.backgroundcolor if tt.backgroundcolor else 255
     if isinstance(bcolorIndex, int):
         bc = cmap.index[bcolorIndex]
     else:
         bc = bcolorIndex
+    return c, bc
+
+
+def textPropertyKey(winSize, to="default", tt="default", cmap=None,
+                    overrideColorIndex=None):
+    """Hashable summary of everything prepTextProperty sets, two
+    text properties with the same key render identically"""
+    if isinstance(to, str):
+        to = vcs.elements["textorientation"][to]
+    if isinstance(tt, str):
+        tt = vcs.elements["texttable"][tt]
+    c, bc = textColors(tt, cmap, overrideColorIndex)
+    return (tuple(c), tuple(bc[:3]), tt.backgroundopacity,
+            to.halign, to.valign, to.angle,
+            vcs.elements["fontNumber"][tt.font],
+            int(to.height * winSize[1] / 800.))
+
+
+def prepTextProperty(p, winSize, to="default", tt="default", cmap=None,
+                     overrideColorIndex=None):
+    if isinstance(to, str):
+        to = vcs.elements["textorientation"][to]
+    if isinstance(tt, str):
+        tt = vcs.elements["texttable"][tt]
+
+    c, bc = textColors(tt, cmap, overrideColorIndex)
+    p.SetColor([C / 100. for C in c[:3]])
+    p.SetOpacity(c[-1])
     p.SetBackgroundColor([C / 100. for C in bc[:3]])
     bopacity = (tt.backgroundopacity / 100.) if tt.backgroundopacity else 0
     p.SetBackgroundOpacity(bopacity)
@@ -1198,7 +1482,13 @@ def prepTextProperty(p, winSize, to="default", tt="default", cmap=None,
 
 
 def genTextActor(renderer, string=None, x=None, y=None,
-                 to='default', tt='default', cmap=None, geoBounds=None, geo=None):
+                 to='default', tt='default', cmap=None, geoBounds=None, geo=None,
+                 cache=None):
+    """Text actors for string at (x, y), one per string.
+
+    cache, a vcsvtk.textcache.TextCache, provides the actors and their
+    prepared text property when given.
+    """
     if isinstance(to, str):
         to = vcs.elements["textorientation"][to]
     if isinstance(tt, str):
@@ -1221,19 +1511,41 @@ def genTextActor(renderer, string=None, x=None, y=None,
 
     sz = renderer.GetRenderWindow().GetSize()
     actors = []
-    pts = vtk.vtkPoints()
+    if cache is not None:
+        key = textPropertyKey(sz, to, tt, cmap)
+
+        def prep(p):
+            prepTextProperty(p, sz, to, tt, cmap)
+
+    for i in range(n):
+        if cache is not None:
+            t = cache.actor(string[i], key, prep)
+        else:
+            t = vtk.vtkTextActor()
+            p = t.GetTextProperty()
+            prepTextProperty(p, sz, to, tt, cmap)
+        t.SetInput(string[i])
+        # T=vtk.vtkTransform()
+        # T.Scale(1.,sz[1]/606.,1.)
+        # T.RotateY(to.angle)
+        # t.SetUserTransform(T)
+        renderer.AddActor(t)
+        actors.append(t)
+    placeTextActors(renderer, actors, x, y, tt, geoBounds, geo)
+    return actors
+
+
+def placeTextActors(renderer, actors, x, y, tt, geoBounds=None, geo=None):
+    """Positions the text actors of genTextActor, actor i at (x[i], y[i]),
+    in pixels of the current size of renderer."""
     if vcs.elements["projection"][tt.projection].type != "linear":
         wc = geoBounds[:4]
         # renderer.SetViewport(tt.viewport[0],tt.viewport[2],tt.viewport[1],tt.viewport[3])
         renderer.SetWorldPoint(wc)
-
-    for i in range(n):
-        t = vtk.vtkTextActor()
-        p = t.GetTextProperty()
-        prepTextProperty(p, sz, to, tt, cmap)
-        pts = vtk.vtkPoints()
-        pts.InsertNextPoint(x[i], y[i], 0.)
+    for i, t in enumerate(actors):
         if vcs.elements["projection"][tt.projection].type != "linear":
+            pts = vtk.vtkPoints()
+            pts.InsertNextPoint(x[i], y[i], 0.)
             _, pts = project(pts, tt.projection, tt.worldcoordinate, geo=geo)
             X, Y, tz = pts.GetPoint(0)
             X, Y = world2Renderer(renderer, X, Y, tt.viewport, wc)
@@ -1241,14 +1553,6 @@ def genTextActor(renderer, string=None, x=None, y=None,
             X, Y = world2Renderer(
                 renderer, x[i], y[i], tt.viewport, tt.worldcoordinate)
         t.SetPosition(X, Y)
-        t.SetInput(string[i])
-        # T=vtk.vtkTransform()
-        # T.Scale(1.,sz[1]/606.,1.)
-        # T.RotateY(to.angle)
-        # t.SetUserTransform(T)
-        renderer.AddActor(t)
-        actors.append(t)
-    return actors
 
 
 def prepPrimitive(prim):
@@ -1258,11 +1562,14 @@ def prepPrimitive(prim):
         prim.x = [prim.x, ]
     if not isinstance(prim.y[0], (list, tuple)):
         prim.y = [prim.y, ]
-    if vcs.isfillarea(prim):
+    # registered objects or vcs.transient primitives
+    g_type = getattr(prim, "g_type", None)
+    isfillarea = vcs.isfillarea(prim) or g_type == "fillarea"
+    if isfillarea:
         atts = ["x", "y", "color", "style", "index"]
-    elif vcs.ismarker(prim):
+    elif vcs.ismarker(prim) or g_type == "marker":
         atts = ["x", "y", "color", "size", "type"]
-    elif vcs.isline(prim):
+    elif vcs.isline(prim) or g_type == "line":
         atts = ["x", "y", "color", "width", "type"]
     n = 0
     for a in atts:
@@ -1274,7 +1581,7 @@ def prepPrimitive(prim):
         setattr(prim, a, v)
 
     # Handle fillarea opacity case, where the default will depend on the style
-    if vcs.isfillarea(prim):
+    if isfillarea:
         o = getattr(prim, "opacity")
         s = getattr(prim, "style")
         assert(len(s) == n)
@@ -1298,11 +1605,68 @@ def __build_pd__():
     return pts, polygons, polygonPolyData
 
 
-def prepFillarea(renWin, farea, cmap=None):
+def flattenCoordinates(xs, ys):
+    """ Flattens lists of per shape x and y lists into flat numpy arrays
+    Output: x, y, offsets (shape i uses points offsets[i]:offsets[i+1])
+    """
+    counts = numpy.array([len(x) for x in xs], dtype=VN.ID_TYPE_CODE)
+    for x, y in zip(xs, ys):
+        assert(len(x) == len(y))
+    offsets = numpy.concatenate(([0], numpy.cumsum(counts))).astype(
+        VN.ID_TYPE_CODE)
+    x = numpy.fromiter(itertools.chain.from_iterable(xs), numpy.float64,
+                       offsets[-1])
+    y = numpy.fromiter(itertools.chain.from_iterable(ys), numpy.float64,
+                       offsets[-1])
+    return x, y, offsets
+
+
+def subsetOffsets(offsets, cells):
+    """ Points indices and offsets of the shapes cells of a flat layout"""
+    cells = numpy.asarray(cells, dtype=VN.ID_TYPE_CODE)
+    counts = numpy.diff(offsets)[cells]
+    sub = numpy.concatenate(([0], numpy.cumsum(counts))).astype(
+        VN.ID_TYPE_CODE)
+    pointIds = (numpy.repeat(offsets[cells] - sub[:-1], counts) +
+                numpy.arange(sub[-1], dtype=VN.ID_TYPE_CODE))
+    return pointIds, sub
+
+
+def genOffsetPolyData(xyz, offsets, lines=False):
+    """ Builds a vtkPolyData of polygons (polylines if lines) from a (N, 3)
+    array of points, cell i uses points offsets[i] to offsets[i + 1]"""
+    pts = vtk.vtkPoints()
+    pts.SetData(VN.numpy_to_vtk(
+        numpy.ascontiguousarray(xyz, dtype=numpy.float64), deep=True))
+    counts = numpy.diff(offsets)
+    cells = vtk.vtkCellArray()
+    cells.SetCells(len(counts), VN.numpy_to_vtkIdTypeArray(
+        genOffsetCells(offsets[:-1], counts), deep=True))
+    pd = vtk.vtkPolyData()
+    pd.SetPoints(pts)
+    if lines:
+        pd.SetLines(cells)
+    else:
+        pd.SetPolys(cells)
+    return pd
+
+
+def projectArrays(x, y, projection, wc):
+    """ Projects flat x, y arrays
+    Output: geo transform (None for linear) and (N, 3) projected points"""
+    xyz = numpy.column_stack((x, y, numpy.zeros(len(x))))
+    pts = vtk.vtkPoints()
+    pts.SetData(VN.numpy_to_vtk(xyz, deep=True))
+    geo, pts = project(pts, projection, wc)
+    if geo is None:
+        return geo, xyz
+    return geo, VN.vtk_to_numpy(pts.GetData())
+
+
+def prepFillarea(renWin, farea, cmap=None, patterns=None):
     n = prepPrimitive(farea)
     if n == 0:
         return []
-    actors = []
 
     # Find color map:
     if farea.colormap is not None:
@@ -1312,92 +1676,82 @@ def prepFillarea(renWin, farea, cmap=None):
     if isinstance(cmap, str):
         cmap = vcs.elements["colormap"][cmap]
 
-    # Create data structures
-    pts, polygons, polygonPolyData = __build_pd__()
-    colors = vtk.vtkUnsignedCharArray()
-    colors.SetNumberOfComponents(4)
-    colors.SetNumberOfTuples(n)
-    polygonPolyData.GetCellData().SetScalars(colors)
+    x, y, offsets = flattenCoordinates(farea.x, farea.y)
+    opacity = list(farea.opacity) + [None] * (n - len(farea.opacity))
+    return prepFillareaArrays(renWin, x, y, offsets,
+                              farea.style[:n], farea.index[:n],
+                              farea.color[:n], opacity[:n],
+                              farea.projection, farea.worldcoordinate, cmap,
+                              patterns)
+
+
+def prepFillareaArrays(renWin, x, y, offsets, style, index, color, opacity,
+                       projection, wc, cmap, patterns=None):
+    """ Batched fillarea: polygon i has its coordinates in
+    x[offsets[i]:offsets[i + 1]], y[...] and uses style[i], index[i],
+    color[i] (color index or rgba in percents) and opacity[i].
+    Solid polygons end up in a single polydata colored by cell, others
+    are grouped by (style, index, color, opacity), one pattern per group.
+    The pattern actors are appended to patterns, when given, for
+    resizePatterns.
+    """
+    actors = []
+    geo, xyz = projectArrays(x, y, projection, wc)
 
-    # Iterate through polygons:
-    for i in range(n):
-        x = farea.x[i]
-        y = farea.y[i]
-        st = farea.style[i]
+    solid = []
+    colors = []
+    groups = collections.OrderedDict()
+    for i, st in enumerate(style):
         if st == "pattern":
             c = (0., 0., 0., 100.)
         else:
-            c = farea.color[i]
-
+            c = color[i]
+        if isinstance(c, int):
+            c = cmap.index[c]
+        c = list(c)
         if st == "solid":
-            points, polys, pd, color_arr = pts, polygons, polygonPolyData, colors
+            # Add the color to the color array:
+            if opacity[i] is not None:
+                c[-1] = opacity[i]
+            solid.append(i)
+            colors.append(c)
         else:
-            points, polys, pd = __build_pd__()
-            color_arr = vtk.vtkUnsignedCharArray()
-            color_arr.SetNumberOfComponents(4)
-            color_arr.SetNumberOfTuples(1)
-            colors.SetNumberOfTuples(colors.GetNumberOfTuples() - 1)
-            pd.GetCellData().SetScalars(color_arr)
-
-        idx = farea.index[i]
-        N = max(len(x), len(y))
-
-        for a in [x, y]:
-            assert(len(a) == N)
+            groups.setdefault((st, index[i], tuple(c), opacity[i]),
+                              []).append(i)
 
-        polygon = vtk.vtkPolygon()
-        # Add current polygon
-        pid = polygon.GetPointIds()
-        pid.SetNumberOfIds(N)
-
-        for j in range(N):
-            pid.SetId(j, points.InsertNextPoint(x[j], y[j], 0.))
-        cellId = polys.InsertNextCell(polygon)
-
-        if isinstance(c, int):
-            color = [C for C in cmap.index[c]]
-        else:
-            color = [C for C in c]
-        if len(farea.opacity) > i:
-            opacity = farea.opacity[i]
-            if opacity is not None:
-                opacity = farea.opacity[i]
-        else:
-            opacity = None
-        # Draw colored background for solid
+    # Patterns/hatches support
+    for (st, idx, c, op), cells in groups.iteritems():
+        pointIds, sub = subsetOffsets(offsets, cells)
+        pd = genOffsetPolyData(xyz[pointIds], sub)
         # transparent/white background for hatches/patterns
-        if st == 'solid':
-            # Add the color to the color array:
-            if opacity is not None:
-                color[-1] = opacity
-            color = [int(C / 100. * 255) for C in color]
-            colors.SetTypedTuple(cellId, color)
-        else:
-            color_arr.SetTypedTuple(cellId, [255, 255, 255, 0])
-
-        if st != "solid":
-            # Patterns/hatches support
-            geo, proj_points = project(
-                points, farea.projection, farea.worldcoordinate)
-            pd.SetPoints(proj_points)
-            act = fillareautils.make_patterned_polydata(pd,
-                                                        st,
-                                                        idx,
-                                                        color,
-                                                        opacity,
-                                                        renWin.GetSize())
-            if act is not None:
-                if (st == "pattern" and opacity > 0) or st == "hatch":
-                    m = vtk.vtkPolyDataMapper()
-                    m.SetInputData(pd)
-                    a = vtk.vtkActor()
-                    a.SetMapper(m)
-                    actors.append((a, geo))
-                actors.append((act, geo))
-
-    # Transform points
-    geo, pts = project(pts, farea.projection, farea.worldcoordinate)
-    polygonPolyData.SetPoints(pts)
+        bg = numpy.empty((len(cells), 4), dtype=numpy.uint8)
+        bg[:] = [255, 255, 255, 0]
+        pd.GetCellData().SetScalars(VN.numpy_to_vtk(bg, deep=True))
+        act = fillareautils.make_patterned_polydata(pd,
+                                                    st,
+                                                    idx,
+                                                    list(c),
+                                                    op,
+                                                    renWin.GetSize())
+        if act is not None:
+            if patterns is not None:
+                patterns.append([act, pd, st, idx, list(c), op,
+                                 renWin.GetSize()])
+            if (st == "pattern" and op > 0) or st == "hatch":
+                m = vtk.vtkPolyDataMapper()
+                m.SetInputData(pd)
+                a = vtk.vtkActor()
+                a.SetMapper(m)
+                actors.append((a, geo))
+            actors.append((act, geo))
+
+    # Draw colored background for solid
+    pointIds, sub = subsetOffsets(offsets, solid)
+    polygonPolyData = genOffsetPolyData(xyz[pointIds], sub)
+    colors = numpy.array(colors, dtype=numpy.float64).reshape((-1, 4))
+    colors = (colors / 100. * 255).astype(numpy.uint8)
+    polygonPolyData.GetCellData().SetScalars(
+        VN.numpy_to_vtk(colors, deep=True))
     # Setup rendering
     m = vtk.vtkPolyDataMapper()
     m.SetInputData(polygonPolyData)
@@ -1408,6 +1762,21 @@ def prepFillarea(renWin, farea, cmap=None):
     return actors
 
 
+def resizePatterns(patterns, size):
+    """Re-renders the textures of the pattern actors recorded by
+    prepFillareaArrays whose resolution differs at the window size size,
+    the actors and their polydata are kept."""
+    for pattern in patterns:
+        act, pd, st, idx, c, op, oldSize = pattern
+        if fillareautils.num_pixels_for_size(size) == \
+                fillareautils.num_pixels_for_size(oldSize):
+            continue
+        resized = fillareautils.make_patterned_polydata(pd, st, idx, c, op,
+                                                        size)
+        act.SetTexture(resized.GetTexture())
+        pattern[-1] = size
+
+
 def genPoly(coords, pts, filled=True):
     N = pts.GetNumberOfPoints()
     if filled:
@@ -1569,7 +1938,7 @@ def prepGlyph(g, marker, index=0):
         g.SetSourceData(pd)
     elif t in ["w%.2i" % x for x in range(203)]:
         # WMO marker
-        params = wmo[t]
+        params = wmoSymbols()[t]
         pts = vtk.vtkPoints()
         pd = vtk.vtkPolyData()
         polys = vtk.vtkCellArray()
@@ -1646,26 +2015,63 @@ def prepMarker(renWin, marker, cmap=None):
     n = prepPrimitive(marker)
     if n == 0:
         return []
-    actors = []
+
+    # Color
+    if marker.colormap is not None:
+        cmap = marker.colormap
+    elif cmap is None:
+        cmap = vcs._colorMap
+    if isinstance(cmap, str):
+        cmap = vcs.elements["colormap"][cmap]
+
+    groups = collections.OrderedDict()
+    colors = []
     for i in range(n):
-        g = vtk.vtkGlyph2D()
-        markers = vtk.vtkPolyData()
         x = marker.x[i]
         y = marker.y[i]
-        c = marker.color[i]
         N = max(len(x), len(y))
         for a in [x, y]:
-            while len(a) < n:
+            while len(a) < N:
                 a.append(a[-1])
+        c = marker.color[i]
+        if isinstance(c, int):
+            c = cmap.index[c]
+        colors.append(c)
+        # one glyph source per marker type and size
+        groups.setdefault((marker.type[i], marker.size[i]), []).append(i)
+    colors = numpy.array(colors, dtype=numpy.float64).reshape((-1, 4))
+    colors = (colors / 100. * 255).astype(numpy.uint8)
+
+    x, y, offsets = flattenCoordinates(marker.x, marker.y)
+    geo, xyz = projectArrays(x, y, marker.projection, marker.worldcoordinate)
+
+    # actors of each marker entry, entries of a same group share them
+    actors = [None] * n
+    for (t, s), entries in groups.iteritems():
+        pointIds, sub = subsetOffsets(offsets, entries)
+        markers = vtk.vtkPolyData()
         pts = vtk.vtkPoints()
-        for j in range(N):
-            pts.InsertNextPoint(x[j], y[j], 0.)
-        geo, pts = project(pts, marker.projection, marker.worldcoordinate)
+        pts.SetData(VN.numpy_to_vtk(xyz[pointIds], deep=True))
         markers.SetPoints(pts)
-
+        # the entry each point comes from, see splitMarker
+        entryIds = VN.numpy_to_vtk(
+            numpy.repeat(numpy.array(entries, dtype=VN.ID_TYPE_CODE),
+                         numpy.diff(sub)), deep=True)
+        entryIds.SetName("entry")
+        markers.GetPointData().AddArray(entryIds)
+        g = vtk.vtkGlyph2D()
+        groupColors = colors[entries]
+        multiColor = (groupColors != groupColors[0]).any()
+        if multiColor:
+            # each marker gets the color of its entry
+            markers.GetPointData().SetScalars(VN.numpy_to_vtk(
+                numpy.repeat(groupColors, numpy.diff(sub), axis=0),
+                deep=True))
+            g.SetScaleModeToDataScalingOff()
+            g.SetColorModeToColorByScalar()
         #  Type
         # Ok at this point generates the source for glpyh
-        gs, pd = prepGlyph(g, marker, index=i)
+        gs, pd = prepGlyph(g, marker, index=entries[0])
         g.SetInputData(markers)
 
         a = vtk.vtkActor()
@@ -1673,23 +2079,135 @@ def prepMarker(renWin, marker, cmap=None):
         m.SetInputConnection(g.GetOutputPort())
         m.Update()
         a.SetMapper(m)
-        p = a.GetProperty()
-        setMarkerColor(p, marker, c, cmap)
-        actors.append((g, gs, pd, a, geo))
+        if not multiColor:
+            setMarkerColor(a.GetProperty(), marker, marker.color[entries[0]],
+                           cmap)
+        actor = (g, gs, pd, a, geo)
+        for i in entries:
+            actors[i] = actor
 
     return actors
 
 
-def __build_ld__():
+def splitMarker(renWin, marker, actors, index, cmap=None):
+    """Takes entry index of marker out of the glyph filter it shares with
+    the other entries of its (type, size) group in actors (as returned by
+    prepMarker) and returns its own (g, gs, pd, actor, geo).
+    actors[index] is left for the caller to replace."""
+    markers = actors[index][0].GetInput()
+    pointData = markers.GetPointData()
+    # the points prepMarker emitted for the entry, whatever the entry's
+    # coordinates are now
+    keep = VN.vtk_to_numpy(pointData.GetArray("entry")) != index
     pts = vtk.vtkPoints()
-    lines = vtk.vtkCellArray()
-    linePolyData = vtk.vtkPolyData()
-    linePolyData.SetPoints(pts)
-    linePolyData.SetLines(lines)
-    colors = vtk.vtkUnsignedCharArray()
-    colors.SetNumberOfComponents(4)
-    colors.SetName("Colors")
-    return pts, lines, linePolyData, colors
+    pts.SetData(VN.numpy_to_vtk(
+        VN.vtk_to_numpy(markers.GetPoints().GetData())[keep], deep=True))
+    markers.SetPoints(pts)
+    # every point array (colors, entries...), in place to keep their
+    # attribute roles
+    for i in range(pointData.GetNumberOfArrays()):
+        array = pointData.GetArray(i)
+        name = array.GetName()
+        array.DeepCopy(VN.numpy_to_vtk(VN.vtk_to_numpy(array)[keep],
+                                       deep=True,
+                                       array_type=array.GetDataType()))
+        array.SetName(name)
+    markers.Modified()
+
+    entry = transient.Marker(marker)
+    for att in ("x", "y", "type", "size", "color"):
+        setattr(entry, att, [getattr(marker, att)[index]])
+    entry.x = [list(entry.x[0])]
+    entry.y = [list(entry.y[0])]
+    return prepMarker(renWin, entry, cmap)[0]
+
+
+# Contoured and stripped isolines, keyed on the contents of the contoured
+# dataset and the levels, so that restyling or resizing an isoline plot
+# does not contour it again.
+isolineCache = LRUCache(maxsize=16, maxbytes=128 * 1024 * 1024)
+
+
+def datasetDigest(dataset):
+    '''
+    Returns a hash of the geometry, structure and point scalars of a
+    dataset.
+    '''
+    h = hashlib.sha1(dataset.GetClassName())
+    if dataset.IsA("vtkStructuredGrid"):
+        h.update(repr(dataset.GetDimensions()))
+        arrays = []
+    elif dataset.IsA("vtkPolyData"):
+        arrays = [c.GetData() for c in (dataset.GetVerts(), dataset.GetLines(),
+                                          dataset.GetPolys(), dataset.GetStrips())]
+    else:
+        arrays = [dataset.GetCells().GetData()]
+    points = dataset.GetPoints()
+    if points is not None:
+        arrays.append(points.GetData())
+    arrays += [dataset.GetPointData().GetScalars(),
+               dataset.GetPointGhostArray(), dataset.GetCellGhostArray()]
+    for a in arrays:
+        if a is not None and a.GetNumberOfTuples() > 0:
+            h.update(numpy.ascontiguousarray(VN.vtk_to_numpy(a)))
+        else:
+            h.update("-")
+    return h.hexdigest()
+
+
+def stripIsolines(dataset, levels):
+    '''
+    Returns the stripped polylines of the contours of the point scalars of
+    dataset at levels (sorted, unique), with a "level" point array holding
+    the index in levels of each point. Results are kept in isolineCache,
+    they must not be modified.
+    '''
+    key = (datasetDigest(dataset), tuple(levels))
+    stripped = isolineCache.get(key)
+    if stripped is not None:
+        return stripped
+    cot = vtk.vtkContourFilter()
+    cot.SetInputData(dataset)
+    cot.SetNumberOfContours(len(levels))
+    for n, v in enumerate(levels):
+        cot.SetValue(n, v)
+    stripper = vtk.vtkStripper()
+    stripper.SetInputConnection(cot.GetOutputPort())
+    stripper.Update()
+    stripped = stripper.GetOutput()
+
+    # points carry their contour value, possibly in single precision
+    scalars = stripped.GetPointData().GetScalars()
+    if scalars is not None:
+        values = VN.vtk_to_numpy(scalars)
+    else:  # no contour at all
+        values = numpy.zeros(0)
+    levels = numpy.asarray(levels, dtype=numpy.float64)
+    if len(levels) > 1:
+        level = numpy.clip(numpy.searchsorted(levels, values),
+                           1, len(levels) - 1)
+        level -= (values - levels[level - 1]) < (levels[level] - values)
+    else:
+        level = numpy.zeros(len(values), dtype=numpy.int64)
+    vtklevel = numpy_to_vtk_wrapper(level.astype(numpy.int32), deep=True,
+                                    array_type=vtk.VTK_INT)
+    vtklevel.SetName("level")
+    stripped.GetPointData().AddArray(vtklevel)
+    isolineCache.put(key, stripped)
+    return stripped
+
+
+# Sets in polydata the isolines of dataset at levels (see stripIsolines)
+# with a "group" point array mapping each point to levelGroups[its level].
+def setIsolines(polydata, dataset, levels, levelGroups):
+    stripped = stripIsolines(dataset, levels)
+    polydata.ShallowCopy(stripped)
+    level = VN.vtk_to_numpy(stripped.GetPointData().GetArray("level"))
+    group = numpy.asarray(levelGroups, dtype=numpy.int32)[level]
+    vtkgroup = numpy_to_vtk_wrapper(group, deep=True, array_type=vtk.VTK_INT)
+    vtkgroup.SetName("group")
+    polydata.GetPointData().AddArray(vtkgroup)
+    polydata.Modified()
 
 
 def stippleLine(prop, line_type):
@@ -1717,10 +2235,6 @@ def prepLine(renWin, line, cmap=None):
     if number_lines == 0:
         return []
 
-    actors = []
-
-    line_data = {}
-
     if line.colormap is not None:
         cmap = line.colormap
     elif cmap is None:
@@ -1730,69 +2244,93 @@ def prepLine(renWin, line, cmap=None):
         cmap = vcs.elements["colormap"][cmap]
 
     for i in range(number_lines):
-
         x = line.x[i]
         y = line.y[i]
-        if isinstance(line.color[i], int):
-            c = cmap.index[line.color[i]]
-        else:
-            c = line.color[i]
-        w = line.width[i]
-        t = line.type[i]
-
-        if (t, w) not in line_data:
-            line_data[(t, w)] = __build_ld__()
-        pts, lines, linesPoly, colors = line_data[(t, w)]
-        vtk_color = [int(component / 100. * 255) for component in c]
-
         number_points = max(len(x), len(y))
-
-        point_offset = pts.GetNumberOfPoints()
         # Extend x or y to the length of the other by duplicating the last
         # coord.
         for a in [x, y]:
             while len(a) < number_points:
                 a.append(a[-1])
 
-        if vcs.elements["projection"][line.projection].type == "linear":
-            for j in range(number_points):
-                pts.InsertNextPoint(x[j], y[j], 0.)
-            n2 = number_points - 1
+    x, y, offsets = flattenCoordinates(line.x, line.y)
+    return prepLineArrays(renWin, x, y, offsets,
+                          line.color[:number_lines],
+                          line.width[:number_lines],
+                          line.type[:number_lines],
+                          line.projection, line.worldcoordinate, cmap)
+
+
+def interpolateLines(x, y, offsets, NPointsInterp):
+    """ Inserts NPointsInterp - 1 points along each segment of the lines
+    (flat x, y and offsets layout) so they curve once projected.
+    Output: x, y, offsets of the interpolated lines
+    """
+    counts = numpy.diff(offsets)
+    # each line keeps its first point then gets NPointsInterp points
+    # per segment
+    newCounts = numpy.where(counts > 0,
+                            1 + (counts - 1) * NPointsInterp, 0)
+    newOffsets = numpy.concatenate(([0], numpy.cumsum(newCounts))).astype(
+        VN.ID_TYPE_CODE)
+    segment = numpy.ones(len(x), dtype=numpy.bool_)
+    segment[offsets[1:][counts > 0] - 1] = False
+    start = numpy.nonzero(segment)[0]
+    frac = numpy.arange(1, NPointsInterp + 1,
+                        dtype=numpy.float64) / NPointsInterp
+    first = numpy.zeros(newOffsets[-1], dtype=numpy.bool_)
+    first[newOffsets[:-1][counts > 0]] = True
+    out = []
+    for a in (x, y):
+        b = numpy.empty(newOffsets[-1], dtype=numpy.float64)
+        b[first] = a[offsets[:-1][counts > 0]]
+        b[~first] = (a[start][:, None] +
+                     frac[None, :] * (a[start + 1] - a[start])[:, None]).ravel()
+        out.append(b)
+    return out[0], out[1], newOffsets
+
+
+def prepLineArrays(renWin, x, y, offsets, color, width, type, projection, wc,
+                   cmap):
+    """ Batched lines: line i has its coordinates in
+    x[offsets[i]:offsets[i + 1]], y[...] and uses color[i] (color index or
+    rgba in percents), width[i] and type[i].
+    Lines are drawn as polylines colored by cell, one actor per
+    (type, width) as these are actor properties.
+    """
+    if isinstance(projection, (str, unicode)):
+        projection = vcs.elements["projection"][projection]
+    if projection.type != "linear":
+        if projection.type in round_projections:
+            NPointsInterp = 50
         else:
-            pts.InsertNextPoint(x[0], y[0], 0.)
-            n2 = 0
-            for j in range(1, number_points):
-                if vcs.elements["projection"][
-                        line.projection].type in round_projections:
-                    NPointsInterp = 50
-                else:
-                    NPointsInterp = 25
-                for i in range(1, NPointsInterp + 1):
-                    if x[j] != x[j - 1]:
-                        tmpx = x[j - 1] + \
-                            float(i) / NPointsInterp * (x[j] - x[j - 1])
-                    else:
-                        tmpx = x[j]
-                    if y[j] != y[j - 1]:
-                        tmpy = y[j - 1] + \
-                            float(i) / NPointsInterp * (y[j] - y[j - 1])
-                    else:
-                        tmpy = y[j]
-                    pts.InsertNextPoint(tmpx, tmpy, 0.)
-                    n2 += 1
-        for j in range(n2):
-            colors.InsertNextTypedTuple(vtk_color)
-            l = vtk.vtkLine()
-            l.GetPointIds().SetId(0, j + point_offset)
-            l.GetPointIds().SetId(1, j + point_offset + 1)
-            lines.InsertNextCell(l)
-
-    for t, w in line_data:
-        pts, _, linesPoly, colors = line_data[(t, w)]
+            NPointsInterp = 25
+        x, y, offsets = interpolateLines(x, y, offsets, NPointsInterp)
+    geo, xyz = projectArrays(x, y, projection, wc)
+
+    counts = numpy.diff(offsets)
+    line_data = collections.OrderedDict()
+    for i in range(len(counts)):
+        if counts[i] < 2:
+            # no segment to draw
+            continue
+        if isinstance(color[i], int):
+            c = cmap.index[color[i]]
+        else:
+            c = color[i]
+        cells, colors = line_data.setdefault((type[i], width[i]), ([], []))
+        cells.append(i)
+        colors.append(c)
 
+    actors = []
+    for (t, w), (cells, colors) in line_data.iteritems():
+        pointIds, sub = subsetOffsets(offsets, cells)
+        linesPoly = genOffsetPolyData(xyz[pointIds], sub, lines=True)
+        colors = numpy.array(colors, dtype=numpy.float64).reshape((-1, 4))
+        colors = VN.numpy_to_vtk((colors / 100. * 255).astype(numpy.uint8),
+                                 deep=True)
+        colors.SetName("Colors")
         linesPoly.GetCellData().SetScalars(colors)
-        geo, pts = project(pts, line.projection, line.worldcoordinate)
-        linesPoly.SetPoints(pts)
 
         a = vtk.vtkActor()
         m = vtk.vtkPolyDataMapper()
@@ -35,24 +35,39 @@ class IsofillPipeline(Pipeline2D):
         plotting_dataset_bounds = self.getPlottingBounds()
         x1, x2, y1, y2 = plotting_dataset_bounds
 
+        # All the levels are contoured in a single pass, each group of
+        # levels (see _prepContours) then picks its bands by index.
+        levels = sorted(set(v for l in tmpLevels for v in l))
+        cot = vtk.vtkBandedPolyDataContourFilter()
+        cot.ClippingOn()
+        cot.SetInputData(self._vtkPolyDataFilter.GetOutput())
+        cot.SetNumberOfContours(len(levels))
+        cot.SetClipTolerance(0.)
+        for j, v in enumerate(levels):
+            cot.SetValue(j, v)
+        cot.Update()
+        cots.append(cot)
+
+        # band indices count a band below the first level if the data go
+        # below it, it is clipped out
+        scalars = self._vtkPolyDataFilter.GetOutput().GetPointData().GetScalars()
+        offset = 1 if scalars.GetRange()[0] < levels[0] else 0
+        numBands = len(levels) - 1 + offset
+        lut = vtk.vtkLookupTable()
+        lut.SetNumberOfTableValues(numBands)
+        # bands between groups (gaps in the levels) are not drawn
+        for j in range(numBands):
+            lut.SetTableValue(j, 0., 0., 0., 0.)
+        luts.append([lut, [-.5, numBands - .5, True]])
+        geos = []
+        # geometry of each group, for its pattern or hatch
+        patternInputs = []
         for i, l in enumerate(tmpLevels):
             # Ok here we are trying to group together levels can be, a join
             # will happen if: next set of levels continues where one left off
             # AND pattern is identical
-            mapper = vtk.vtkPolyDataMapper()
-            lut = vtk.vtkLookupTable()
-            cot = vtk.vtkBandedPolyDataContourFilter()
-            cot.ClippingOn()
-            cot.SetInputData(self._vtkPolyDataFilter.GetOutput())
-            cot.SetNumberOfContours(len(l))
-            cot.SetClipTolerance(0.)
-            for j, v in enumerate(l):
-                cot.SetValue(j, v)
-            cot.Update()
-
-            cots.append(cot)
-            mapper.SetInputConnection(cot.GetOutputPort())
-            lut.SetNumberOfTableValues(len(tmpColors[i]))
+            first = levels.index(l[0]) + offset
+            last = levels.index(l[-1]) - 1 + offset
             for j, color in enumerate(tmpColors[i]):
                 r, g, b, a = self.getColorIndexOrRGBA(_colorMap, color)
                 if style == 'solid':
@@ -61,21 +76,38 @@ class IsofillPipeline(Pipeline2D):
                         tmpOpacity = a / 100.
                     else:
                         tmpOpacity = tmpOpacities[j] / 100.
-                    lut.SetTableValue(j, r / 100., g / 100., b / 100., tmpOpacity)
+                    lut.SetTableValue(first + j, r / 100., g / 100., b / 100., tmpOpacity)
                 else:
-                    lut.SetTableValue(j, 1., 1., 1., 0.)
-            luts.append([lut, [0, len(l) - 1, True]])
-            mapper.SetLookupTable(lut)
-            minRange = 0
-            maxRange = len(l) - 1
-            if (i == 0 and self._scalarRange[0] < l[0]):
-                # band 0 is from self._scalarRange[0] to l[0]
-                # we don't show band 0
-                minRange += 1
-            mapper.SetScalarRange(minRange, maxRange)
-            mapper.SetScalarModeToUseCellData()
-            mappers.append(mapper)
+                    lut.SetTableValue(first + j, 1., 1., 1., 0.)
 
+            if style == 'solid':
+                continue
+            if len(tmpLevels) == 1:
+                patternInputs.append(cot.GetOutput())
+            else:
+                th = vtk.vtkThreshold()
+                th.SetInputConnection(cot.GetOutputPort())
+                th.SetInputArrayToProcess(
+                    0, 0, 0, vtk.vtkDataObject.FIELD_ASSOCIATION_CELLS,
+                    vtk.vtkDataSetAttributes.SCALARS)
+                th.ThresholdBetween(first, last)
+                geoFilter = vtk.vtkDataSetSurfaceFilter()
+                geoFilter.SetInputConnection(th.GetOutputPort())
+                geoFilter.Update()
+                geos.extend([th, geoFilter])
+                patternInputs.append(geoFilter.GetOutput())
+
+        # The lookup table holds the color and opacity of every band, one
+        # mapper draws them all
+        mapper = vtk.vtkPolyDataMapper()
+        mapper.SetInputConnection(cot.GetOutputPort())
+        mapper.SetLookupTable(lut)
+        mapper.SetScalarRange(-.5, numBands - .5)
+        mapper.SetScalarModeToUseCellData()
+        mappers.append(mapper)
+
+        if len(geos) > 0:
+            self._resultDict["vtk_backend_geofilters"] = geos
         self._resultDict["vtk_backend_luts"] = luts
         if len(cots) > 0:
             self._resultDict["vtk_backend_contours"] = cots
@@ -123,32 +155,12 @@ class IsofillPipeline(Pipeline2D):
             act = vtk.vtkActor()
             act.SetMapper(mapper)
 
-            patact = None
             # TODO see comment in boxfill.
             if mapper is self._maskedDataMapper:
                 actors.append([act, self._maskedDataMapper, plotting_dataset_bounds])
             else:
                 actors.append([act, plotting_dataset_bounds])
 
-                # Since pattern creation requires a single color, assuming the first
-                c = self.getColorIndexOrRGBA(_colorMap, tmpColors[ct][0])
-
-                # The isofill actor is scaled by the camera, so we need to use this size
-                # instead of window size for scaling the pattern.
-                viewsize = (x2 - x1, y2 - y1)
-                patact = fillareautils.make_patterned_polydata(mapper.GetInput(),
-                                                               fillareastyle=style,
-                                                               fillareaindex=tmpIndices[ct],
-                                                               fillareacolors=c,
-                                                               fillareaopacity=tmpOpacities[ct],
-                                                               size=viewsize)
-
-                if patact is not None:
-                    patternActors.append(patact)
-
-                # increment the count
-                ct += 1
-
             # create a new renderer for this mapper
             # (we need one for each mapper because of cmaera flips)
             dataset_renderer, xScale, yScale = self._context().fitToViewport(
@@ -157,6 +169,21 @@ class IsofillPipeline(Pipeline2D):
                 geo=self._vtkGeoTransform,
                 priority=self._template.data.priority,
                 create_renderer=(mapper is self._maskedDataMapper or dataset_renderer is None))
+        for ct, patternInput in enumerate(patternInputs):
+            # Since pattern creation requires a single color, assuming the first
+            c = self.getColorIndexOrRGBA(_colorMap, tmpColors[ct][0])
+
+            # The isofill actor is scaled by the camera, so we need to use this size
+            # instead of window size for scaling the pattern.
+            viewsize = (x2 - x1, y2 - y1)
+            patact = fillareautils.make_patterned_polydata(patternInput,
+                                                           fillareastyle=style,
+                                                           fillareaindex=tmpIndices[ct],
+                                                           fillareacolors=c,
+                                                           fillareaopacity=tmpOpacities[ct],
+                                                           size=viewsize)
+            if patact is not None:
+                patternActors.append(patact)
         for act in patternActors:
             self._context().fitToViewport(
                 act, vp,
@@ -87,7 +87,6 @@ class IsolinePipeline(Pipeline2D):
         tmpLineWidths.append(W)
         tmpLineTypes.append(S)
 
-        cots = []
         textprops = []
         luts = []
 
@@ -128,30 +127,40 @@ class IsolinePipeline(Pipeline2D):
              self._template.data.y1, self._template.data.y2])
         dataset_renderer = None
         xScale, yScale = (1, 1)
-        for i, l in enumerate(tmpLevels):
-            numLevels = len(l)
 
-            cot = vtk.vtkContourFilter()
-            if self._hasCellData:
-                cot.SetInputConnection(self._vtkPolyDataFilter.GetOutputPort())
-            else:
-                cot.SetInputData(self._vtkDataSet)
-            cot.SetNumberOfContours(numLevels)
+        # All the levels are contoured in one pass, the stripped polylines
+        # are then split by level into the style groups
+        if self._hasCellData:
+            contoured = self._vtkPolyDataFilter.GetOutput()
+        else:
+            contoured = self._vtkDataSet
+        levels = sorted(set(v for l in tmpLevels for v in l))
+        levelGroups = [0] * len(levels)
+        for i, l in enumerate(tmpLevels):
+            for v in l:
+                levelGroups[levels.index(v)] = i
+        isolines = vtk.vtkPolyData()
+        vcs2vtk.setIsolines(isolines, contoured, levels, levelGroups)
+        self._resultDict["vtk_backend_isolines"] = (isolines, contoured,
+                                                    levels, levelGroups)
+        geos = []
+        cmap = self.getColorMap()
+        textCache = self._context().textCache
+        winSize = self._context().renWin.GetSize()
 
-            for n in range(numLevels):
-                cot.SetValue(n, l[n])
-            # TODO remove update
-            cot.Update()
+        for i, l in enumerate(tmpLevels):
+            numLevels = len(l)
 
             lut = vtk.vtkLookupTable()
             lut.SetNumberOfTableValues(len(tmpColors[i]))
-            cmap = self.getColorMap()
             for n, col in enumerate(tmpColors[i]):
                 r, g, b, a = self.getColorIndexOrRGBA(cmap, col)
                 lut.SetTableValue(n, r / 100., g / 100., b / 100., a / 100.)
 
             # Setup isoline labels
             if self._gm.label:
+                # sized for the window, resizing replots
+                self._context().sizeDependent = True
                 # Setup label mapping array:
                 tpropMap = vtk.vtkDoubleArray()
                 tpropMap.SetNumberOfComponents(1)
@@ -204,17 +213,19 @@ class IsolinePipeline(Pipeline2D):
                             texttbl = vcs.gettexttable(tt)
                             texttbl.backgroundopacity = backgroundOpacities[countLevels + idx]
                         tprop = vtk.vtkTextProperty()
-                        vcs2vtk.prepTextProperty(tprop,
-                                                 self._context().renWin.GetSize(),
-                                                 to, tt, cmap=cmap)
+                        tprop.ShallowCopy(textCache.property(
+                            vcs2vtk.textPropertyKey(winSize, to, tt, cmap),
+                            lambda p: vcs2vtk.prepTextProperty(
+                                p, winSize, to, tt, cmap=cmap)))
                         tprops.AddItem(tprop)
                         if colorOverride is not None:
                             del(vcs.elements["texttable"][tt])
                 else:  # No text properties specified. Use the default:
                     tprop = vtk.vtkTextProperty()
-                    vcs2vtk.prepTextProperty(tprop,
-                                             self._context().renWin.GetSize(),
-                                             cmap=cmap)
+                    tprop.ShallowCopy(textCache.property(
+                        vcs2vtk.textPropertyKey(winSize, cmap=cmap),
+                        lambda p: vcs2vtk.prepTextProperty(p, winSize,
+                                                           cmap=cmap)))
                     tprops.AddItem(tprop)
                 textprops.append(tprops)
 
@@ -235,13 +246,20 @@ class IsolinePipeline(Pipeline2D):
             pdMapper.SetScalarRange(l[0], l[-1])
             pdMapper.SetScalarModeToUsePointData()
 
-            stripper = vtk.vtkStripper()
-            stripper.SetInputConnection(cot.GetOutputPort())
-            mapper.SetInputConnection(stripper.GetOutputPort())
-            # TODO remove update, make pipeline
-            stripper.Update()
+            if len(tmpLevels) == 1:
+                mapper.SetInputData(isolines)
+            else:
+                th = vtk.vtkThreshold()
+                th.SetInputData(isolines)
+                th.SetInputArrayToProcess(
+                    0, 0, 0, vtk.vtkDataObject.FIELD_ASSOCIATION_POINTS,
+                    "group")
+                th.ThresholdBetween(i, i)
+                geoFilter = vtk.vtkGeometryFilter()
+                geoFilter.SetInputConnection(th.GetOutputPort())
+                geos.extend([th, geoFilter])
+                mapper.SetInputConnection(geoFilter.GetOutputPort())
             mappers.append(mapper)
-            cots.append(cot)
 
             # Create actor to add to scene
             act = vtk.vtkActor()
@@ -271,8 +289,8 @@ class IsolinePipeline(Pipeline2D):
                 self._resultDict["vtk_backend_labeled_luts"] = luts
             else:
                 self._resultDict["vtk_backend_luts"] = luts
-        if len(cots) > 0:
-            self._resultDict["vtk_backend_contours"] = cots
+        if len(geos) > 0:
+            self._resultDict["vtk_backend_geofilters"] = geos
 
         if self._maskedDataMapper is not None:
             mappers.insert(0, self._maskedDataMapper)
@@ -0,0 +1,92 @@
+import collections
+
+
+def vtk_nbytes(obj):
+    """Memory used by a vtkDataObject, in bytes."""
+    try:
+        return obj.GetActualMemorySize() * 1024
+    except AttributeError:
+        return 0
+
+
+class LRUCache(object):
+
+    """Least recently used cache bounded in number of entries and bytes.
+
+    sizeof is a function returning the size in bytes of a stored value,
+    entries are evicted (least recently used first) until both maxsize
+    and maxbytes are honored. A maxbytes of None means no memory bound.
+    on_evict, if given, is called with (key, value) for every evicted entry.
+    """
+
+    def __init__(self, maxsize=16, maxbytes=None, sizeof=vtk_nbytes,
+                 on_evict=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self._sizeof = sizeof
+        self._on_evict = on_evict
+        self._entries = collections.OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def keys(self):
+        return self._entries.keys()
+
+    def items(self):
+        """(key, value) pairs, least recently used first"""
+        return [(key, value) for key, (value, size) in self._entries.items()]
+
+    def get(self, key, default=None):
+        try:
+            value, size = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        # move it back to the most recently used end
+        self._entries[key] = (value, size)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[1]
+        size = self._sizeof(value) if self._sizeof is not None else 0
+        if self.maxbytes is not None and size > self.maxbytes:
+            # would evict everything and still not fit
+            if self._on_evict is not None:
+                self._on_evict(key, value)
+            return
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        self._evict()
+
+    def _evict(self):
+        while self._entries and (
+                len(self._entries) > self.maxsize or
+                (self.maxbytes is not None and self.nbytes > self.maxbytes)):
+            key, (value, size) = self._entries.popitem(last=False)
+            self.nbytes -= size
+            self.evictions += 1
+            if self._on_evict is not None:
+                self._on_evict(key, value)
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        return {"entries": len(self._entries),
+                "nbytes": self.nbytes,
+                "maxsize": self.maxsize,
+                "maxbytes": self.maxbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions}
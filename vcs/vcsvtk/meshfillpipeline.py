@@ -38,32 +38,23 @@ class MeshfillPipeline(Pipeline2D):
         # self._patternActors = []
 
         mappers = []
-        luts = []
         geos = []
         wholeDataMin, wholeDataMax = vcs.minmax(self._originalData1)
         plotting_dataset_bounds = self.getPlottingBounds()
         x1, x2, y1, y2 = plotting_dataset_bounds
         _colorMap = self.getColorMap()
         self._patternActors = []
+
+        # One polydata colored by the index of the band of each cell, the
+        # index is computed once with numpy instead of thresholding the mesh
+        # for every band.
+        bands = []
+        colors = []
+        groups = []
         for i, l in enumerate(tmpLevels):
-            # Ok here we are trying to group together levels can be, a join
-            # will happen if: next set of levels contnues where one left off
-            # AND pattern is identical
-            # TODO this should really just be a single polydata that is
-            # colored by scalars:
+            groups.append((len(bands), len(bands) + len(tmpColors[i]) - 1))
             for j, color in enumerate(tmpColors[i]):
-                mapper = vtk.vtkPolyDataMapper()
-                lut = vtk.vtkLookupTable()
-                th = vtk.vtkThreshold()
-                th.ThresholdBetween(l[j], l[j + 1])
-                th.SetInputConnection(self._vtkPolyDataFilter.GetOutputPort())
-                geoFilter2 = vtk.vtkDataSetSurfaceFilter()
-                geoFilter2.SetInputConnection(th.GetOutputPort())
-                # Make the polydata output available here for patterning later
-                geoFilter2.Update()
-                geos.append(geoFilter2)
-                mapper.SetInputConnection(geoFilter2.GetOutputPort())
-                lut.SetNumberOfTableValues(1)
+                bands.append([l[j], l[j + 1]])
                 r, g, b, a = self.getColorIndexOrRGBA(_colorMap, color)
                 if style == 'solid':
                     tmpOpacity = tmpOpacities[j]
@@ -71,23 +62,59 @@ class MeshfillPipeline(Pipeline2D):
                         tmpOpacity = a / 100.
                     else:
                         tmpOpacity = tmpOpacities[j] / 100.
-                    lut.SetTableValue(
-                        0, r / 100., g / 100., b / 100., tmpOpacity)
+                    colors.append((r / 100., g / 100., b / 100., tmpOpacity))
                 else:
-                    lut.SetTableValue(0, 1., 1., 1., 0.)
-                mapper.SetLookupTable(lut)
-                mapper.SetScalarRange(l[j], l[j + 1])
-                luts.append([lut, [l[j], l[j + 1], True]])
-                # Store the mapper only if it's worth it?
-                # Need to do it with the whole slab min/max for animation
-                # purposes
-                if not (l[j + 1] < wholeDataMin or l[j] > wholeDataMax):
-                    mappers.append(mapper)
+                    colors.append((1., 1., 1., 0.))
+        polydata = self._vtkPolyDataFilter.GetOutput()
+        vcs2vtk.setBandIndices(polydata, bands)
+        self._resultDict["vtk_backend_bands"] = bands
+
+        th = vtk.vtkThreshold()
+        th.SetInputData(polydata)
+        th.SetInputArrayToProcess(0, 0, 0,
+                                  vtk.vtkDataObject.FIELD_ASSOCIATION_CELLS,
+                                  "bands")
+        th.ThresholdBetween(0, len(bands) - 1)
+        geoFilter = vtk.vtkDataSetSurfaceFilter()
+        geoFilter.SetInputConnection(th.GetOutputPort())
+        geoFilter.Update()
+        geos.extend([th, geoFilter])
+
+        lut = vtk.vtkLookupTable()
+        lut.SetNumberOfTableValues(len(bands))
+        for i, color in enumerate(colors):
+            lut.SetTableValue(i, *color)
+        mapper = vtk.vtkPolyDataMapper()
+        mapper.SetInputConnection(geoFilter.GetOutputPort())
+        mapper.SetScalarModeToUseCellFieldData()
+        mapper.SelectColorArray("bands")
+        mapper.SetLookupTable(lut)
+        mapper.SetScalarRange(-.5, len(bands) - .5)
+        self._resultDict["vtk_backend_luts"] = [
+            [lut, [-.5, len(bands) - .5, True]]]
+        # Store the mapper only if it's worth it?
+        # Need to do it with the whole slab min/max for animation
+        # purposes
+        for low, high in bands:
+            if not (high < wholeDataMin or low > wholeDataMax):
+                mappers.append(mapper)
+                break
 
+        # Only patterns and hatches need the geometry of their bands split out
+        for i, (first, last) in enumerate(groups if style != 'solid' else []):
+            groupTh = vtk.vtkThreshold()
+            groupTh.SetInputData(polydata)
+            groupTh.SetInputArrayToProcess(
+                0, 0, 0, vtk.vtkDataObject.FIELD_ASSOCIATION_CELLS, "bands")
+            groupTh.ThresholdBetween(first, last)
+            groupGeo = vtk.vtkDataSetSurfaceFilter()
+            groupGeo.SetInputConnection(groupTh.GetOutputPort())
+            groupGeo.Update()
+            geos.extend([groupTh, groupGeo])
             # Since pattern creation requires a single color, assuming the
             # first
             c = self.getColorIndexOrRGBA(_colorMap, tmpColors[i][0])
-            act = fillareautils.make_patterned_polydata(geoFilter2.GetOutput(),
+            act = fillareautils.make_patterned_polydata(groupGeo.GetOutput(),
                                                         fillareastyle=style,
                                                         fillareaindex=tmpIndices[i],
                                                         fillareacolors=c,
@@ -96,9 +123,7 @@ class MeshfillPipeline(Pipeline2D):
             if act is not None:
                 self._patternActors.append(act)
 
-        self._resultDict["vtk_backend_luts"] = luts
-        if len(geos) > 0:
-            self._resultDict["vtk_backend_geofilters"] = geos
+        self._resultDict["vtk_backend_geofilters"] = geos
 
         """
         numLevels = len(self._contourLevels)
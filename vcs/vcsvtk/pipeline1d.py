@@ -2,6 +2,7 @@ from .pipeline import Pipeline
 
 import numpy
 import vcs
+from vcs import transient
 
 
 def smooth(x, beta, window_len=11):
@@ -14,6 +15,39 @@ def smooth(x, beta, window_len=11):
     return y[(window_len / 2):-(window_len / 2)]
 
 
+def splitRuns(keep, valid):
+    """ Indices of the points to keep, split in runs of consecutive valid
+    points (a missing value breaks the line) """
+    kept = numpy.nonzero(keep)[0]
+    # run number of each point, a new run starts after each missing value
+    run = numpy.cumsum(~valid)[kept]
+    runs = numpy.split(kept, numpy.nonzero(numpy.diff(run))[0] + 1)
+    return [r for r in runs if len(r) > 0]
+
+
+def decimateMinMax(u, v, valid, u1, u2, ncolumns):
+    """ Mask of the points to draw so that the lines look the same at the
+    resolution of ncolumns pixel columns spanning u1 to u2: for each run of
+    consecutive valid points falling in one column, keeps its first, last,
+    minimum and maximum (in v) points only """
+    idx = numpy.nonzero(valid)[0]
+    keep = numpy.zeros(len(valid), dtype=numpy.bool_)
+    if len(idx) == 0:
+        return keep
+    umin, umax = min(u1, u2), max(u1, u2)
+    column = numpy.floor((u[idx] - umin) / (umax - umin) * ncolumns)
+    column = numpy.clip(column, -1, ncolumns)
+    newgroup = numpy.ones(len(idx), dtype=numpy.bool_)
+    newgroup[1:] = (column[1:] != column[:-1]) | (idx[1:] != idx[:-1] + 1)
+    group = numpy.cumsum(newgroup)
+    first = numpy.nonzero(newgroup)[0]
+    last = numpy.concatenate((first[1:], [len(idx)])) - 1
+    # sorted by group then value, each group min/max sit at its first/last
+    order = numpy.lexsort((v[idx], group))
+    keep[idx[numpy.concatenate((first, last, order[first], order[last]))]] = True
+    return keep
+
+
 class Pipeline1D(Pipeline):
 
     """Implementation of the Pipeline interface for 1D VCS plots."""
@@ -39,39 +73,22 @@ class Pipeline1D(Pipeline):
         if self._gm.smooth is not None:
             Y = smooth(Y, self._gm.smooth)
 
-        l = self._context().canvas.createline()
-        Xs = X[:].tolist()
-        Ys = Y[:].tolist()
-        xs = []
-        ys = []
-        prev = None
-        for i, v in enumerate(Ys):
-            if v is not None and Xs[i] is not None:  # Valid data
-                if prev is None:
-                    prev = []
-                    prev2 = []
-                prev.append(Xs[i])
-                prev2.append(v)
-            else:
-                if prev is not None:
-                    xs.append(prev)
-                    ys.append(prev2)
-                    prev = None
-
-        if prev is not None:
-            xs.append(prev)
-            ys.append(prev2)
+        canvas = self._context().canvas
+        l = transient.Line()
+        Xs = numpy.ma.asarray(X[:])
+        Ys = numpy.ma.asarray(Y[:])
+        valid = ~(numpy.ma.getmaskarray(Xs) | numpy.ma.getmaskarray(Ys))
+        Xs = numpy.ma.getdata(Xs).astype(numpy.float64)
+        Ys = numpy.ma.getdata(Ys).astype(numpy.float64)
 
-        l._x = xs
-        l._y = ys
         l.color = [self._gm.linecolor, ]
         if self._gm.linewidth > 0:
-            l.width = self._gm.linewidth
+            l.width = [self._gm.linewidth, ]
         else:
             l.priority = 0
-        l.type = self._gm.linetype
-        l._viewport = [tmpl.data.x1, tmpl.data.x2,
-                       tmpl.data.y1, tmpl.data.y2]
+        l.type = [self._gm.linetype, ]
+        l.viewport = [tmpl.data.x1, tmpl.data.x2,
+                      tmpl.data.y1, tmpl.data.y2]
 
         # Also need to make sure it fills the whole space
         x1, x2, y1, y2 = vcs.utils.getworldcoordinates(self._gm, X, Y)
@@ -81,55 +98,72 @@ class Pipeline1D(Pipeline):
         if numpy.allclose(x1, x2):
             x1 -= .0001
             x2 += .0001
-        l._worldcoordinate = [x1, x2, y1, y2]
+        l.worldcoordinate = [x1, x2, y1, y2]
+
+        keep = valid
+        if self._gm.decimate and l.priority > 0:
+            # only the line is decimated, markers show every point
+            width, height = self._context().renWin.GetSize()
+            if self._gm.flip:
+                # y is the independent variable
+                ncolumns = int(abs(tmpl.data.y2 - tmpl.data.y1) * height)
+                u, v, u1, u2 = Ys, Xs, y1, y2
+            else:
+                ncolumns = int(abs(tmpl.data.x2 - tmpl.data.x1) * width)
+                u, v, u1, u2 = Xs, Ys, x1, x2
+            if ncolumns > 0 and len(u) > 4 * ncolumns:
+                keep = decimateMinMax(u, v, valid, u1, u2, ncolumns)
+                # one column per pixel, resizing replots
+                self._context().sizeDependent = True
+        runs = splitRuns(keep, valid)
+        l.x = [Xs[run].tolist() for run in runs]
+        l.y = [Ys[run].tolist() for run in runs]
+
         if self._gm.marker is not None:
-            m = self._context().canvas.createmarker()
-            m.type = self._gm.marker
+            m = transient.Marker()
+            m.type = [self._gm.marker, ]
             m.color = [self._gm.markercolor, ]
             if self._gm.markersize > 0:
-                m.size = self._gm.markersize
+                m.size = [self._gm.markersize, ]
             else:
                 m.priority = 0
-            m._x = l.x
-            m._y = l.y
-            m._viewport = l.viewport
-            m._worldcoordinate = l.worldcoordinate
+            # every valid point, decimated or not
+            if valid.any():
+                m.x = [Xs[valid].tolist()]
+                m.y = [Ys[valid].tolist()]
+            else:
+                m.x = []
+                m.y = []
+            m.viewport = l.viewport
+            m.worldcoordinate = l.worldcoordinate
 
         if not (Y[:].min() > max(y1, y2) or Y[:].max() < min(y1, y2) or
                 X[:].min() > max(x1, x2) or X[:].max() < min(x1, x2)):
             if l.priority > 0:
-                self._context().canvas.plot(l, donotstoredisplay=True)
+                transient.draw(canvas, l, donotstoredisplay=True)
             if self._gm.marker is not None and m.priority > 0:
-                self._context().canvas.plot(m, donotstoredisplay=True)
+                transient.draw(canvas, m, donotstoredisplay=True)
 
         ren2 = self._context().createRenderer()
         self._context().renWin.AddRenderer(ren2)
-        tmpl.plot(self._context().canvas, data1, self._gm, bg=self._context().bg,
+        tmpl.plot(canvas, data1, self._gm, bg=self._context().bg,
                   renderer=ren2, X=X, Y=Y)
         if hasattr(data1, "_yname"):
             del(data1._yname)
-        del(vcs.elements["line"][l.name])
-        if self._gm.marker is not None:
-            del(vcs.elements["marker"][m.name])
 
         if tmpl.legend.priority > 0:
-            legd = self._context().canvas.createline()
+            legd = transient.Line()
             legd.x = [tmpl.legend.x1, tmpl.legend.x2]
             legd.y = [tmpl.legend.y1, tmpl.legend.y1]  # [y1, y1] intentional.
             legd.color = l.color
             legd.width = l.width
             legd.type = l.type
-            t = self._context().canvas.createtext(
+            t = transient.Text(
                 To_source=tmpl.legend.textorientation,
                 Tt_source=tmpl.legend.texttable)
-            t.x = tmpl.legend.x2
-            t.y = tmpl.legend.y2
-            t.string = data1.id
-            self._context().canvas.plot(t, donotstoredisplay=True)
-            sp = t.name.split(":::")
-            del(vcs.elements["texttable"][sp[0]])
-            del(vcs.elements["textorientation"][sp[1]])
-            del(vcs.elements["textcombined"][t.name])
-            self._context().canvas.plot(legd, donotstoredisplay=True)
-            del(vcs.elements["line"][legd.name])
+            t.x = [tmpl.legend.x2]
+            t.y = [tmpl.legend.y2]
+            t.string = [str(data1.id)]
+            transient.draw(canvas, t, donotstoredisplay=True)
+            transient.draw(canvas, legd, donotstoredisplay=True)
         return {}
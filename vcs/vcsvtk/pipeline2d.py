@@ -398,6 +398,9 @@ class Pipeline2D(IPipeline2D):
 
         self._resultDict["vtk_backend_missing_mapper"] = (
             self._maskedDataMapper, color, self._hasCellData)
+        # used by update_input to know if the mapper needs to be rebuilt
+        self._resultDict["vtk_backend_missing_mask"] = numpy.ma.getmaskarray(
+            self._data1)
 
     def getPlottingBounds(self):
         """gm.datawc if it is set or dataset_bounds if there is not geographic projection
@@ -0,0 +1,65 @@
+import vtk
+from .lrucache import LRUCache
+
+
+class TextCache(object):
+
+    """Per canvas cache of what text rendering needs over and over.
+
+    properties: prepared vtkTextProperty per text property key (see
+    vcs2vtk.textPropertyKey), copied into the actors using them.
+    extents: measured (width, height) in pixels per (string, key, dpi).
+    Text actors handed out by actor() go to a free pool on release(),
+    called when the canvas is cleared, so that replotting the same strings
+    (e.g. on resize) reuses them.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.properties = LRUCache(maxsize=256, sizeof=None)
+        self.extents = LRUCache(maxsize=maxsize, sizeof=None)
+        self._free = {}
+        self._used = []
+
+    def property(self, key, prep):
+        """Text property for key, prep(p) fills a new one on a miss"""
+        p = self.properties.get(key)
+        if p is None:
+            p = vtk.vtkTextProperty()
+            prep(p)
+            self.properties.put(key, p)
+        return p
+
+    def actor(self, string, key, prep):
+        """A vtkTextActor showing string with the text property of key"""
+        free = self._free.get((string, key))
+        if free:
+            t = free.pop()
+        else:
+            t = vtk.vtkTextActor()
+            t.SetInput(string)
+        # editors may have changed the property of a reused actor
+        t.GetTextProperty().ShallowCopy(self.property(key, prep))
+        self._used.append(((string, key), t))
+        return t
+
+    def extent(self, string, key, dpi, prep, measure):
+        """(width, height) of string, measure(string, p, dpi) on a miss"""
+        ext = self.extents.get((string, key, dpi))
+        if ext is None:
+            ext = measure(string, self.property(key, prep), dpi)
+            self.extents.put((string, key, dpi), ext)
+        return ext
+
+    def release(self):
+        """The actors handed out since the last release are free to be
+        reused, older free actors are dropped"""
+        self._free = {}
+        for k, t in self._used:
+            self._free.setdefault(k, []).append(t)
+        self._used = []
+
+    def clear(self):
+        self.properties.clear()
+        self.extents.clear()
+        self._free = {}
+        self._used = []
@@ -0,0 +1,106 @@
+import subprocess
+import numpy
+from error import vcsError
+
+
+class VideoStream(object):
+
+    """
+    Encodes frames into a movie as they are produced, by piping raw rgb24
+    images into the stdin of an ffmpeg process; no intermediate image files.
+
+    Writes block while ffmpeg is busy, so rendering never gets ahead of the
+    encoder by more than the pipe buffer.
+
+    :Example:
+
+        ::
+
+            stream = canvas.ffmpeg_stream("movie.mp4", rate=10)
+            for i in range(len(data)):
+                canvas.clear()
+                canvas.plot(data[i])
+                stream.write()  # grabs the canvas content
+            stream.close()
+    """
+
+    def __init__(self, movie, canvas=None, rate=None, options=None,
+                 bitrate=None):
+        self.movie = movie
+        self.canvas = canvas
+        self.rate = rate
+        self.options = options
+        self.bitrate = bitrate
+        self.size = None
+        self.process = None
+        self.frames = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def start(self, width, height):
+        args = ["ffmpeg", "-y",
+                "-f", "rawvideo",
+                "-pix_fmt", "rgb24",
+                "-s", "%dx%d" % (width, height)]
+        if self.rate is not None:
+            args.extend(("-framerate", str(self.rate)))
+        args.extend(("-i", "-"))
+        args.extend(("-pix_fmt", "yuv420p"))
+        if self.bitrate is not None:
+            args.extend(("-b:v", "%dk" % self.bitrate))
+        # H264 requires even numbered heights and widths
+        args.extend(("-vf", "scale=%d:%d" %
+                     (width + width % 2, height + height % 2)))
+        if self.options is not None:
+            args.append(self.options)
+        args.append(self.movie)
+        self.size = (width, height)
+        self.process = subprocess.Popen(args, stdin=subprocess.PIPE)
+
+    def write(self, image=None):
+        """
+        Append a frame to the movie
+
+        :param image: frame to add, defaults to the current canvas content
+        :type image: vtkImageData
+        """
+        from vtk.util import numpy_support as VN
+        if image is None:
+            if self.canvas is None:
+                raise vcsError("No canvas to grab frames from")
+            image = self.canvas.backend.snapshot()
+        ext = image.GetExtent()
+        width = ext[1] - ext[0] + 1
+        height = ext[3] - ext[2] + 1
+        if self.process is None:
+            self.start(width, height)
+        elif self.size != (width, height):
+            raise vcsError("Frame size %ix%i does not match movie size %ix%i" %
+                           ((width, height) + self.size))
+        pixels = VN.vtk_to_numpy(image.GetPointData().GetScalars())
+        pixels = pixels.reshape(height, width, -1)[::-1, :, :3]
+        try:
+            self.process.stdin.write(
+                numpy.ascontiguousarray(pixels, dtype=numpy.uint8).tostring())
+        except IOError:
+            # ffmpeg went away, close() reports it
+            pass
+        self.frames += 1
+
+    def close(self):
+        """
+        Finishes the movie
+
+        :returns: True if ffmpeg succeeded
+        :rtype: bool
+        """
+        if self.process is None:
+            return False
+        self.process.stdin.close()
+        result = self.process.wait()
+        self.process = None
+        return result == 0